@@ -24,6 +24,7 @@ from __future__ import print_function, division
 
 from .nml import *  # noqa
 from .manager import *  # noqa
+from .labels import *  # noqa
 
 __author__ = 'Hewlett Packard Enterprise Development LP'
 __email__ = 'hpe-networking@lists.hp.com'
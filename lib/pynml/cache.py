@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+pynml caches module.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+from collections import OrderedDict
+
+
+class PathCache(object):
+    """
+    Bounded least recently used cache of paths.
+
+    Each path is stored along with the identifiers of the objects it
+    traverses, so it can be evicted when any of them is removed or changed
+    without touching the rest of the cache.
+
+    :param int size: Maximum number of paths to keep.
+    :var int hits: Number of lookups that found a path.
+    :var int misses: Number of lookups that didn't find a path.
+    :var int evictions: Number of paths evicted to make room for new ones.
+    :var int invalidations: Number of paths evicted because an object they
+     traverse was removed or changed.
+    """
+
+    def __init__(self, size=1024):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._traversed_by = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Lookup a path and mark it as the most recently used.
+
+        :param key: Key of the path.
+        :param default: Value to return if the path is not cached.
+        :return: The cached path or `default`.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        self._entries[key] = entry
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, path, traversed):
+        """
+        Store a path, evicting the least recently used ones if full.
+
+        :param key: Key of the path.
+        :param path: Path to store.
+        :param traversed: Identifiers of the objects the path traverses.
+        """
+        if key in self._entries:
+            self._discard(key)
+
+        while self._entries and len(self._entries) >= self.size:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+        if self.size <= 0:
+            return
+
+        traversed = frozenset(traversed)
+        self._entries[key] = (path, traversed)
+        for identifier in traversed:
+            self._traversed_by.setdefault(identifier, set()).add(key)
+
+    def _discard(self, key):
+        """
+        Remove a path and its reverse index entries.
+        """
+        path, traversed = self._entries.pop(key)
+        for identifier in traversed:
+            keys = self._traversed_by[identifier]
+            keys.discard(key)
+            if not keys:
+                del self._traversed_by[identifier]
+
+    def invalidate(self, identifier):
+        """
+        Evict all paths that traverse the object with the given identifier.
+
+        :param str identifier: Identifier of the removed or changed object.
+        :rtype: int
+        :return: The number of evicted paths.
+        """
+        keys = self._traversed_by.get(identifier, ())
+        evicted = len(keys)
+        for key in list(keys):
+            self._discard(key)
+        self.invalidations += evicted
+        return evicted
+
+    def clear(self):
+        """
+        Evict all paths.
+        """
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._traversed_by.clear()
+
+
+__all__ = ['PathCache']
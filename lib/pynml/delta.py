@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Patch documents with the changes of a namespace.
+
+A patch is a NML document with the objects created or modified after an epoch
+of a namespace, written as in :meth:`pynml.manager.NMLManager.export_nml`,
+plus a ``Removed`` element referencing the objects unregistered after it:
+
+::
+
+    <Namespace xmlns:nml="..." epoch="42" since="37">
+        <nml:Node identifier="sw1" name="sw1" version="...">
+            <Relation type="...#hasInboundPort">
+                <Port id="sw1-1" />
+            </Relation>
+        </nml:Node>
+        <Removed>
+            <Object id="sw1-2" />
+        </Removed>
+    </Namespace>
+
+Each object is written with all its attributes and relations, so applying a
+patch is idempotent and only the last change of each object is shipped.
+
+NML attributes are text, so objects with attributes of other types, like the
+:py:class:`datetime.datetime` of a :class:`pynml.nml.Lifetime`, list them in a
+``valueTypes`` attribute (``start:datetime end:datetime``) and their values
+are converted back when the patch is applied. See :func:`encode_value`.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta, tzinfo
+from xml.dom import minidom
+from xml.etree import ElementTree as etree  # noqa
+
+from six import StringIO, text_type, binary_type, integer_types
+
+from . import nml
+from .nml import NAMESPACES, NMLObject, unset
+from .mixins import OrderedListMixin
+
+
+DATETIME_RE = re.compile(
+    r'^(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})'
+    r'[T ](?P<hour>\d{2}):(?P<minute>\d{2}):(?P<second>\d{2})'
+    r'(?:\.(?P<fraction>\d{1,6}))?'
+    r'(?P<zone>[+-]\d{2}:\d{2})?$'
+)
+
+
+class FixedOffset(tzinfo):
+    """
+    Timezone with a fixed offset from UTC.
+
+    :param int minutes: Offset from UTC in minutes.
+    """
+
+    def __init__(self, minutes):
+        self._offset = timedelta(minutes=minutes)
+
+    def utcoffset(self, dt):
+        return self._offset
+
+    def dst(self, dt):
+        return timedelta(0)
+
+    def tzname(self, dt):
+        return None
+
+
+def encode_value(value):
+    """
+    Encode an attribute value as text.
+
+    :param value: The value of the attribute.
+    :rtype: tuple
+    :return: A tuple (type, text), where type is ``datetime``, ``bool``,
+     ``int`` or ``float``, or an empty string for values kept as text.
+    """
+    if isinstance(value, datetime):
+        return 'datetime', value.isoformat()
+    if isinstance(value, bool):
+        return 'bool', text_type(value)
+    if isinstance(value, integer_types):
+        return 'int', text_type(value)
+    if isinstance(value, float):
+        return 'float', repr(value)
+    return '', text_type(value)
+
+
+def decode_value(kind, text):
+    """
+    Decode an attribute value encoded by :func:`encode_value`.
+
+    :param str kind: The type returned by :func:`encode_value`.
+    :param str text: The text of the value.
+    :return: The value. Texts of unknown types and datetimes that can't be
+     parsed are returned as is.
+    """
+    if kind == 'bool':
+        return text == 'True'
+    if kind == 'int':
+        return int(text)
+    if kind == 'float':
+        return float(text)
+    if kind != 'datetime':
+        return text
+
+    match = DATETIME_RE.match(text)
+    if match is None:
+        return text
+    fields = match.groupdict()
+    zone = None
+    if fields['zone']:
+        minutes = int(fields['zone'][1:3]) * 60 + int(fields['zone'][4:6])
+        zone = FixedOffset(-minutes if fields['zone'][0] == '-' else minutes)
+    return datetime(
+        int(fields['year']), int(fields['month']), int(fields['day']),
+        int(fields['hour']), int(fields['minute']), int(fields['second']),
+        int((fields['fraction'] or '0').ljust(6, '0')), zone
+    )
+
+
+def value_types(obj):
+    """
+    Get the types of the attributes of an object that are not text.
+
+    :param NMLObject obj: The object.
+    :rtype: :py:class:`OrderedDict`
+    :return: A mapping of attribute names to the types returned by
+     :func:`encode_value`.
+    """
+    types = OrderedDict()
+    for attribute in obj.attributes:
+        value = getattr(obj, attribute)
+        if value is unset or value is None:
+            continue
+        kind, _ = encode_value(value)
+        if kind:
+            types[attribute] = kind
+    return types
+
+
+def export_delta(namespace, changelog, since=0, pretty=True):
+    """
+    Build a patch with the changes of a namespace after an epoch.
+
+    :param namespace: Mapping of identifiers to the registered objects.
+    :param changelog: The :class:`pynml.index.ChangeLogIndex` of the
+     namespace.
+    :param int since: Epoch of the last patch applied by the consumer, or 0
+     for all the namespace. Patches since 0 are applied to empty namespaces,
+     so they don't reference unregistered objects.
+    :param pretty: Pretty print the output XML.
+    :rtype: str
+    :return: The patch in NML XML format.
+    :raises Exception: If the unregistered objects after the epoch were
+     forgotten by :meth:`pynml.index.ChangeLogIndex.compact`.
+    """
+    if 0 < since < changelog.compacted:
+        raise Exception(
+            'Changes since epoch {} are no longer available, the change log '
+            'was compacted up to epoch {}'.format(since, changelog.compacted)
+        )
+
+    root = etree.Element('Namespace')
+    for xmlns, uri in NAMESPACES.items():
+        root.attrib['xmlns:{}'.format(xmlns)] = uri
+    root.attrib['epoch'] = text_type(changelog.epoch)
+    root.attrib['since'] = text_type(since)
+
+    removed = []
+    for identifier, obj in changelog.since(since):
+        if obj is None or namespace.get(identifier, None) is not obj:
+            if since:
+                removed.append(identifier)
+            continue
+        element = obj.as_nml(parent=root)
+        types = value_types(obj)
+        if types:
+            element.attrib['valueTypes'] = ' '.join(
+                '{}:{}'.format(attribute, kind)
+                for attribute, kind in types.items()
+            )
+
+    if removed:
+        tombstones = etree.SubElement(root, 'Removed')
+        for identifier in removed:
+            etree.SubElement(tombstones, 'Object', id=identifier)
+
+    xml = etree.tostring(root, encoding='utf-8')
+    if pretty:
+        infile = StringIO(text_type(xml, 'utf-8'))
+        doc = minidom.parse(infile)
+        xml = doc.toprettyxml(indent='    ', encoding='utf-8')
+    return text_type(xml, 'utf-8')
+
+
+def _local_name(tag):
+    """
+    Get the name of a XML tag without its namespace.
+    """
+    return tag.rsplit('}', 1)[-1]
+
+
+def _set_relation(obj, relation, targets):
+    """
+    Make a relation of an object hold exactly the given objects.
+
+    Relations of fixed cardinality are left unchanged if not all their
+    objects are given.
+    """
+    getter = obj.relations[relation]
+    suffix = getter.__name__[len('get_'):]
+    current = getter()
+
+    if isinstance(current, OrderedDict):
+        for identifier, related in current.items():
+            if identifier not in targets:
+                getattr(obj, 'remove_{}'.format(suffix))(related)
+        for identifier, related in targets.items():
+            if identifier not in current:
+                getattr(obj, 'add_{}'.format(suffix))(related)
+        return
+
+    targets = tuple(targets.values())
+    if len(targets) == len(current) and targets != current:
+        getattr(obj, 'set_{}'.format(suffix))(*targets)
+
+
+def apply_delta(manager, patch):
+    """
+    Apply a patch built by :func:`export_delta` to a namespace.
+
+    Objects are created or updated first, then their relations are replaced
+    by the ones in the patch and finally removed objects are unregistered.
+    Relations with objects that are not in the namespace after applying the
+    patch are ignored.
+
+    :param manager: The :class:`pynml.manager.NMLManager` to update.
+    :param str patch: The patch in NML XML format.
+    :rtype: int
+    :return: The epoch of the patch, to pass as ``since`` to get the next one.
+    :raises Exception: If the patch has objects of unknown classes.
+    """
+    if not isinstance(patch, binary_type):
+        patch = patch.encode('utf-8')
+    root = etree.fromstring(patch)
+    namespace = manager.namespace
+
+    # Objects and attributes
+    elements = []
+    for element in root:
+        if _local_name(element.tag) == 'Removed':
+            continue
+        identifier = element.get('identifier')
+        cls = getattr(nml, _local_name(element.tag), None)
+        if not isinstance(cls, type) or not issubclass(cls, NMLObject):
+            raise Exception(
+                'Unknown NML class {}'.format(_local_name(element.tag))
+            )
+
+        obj = namespace.get(identifier, None)
+        if obj is not None and obj.__class__ is not cls:
+            manager.unregister_object(obj)
+            obj = None
+        if obj is None:
+            obj = cls(identifier=identifier)
+            manager.register_object(obj)
+
+        types = dict(
+            pair.split(':', 1)
+            for pair in element.get('valueTypes', '').split()
+        )
+        for attribute in obj.attributes:
+            if attribute == 'identifier':
+                continue
+            value = element.get(attribute)
+            current = getattr(obj, attribute)
+            if value is None:
+                if current is not unset and current is not None:
+                    setattr(obj, attribute, unset)
+                continue
+            value = decode_value(types.get(attribute, ''), value)
+            if current is unset or current is None or \
+                    text_type(current) != text_type(value) or \
+                    type(current) is not type(value):
+                setattr(obj, attribute, value)
+
+        elements.append((obj, element))
+
+    # Relations
+    for obj, element in elements:
+        relations = OrderedDict(
+            (relation, OrderedDict()) for relation in obj.relations
+        )
+        items = []
+        for child in element:
+            if child.tag != 'Relation':
+                items.append(child.get('id'))
+                continue
+            relation = child.get('type').rsplit('#', 1)[-1]
+            targets = relations.get(relation, None)
+            if targets is None:
+                continue
+            for related in child:
+                target = namespace.get(related.get('id'), None)
+                if target is not None:
+                    targets[target.identifier] = target
+
+        for relation, targets in relations.items():
+            _set_relation(obj, relation, targets)
+
+        if isinstance(obj, OrderedListMixin):
+            items = [
+                namespace[identifier] for identifier in items
+                if identifier in namespace
+            ]
+            if [item.identifier for item in obj] != \
+                    [item.identifier for item in items]:
+                del obj[:]
+                obj.extend(items)
+
+    # Removed objects
+    for tombstones in root.findall('Removed'):
+        for tombstone in tombstones:
+            obj = namespace.get(tombstone.get('id'), None)
+            if obj is not None:
+                manager.unregister_object(obj)
+
+    return int(root.get('epoch', 0))
+
+
+__all__ = [
+    'FixedOffset',
+    'encode_value',
+    'decode_value',
+    'value_types',
+    'export_delta',
+    'apply_delta'
+]
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Structural comparison of NML namespaces.
+
+Objects of two namespaces are matched by identifier and compared by a content
+hash of their attributes and the identifiers of their related objects, so
+unchanged objects are skipped without comparing their relations one by one.
+Unchanged topologies, groups and nodes are skipped along all their members by
+comparing their Merkle hashes first.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+from hashlib import sha1
+from itertools import chain
+from collections import OrderedDict, namedtuple
+
+from six import text_type
+
+from .nml import unset
+from .mixins import OrderedListMixin
+
+
+VOLATILE_ATTRIBUTES = frozenset(('version', ))
+"""
+Attributes that are not part of the content of an object.
+
+``version`` defaults to the time the object was created, so it would differ
+between two otherwise equal namespaces built at different times.
+"""
+
+
+Diff = namedtuple(
+    'Diff', [
+        'added', 'removed', 'modified',
+        'added_relations', 'removed_relations'
+    ]
+)
+"""
+Differences between two namespaces.
+
+``added`` is the list of objects only in the second namespace, ``removed`` the
+list of objects only in the first one and ``modified`` the list of tuples
+(old object, new object) of the objects in both with different content.
+
+``added_relations`` and ``removed_relations`` are the lists of triples
+(subject identifier, relation name, object identifier) of the relations only
+in the second or only in the first namespace.
+"""
+
+
+def relation_edges(obj):
+    """
+    Get the relations of an object as identifiers.
+
+    Unset members of fixed cardinality relations are skipped.
+
+    :param NMLObject obj: The object.
+    :return: A list of tuples (relation name, object identifier).
+    """
+    return [
+        (relation, related.identifier)
+        for relation, related in obj.iter_relations()
+    ]
+
+
+def content_hash(obj):
+    """
+    Compute a stable hash of the content of an object.
+
+    The content of an object is its class, the values of its attributes but
+    the :data:`VOLATILE_ATTRIBUTES`, and the identifiers of its related
+    objects. Relations of any cardinality are compared as sets, while the
+    order of fixed cardinality relations, like the ports of a
+    :class:`pynml.nml.BidirectionalPort`, and of the items of a
+    :class:`pynml.nml.OrderedList`, is significant.
+
+    :param NMLObject obj: The object.
+    :rtype: str
+    :return: The hexadecimal SHA-1 digest of the content.
+    """
+    parts = [obj.__class__.__name__]
+
+    for attribute in obj.attributes:
+        if attribute in VOLATILE_ATTRIBUTES:
+            continue
+        value = getattr(obj, attribute)
+        if value is not unset and value is not None:
+            parts.append('{}={}'.format(attribute, text_type(value)))
+
+    for relation, relgetter in obj.relations.items():
+        associated = relgetter()
+        if isinstance(associated, OrderedDict):
+            identifiers = sorted(associated)
+        else:
+            identifiers = [
+                '' if related is None else related.identifier
+                for related in associated
+            ]
+        if any(identifiers):
+            parts.append('{}>{}'.format(relation, '\x1f'.join(identifiers)))
+
+    if isinstance(obj, OrderedListMixin):
+        parts.append('items>{}'.format(
+            '\x1f'.join(item.identifier for item in obj)
+        ))
+
+    return sha1('\x1e'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _edges(identifier, obj):
+    """
+    Get the relations of an object as triples.
+    """
+    return [
+        (identifier, relation, related)
+        for relation, related in relation_edges(obj)
+    ]
+
+
+def diff(manager_a, manager_b):
+    """
+    Compare the namespaces of two managers.
+
+    Namespaces with the same root hash are equal (see
+    :meth:`pynml.manager.NMLManager.root_hash`). Otherwise, the top level
+    objects of both namespaces are compared by their Merkle hashes, and the
+    members of an object are only visited if its Merkle hash changed. The
+    cost is proportional to the number of top level objects plus the number
+    of changed objects times their depth, and the managers cache the hashes
+    between calls.
+
+    :param manager_a: The :class:`pynml.manager.NMLManager` with the old
+     namespace.
+    :param manager_b: The :class:`pynml.manager.NMLManager` with the new
+     namespace.
+    :rtype: :data:`Diff`
+    :raises Exception: If the membership relations have a cycle.
+    """
+    added = []
+    removed = []
+    modified = []
+    added_relations = []
+    removed_relations = []
+
+    if manager_a.root_hash() == manager_b.root_hash():
+        return Diff(
+            added, removed, modified, added_relations, removed_relations
+        )
+
+    namespace_a = manager_a.namespace
+    namespace_b = manager_b.namespace
+    visited = set()
+    stack = [
+        obj.identifier
+        for obj in chain(manager_a.top_level(), manager_b.top_level())
+    ]
+
+    while stack:
+        identifier = stack.pop()
+        if identifier in visited:
+            continue
+        visited.add(identifier)
+
+        obj_a = namespace_a.get(identifier, None)
+        obj_b = namespace_b.get(identifier, None)
+        members = []
+
+        if obj_a is None and obj_b is None:
+            continue
+
+        elif obj_a is None:
+            added.append(obj_b)
+            added_relations.extend(_edges(identifier, obj_b))
+            members = manager_b.members(obj_b, recursive=False)
+
+        elif obj_b is None:
+            removed.append(obj_a)
+            removed_relations.extend(_edges(identifier, obj_a))
+            members = manager_a.members(obj_a, recursive=False)
+
+        elif manager_a.merkle_hash(obj_a) != manager_b.merkle_hash(obj_b):
+            members = chain(
+                manager_a.members(obj_a, recursive=False),
+                manager_b.members(obj_b, recursive=False)
+            )
+
+            if manager_a.content_hash(obj_a) != \
+                    manager_b.content_hash(obj_b):
+                modified.append((obj_a, obj_b))
+                edges_a = _edges(identifier, obj_a)
+                edges_b = _edges(identifier, obj_b)
+                known_a = set(edges_a)
+                known_b = set(edges_b)
+                added_relations.extend(
+                    edge for edge in edges_b if edge not in known_a
+                )
+                removed_relations.extend(
+                    edge for edge in edges_a if edge not in known_b
+                )
+
+        stack.extend(
+            member.identifier for member in members
+            if member.identifier not in visited
+        )
+
+    return Diff(
+        added, removed, modified, added_relations, removed_relations
+    )
+
+
+__all__ = [
+    'VOLATILE_ATTRIBUTES',
+    'Diff',
+    'relation_edges',
+    'content_hash',
+    'diff'
+]
@@ -135,7 +135,7 @@ class RelationHasTopologyError(NMLException):
 
 class RelationHasLabelGroupError(NMLException):
     """
-    A hasLabelGroup relation must relate with objects of type Lifetime.
+    A hasLabelGroup relation must relate with objects of type LabelGroup.
     """
 
 
@@ -153,8 +153,8 @@ class RelationHasLinkError(NMLException):
 
 class RelationIsSerialCompoundLinkError(NMLException):
     """
-    A isSerialCompoundLink relation must relate with objects of type Port or
-    PortGroup.
+    A isSerialCompoundLink relation must relate with objects of type
+    OrderedList.
     """
 
 
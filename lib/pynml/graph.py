@@ -0,0 +1,688 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Graph structures and algorithms used by the topology managers.
+
+The algorithms in this module work over integer vertices and integer edges so
+they can be run without walking the NML objects. Managers are in charge of
+building a :class:`Graph` from their namespace and mapping the results back to
+NML objects.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+from heapq import heappush, heappop
+from collections import OrderedDict, deque, namedtuple
+from itertools import count
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+CSRAdjacency = namedtuple(
+    'CSRAdjacency', ['indptr', 'indices', 'data', 'identifiers', 'ordinals']
+)
+"""
+Adjacency matrix in Compressed Sparse Row format.
+
+The neighbors of vertex ``i`` are ``indices[indptr[i]:indptr[i + 1]]``, with
+weights ``data[indptr[i]:indptr[i + 1]]``. ``identifiers`` is the list that
+maps each ordinal to the identifier of the object it represents and
+``ordinals`` the :py:class:`dict` mapping identifiers back to ordinals.
+"""
+
+COOAdjacency = namedtuple(
+    'COOAdjacency', ['row', 'col', 'data', 'identifiers', 'ordinals']
+)
+"""
+Adjacency matrix in Coordinate format.
+
+Same as :class:`CSRAdjacency` but with the explicit ``row`` and ``col`` of
+each entry.
+"""
+
+
+class Graph(object):
+    """
+    Multigraph with integer vertices and edges.
+
+    Vertices and edges are identified by their ordinal, in the order they were
+    added. Each vertex and edge can carry an arbitrary payload.
+
+    :param bool directed: If ``True``, edges can only be traversed from their
+     first endpoint to the second one.
+    :var vertices: List with the payload of each vertex.
+    :var index: :py:class:`dict` mapping a vertex key to its ordinal.
+    :var edges: List of ``(u, v)`` tuples with the endpoints of each edge.
+    :var edge_data: List with the payload of each edge.
+    :var adjacency: List, per vertex, of ``(neighbor, edge)`` tuples.
+    """
+
+    def __init__(self, directed=False):
+        self.directed = directed
+        self.vertices = []
+        self.index = {}
+        self.edges = []
+        self.edge_data = []
+        self.adjacency = []
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def add_vertex(self, key, payload=None):
+        """
+        Add a new vertex to the graph.
+
+        :param key: Hashable key used to find the vertex ordinal in
+         :attr:`index`.
+        :param payload: Object associated with the vertex.
+        :rtype: int
+        :return: The ordinal of the new vertex.
+        """
+        vertex = len(self.vertices)
+        self.vertices.append(payload)
+        self.index[key] = vertex
+        self.adjacency.append([])
+        return vertex
+
+    def add_edge(self, u, v, payload=None):
+        """
+        Add a new edge between vertices `u` and `v`.
+
+        :param int u: Ordinal of the first endpoint.
+        :param int v: Ordinal of the second endpoint.
+        :param payload: Object associated with the edge.
+        :rtype: int
+        :return: The ordinal of the new edge.
+        """
+        edge = len(self.edges)
+        self.edges.append((u, v))
+        self.edge_data.append(payload)
+        self.adjacency[u].append((v, edge))
+        if u != v and not self.directed:
+            self.adjacency[v].append((u, edge))
+        return edge
+
+
+class UnionFind(object):
+    """
+    Disjoint sets of hashable items.
+
+    Implements path compression and union by rank, so all operations run in
+    near constant amortized time. The members of each set are tracked too, by
+    appending the smaller list of members to the larger one on each union.
+
+    :var int count: Number of disjoint sets.
+    """
+
+    def __init__(self, items=()):
+        self._parents = {}
+        self._ranks = {}
+        self._members = {}
+        self.count = 0
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._parents)
+
+    def __contains__(self, item):
+        return item in self._parents
+
+    def add(self, item):
+        """
+        Add a new item in its own set. Does nothing if already present.
+
+        :param item: Hashable item to add.
+        """
+        if item in self._parents:
+            return
+        self._parents[item] = item
+        self._ranks[item] = 0
+        self._members[item] = [item]
+        self.count += 1
+
+    def find(self, item):
+        """
+        Find the representative item of the set of the given item.
+
+        :param item: Item to search for.
+        :return: The representative item of its set.
+        """
+        parents = self._parents
+        root = item
+        while parents[root] != root:
+            root = parents[root]
+
+        # Path compression
+        while parents[item] != root:
+            parents[item], item = root, parents[item]
+
+        return root
+
+    def union(self, item_a, item_b):
+        """
+        Merge the sets of the given items.
+
+        :param item_a: Item of the first set.
+        :param item_b: Item of the second set.
+        :rtype: bool
+        :return: True if the sets were merged, False if the items were
+         already in the same set.
+        """
+        root_a = self.find(item_a)
+        root_b = self.find(item_b)
+        if root_a == root_b:
+            return False
+
+        # Union by rank
+        ranks = self._ranks
+        if ranks[root_a] < ranks[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parents[root_b] = root_a
+        if ranks[root_a] == ranks[root_b]:
+            ranks[root_a] += 1
+
+        larger = self._members.pop(root_a)
+        smaller = self._members.pop(root_b)
+        if len(larger) < len(smaller):
+            larger, smaller = smaller, larger
+        larger.extend(smaller)
+        self._members[root_a] = larger
+
+        self.count -= 1
+        return True
+
+    def connected(self, item_a, item_b):
+        """
+        Check if the given items are in the same set.
+
+        :rtype: bool
+        """
+        return self.find(item_a) == self.find(item_b)
+
+    def members(self, item):
+        """
+        Get all the items in the set of the given item.
+
+        :rtype: list
+        :return: A list of the items of the set, including the given one.
+        """
+        return list(self._members[self.find(item)])
+
+    def sets(self):
+        """
+        Get all the disjoint sets.
+
+        :rtype: list
+        :return: A list of lists of items, in order of first appearance.
+        """
+        sets = OrderedDict()
+        for item in self._parents:
+            sets.setdefault(self.find(item), []).append(item)
+        return list(sets.values())
+
+
+def _unwind(parents, source, target):
+    """
+    Rebuild a path from a map of ``vertex -> (parent, edge)``.
+    """
+    vertices = [target]
+    edges = []
+    vertex = target
+    while vertex != source:
+        vertex, edge = parents[vertex]
+        vertices.append(vertex)
+        edges.append(edge)
+    vertices.reverse()
+    edges.reverse()
+    return vertices, edges
+
+
+def bfs_path(graph, source, target, banned_vertices=(), banned_edges=()):
+    """
+    Find a path with the minimum number of hops between two vertices.
+
+    :param Graph graph: Graph to search.
+    :param int source: Ordinal of the source vertex.
+    :param int target: Ordinal of the target vertex.
+    :param banned_vertices: Collection of vertices the path cannot traverse.
+    :param banned_edges: Collection of edges the path cannot traverse.
+    :return: A tuple ``(vertices, edges)`` with the ordinals of the vertices
+     and edges of the path, or ``None`` if the target is unreachable.
+    """
+    if source in banned_vertices or target in banned_vertices:
+        return None
+
+    adjacency = graph.adjacency
+    parents = {source: None}
+    queue = deque([source])
+
+    while queue:
+        vertex = queue.popleft()
+        if vertex == target:
+            return _unwind(parents, source, target)
+
+        for neighbor, edge in adjacency[vertex]:
+            if neighbor in parents or neighbor in banned_vertices \
+                    or edge in banned_edges:
+                continue
+            parents[neighbor] = (vertex, edge)
+            queue.append(neighbor)
+
+    return None
+
+
+def label_path(graph, source, target, labels, edge_labels):
+    """
+    Find a path with the minimum number of hops along which at least one
+    label is available on every edge.
+
+    Labels are bitmaps, as Python integers where bit ``n`` is set if label
+    ``n`` is available, and ``-1`` means all labels. The labels that survive
+    each partial path are the intersection of the labels of its edges, and a
+    partial path is pruned when they are empty or when all of them already
+    reached its last vertex with fewer or the same hops.
+
+    :param Graph graph: Graph to search.
+    :param int source: Ordinal of the source vertex.
+    :param int target: Ordinal of the target vertex.
+    :param int labels: Bitmap of the candidate labels.
+    :param edge_labels: Callable receiving an edge ordinal and returning the
+     bitmap of the labels available on it.
+    :return: A tuple ``((vertices, edges), labels)`` with the ordinals of the
+     vertices and edges of the path and the bitmap of the labels available
+     along all of it, or ``None`` if there is no such path.
+    """
+    if not labels:
+        return None
+    if source == target:
+        return ([source], []), labels
+
+    adjacency = graph.adjacency
+    covered = [0] * len(graph.vertices)
+    covered[source] = labels
+
+    # Search states (vertex, labels, parent state, edge)
+    states = [(source, labels, None, None)]
+    queue = deque([0])
+
+    while queue:
+        state = queue.popleft()
+        vertex, available = states[state][:2]
+
+        for neighbor, edge in adjacency[vertex]:
+            surviving = available & edge_labels(edge)
+            if not surviving & ~covered[neighbor]:
+                continue
+            covered[neighbor] |= surviving
+            states.append((neighbor, surviving, state, edge))
+
+            if neighbor == target:
+                vertices = []
+                edges = []
+                current = len(states) - 1
+                while current is not None:
+                    vertex, _, current, edge = states[current]
+                    vertices.append(vertex)
+                    if edge is not None:
+                        edges.append(edge)
+                vertices.reverse()
+                edges.reverse()
+                return (vertices, edges), surviving
+
+            queue.append(len(states) - 1)
+
+    return None
+
+
+def dijkstra_path(
+        graph, source, target, weight,
+        banned_vertices=(), banned_edges=()):
+    """
+    Find the path with the minimum total weight between two vertices.
+
+    :param Graph graph: Graph to search.
+    :param int source: Ordinal of the source vertex.
+    :param int target: Ordinal of the target vertex.
+    :param weight: Callable receiving an edge ordinal and returning its
+     non-negative weight.
+    :param banned_vertices: Collection of vertices the path cannot traverse.
+    :param banned_edges: Collection of edges the path cannot traverse.
+    :return: A tuple ``(vertices, edges)`` with the ordinals of the vertices
+     and edges of the path, or ``None`` if the target is unreachable.
+    """
+    if source in banned_vertices or target in banned_vertices:
+        return None
+
+    adjacency = graph.adjacency
+    distances = {source: 0}
+    parents = {source: None}
+    done = set()
+    tiebreak = count()
+    heap = [(0, next(tiebreak), source)]
+
+    while heap:
+        distance, _, vertex = heappop(heap)
+        if vertex in done:
+            continue
+        if vertex == target:
+            return _unwind(parents, source, target)
+        done.add(vertex)
+
+        for neighbor, edge in adjacency[vertex]:
+            if neighbor in done or neighbor in banned_vertices \
+                    or edge in banned_edges:
+                continue
+
+            cost = weight(edge)
+            if cost < 0:
+                raise Exception(
+                    'Negative weight {} in edge {}'.format(cost, edge)
+                )
+
+            candidate = distance + cost
+            if neighbor not in distances or candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                parents[neighbor] = (vertex, edge)
+                heappush(heap, (candidate, next(tiebreak), neighbor))
+
+    return None
+
+
+def k_shortest_paths(graph, source, target, k, weight=None):
+    """
+    Find the `k` shortest simple paths between two vertices.
+
+    This is an implementation of Yen's algorithm. If `weight` is ``None``
+    paths are ranked by number of hops.
+
+    :param Graph graph: Graph to search.
+    :param int source: Ordinal of the source vertex.
+    :param int target: Ordinal of the target vertex.
+    :param int k: Maximum number of paths to return.
+    :param weight: Callable receiving an edge ordinal and returning its
+     non-negative weight, or ``None``.
+    :rtype: list
+    :return: A list of up to `k` ``(vertices, edges)`` tuples sorted by cost.
+    """
+    if weight is None:
+        def weight(edge):
+            return 1
+
+        def search(spur, banned_vertices, banned_edges):
+            return bfs_path(
+                graph, spur, target, banned_vertices, banned_edges
+            )
+    else:
+        def search(spur, banned_vertices, banned_edges):
+            return dijkstra_path(
+                graph, spur, target, weight, banned_vertices, banned_edges
+            )
+
+    def cost(edges):
+        return sum(weight(edge) for edge in edges)
+
+    first = search(source, (), ())
+    if first is None or k < 1:
+        return []
+
+    paths = [first]
+    seen = {tuple(first[1])}
+    candidates = []
+    tiebreak = count()
+
+    while len(paths) < k:
+        vertices, edges = paths[-1]
+
+        for spur_idx in range(len(vertices) - 1):
+            spur = vertices[spur_idx]
+            root_vertices = vertices[:spur_idx + 1]
+            root_edges = edges[:spur_idx]
+
+            # Ban the next edge of every accepted path sharing this root
+            banned_edges = set()
+            for path_vertices, path_edges in paths:
+                if len(path_edges) > spur_idx and \
+                        path_edges[:spur_idx] == root_edges:
+                    banned_edges.add(path_edges[spur_idx])
+
+            # Ban the root vertices to keep the path simple
+            banned_vertices = set(root_vertices[:-1])
+
+            spur_path = search(spur, banned_vertices, banned_edges)
+            if spur_path is None:
+                continue
+
+            total_edges = root_edges + spur_path[1]
+            key = tuple(total_edges)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            total = (root_vertices[:-1] + spur_path[0], total_edges)
+            heappush(
+                candidates, (cost(total_edges), next(tiebreak), total)
+            )
+
+        if not candidates:
+            break
+        paths.append(heappop(candidates)[2])
+
+    return paths
+
+
+def strongly_connected_components(successors):
+    """
+    Find the strongly connected components of a directed graph.
+
+    This is an iterative implementation of Tarjan's algorithm.
+
+    :param list successors: List, per vertex, with the ordinals of the
+     vertices it has an edge to.
+    :rtype: list
+    :return: A list of lists of vertex ordinals, one per component, in
+     reverse topological order.
+    """
+    size = len(successors)
+    indexes = [-1] * size
+    lowlinks = [0] * size
+    on_stack = [False] * size
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(size):
+        if indexes[root] != -1:
+            continue
+
+        indexes[root] = lowlinks[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(successors[root]))]
+
+        while work:
+            vertex, neighbors = work[-1]
+
+            for neighbor in neighbors:
+                if indexes[neighbor] == -1:
+                    indexes[neighbor] = lowlinks[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = True
+                    work.append((neighbor, iter(successors[neighbor])))
+                    break
+                if on_stack[neighbor]:
+                    lowlinks[vertex] = min(lowlinks[vertex], indexes[neighbor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[vertex])
+
+                if lowlinks[vertex] == indexes[vertex]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def cut_elements(graph):
+    """
+    Find the bridges and articulation points of a graph.
+
+    A bridge is an edge, and an articulation point a vertex, whose removal
+    increases the number of connected components. This is an iterative
+    implementation of Tarjan's algorithm and runs in ``O(V + E)``. Parallel
+    edges are handled, so an edge with a parallel edge is never a bridge.
+
+    :param Graph graph: Graph to analyze.
+    :return: A tuple (bridges, articulation points) with the sorted lists of
+     the ordinals of the bridge edges and articulation vertices.
+    """
+    adjacency = graph.adjacency
+    size = len(adjacency)
+    discovery = [-1] * size
+    low = [0] * size
+    bridges = []
+    articulations = set()
+    counter = 0
+
+    for root in range(size):
+        if discovery[root] != -1:
+            continue
+
+        discovery[root] = low[root] = counter
+        counter += 1
+        root_children = 0
+        work = [(root, -1, iter(adjacency[root]))]
+
+        while work:
+            vertex, parent_edge, neighbors = work[-1]
+
+            for neighbor, edge in neighbors:
+                if edge == parent_edge:
+                    continue
+                if discovery[neighbor] == -1:
+                    discovery[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    work.append((neighbor, edge, iter(adjacency[neighbor])))
+                    break
+                low[vertex] = min(low[vertex], discovery[neighbor])
+            else:
+                work.pop()
+                if not work:
+                    continue
+
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[vertex])
+
+                if low[vertex] > discovery[parent]:
+                    bridges.append(parent_edge)
+
+                if parent == root:
+                    root_children += 1
+                elif low[vertex] >= discovery[parent]:
+                    articulations.add(parent)
+
+        if root_children > 1:
+            articulations.add(root)
+
+    return sorted(bridges), sorted(articulations)
+
+
+def require_numpy():
+    """
+    Raise an exception if the optional NumPy package is not installed.
+    """
+    if numpy is None:
+        raise Exception('Missing NumPy package')
+
+
+def sparse_adjacency(size, rows, cols, data, identifiers, format='csr'):
+    """
+    Build a sparse adjacency matrix from a list of entries.
+
+    Duplicated entries, for example parallel links, are summed.
+
+    :param int size: Number of vertices.
+    :param rows: Sequence with the source vertex of each entry.
+    :param cols: Sequence with the destination vertex of each entry.
+    :param data: Sequence with the weight of each entry.
+    :param list identifiers: Identifier of the object of each vertex.
+    :param str format: Either ``csr`` or ``coo``.
+    :rtype: :class:`CSRAdjacency` or :class:`COOAdjacency`
+    :return: The adjacency matrix in the requested format.
+    """
+    require_numpy()
+
+    if format not in ('csr', 'coo'):
+        raise Exception(
+            'Unsupported format "{}". '
+            'Supported formats are: csr, coo'.format(format)
+        )
+
+    rows = numpy.asarray(rows, dtype=numpy.int64)
+    cols = numpy.asarray(cols, dtype=numpy.int64)
+    data = numpy.asarray(data, dtype=numpy.float64)
+
+    # Sort by row and column and sum duplicates
+    order = numpy.lexsort((cols, rows))
+    rows, cols, data = rows[order], cols[order], data[order]
+    if len(rows):
+        starts = numpy.flatnonzero(numpy.concatenate((
+            [True], (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        )))
+        rows, cols = rows[starts], cols[starts]
+        data = numpy.add.reduceat(data, starts)
+
+    ordinals = {
+        identifier: ordinal for ordinal, identifier in enumerate(identifiers)
+    }
+
+    if format == 'coo':
+        return COOAdjacency(rows, cols, data, list(identifiers), ordinals)
+
+    indptr = numpy.zeros(size + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(rows, minlength=size), out=indptr[1:])
+    return CSRAdjacency(indptr, cols, data, list(identifiers), ordinals)
+
+
+__all__ = [
+    'Graph',
+    'UnionFind',
+    'strongly_connected_components',
+    'cut_elements',
+    'CSRAdjacency',
+    'COOAdjacency',
+    'sparse_adjacency',
+    'bfs_path',
+    'label_path',
+    'dijkstra_path',
+    'k_shortest_paths'
+]
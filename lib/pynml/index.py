@@ -0,0 +1,1603 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Namespace indexes maintained by the topology managers.
+
+An index is created by the manager the first time it is needed, it is
+bootstrapped from the objects already registered in the namespace and then it
+is kept up to date with the notifications the registered objects send to the
+manager.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+import re
+from abc import ABCMeta, abstractmethod
+from array import array
+from calendar import timegm
+from datetime import datetime, timedelta
+from hashlib import sha1
+from itertools import takewhile
+from collections import OrderedDict
+
+from six import add_metaclass, string_types
+
+from .nml import (
+    Port, Node, SwitchingService, AdaptationService, DeAdaptationService,
+    Lifetime, Location, Label, LabelGroup
+)
+from .graph import Graph, UnionFind, numpy
+from .labels import LabelSet
+from .diff import content_hash
+from .spatial import KDTree, to_cartesian, chord_to_km, km_to_chord
+
+
+TIMESTAMP_RE = re.compile(
+    r'^(?P<year>\d{4})-?(?P<month>\d{2})-?(?P<day>\d{2})'
+    r'(?:[T ](?P<hour>\d{2}):?(?P<minute>\d{2})(?::?(?P<second>\d{2}))?'
+    r'(?:\.\d+)?)?'
+    r'(?P<zone>Z|[+-]\d{2}:?\d{2})?$'
+)
+
+
+def parse_timestamp(value):
+    """
+    Convert a timestamp to an integer number of seconds since the epoch.
+
+    Accepts ISO 8601 strings in basic (``YYYYMMDDThhmmssZ``) or extended
+    (``YYYY-MM-DDThh:mm:ss``) format, with or without timezone (timestamps
+    without a timezone are considered UTC), :py:class:`datetime.datetime`
+    objects and numbers, which are returned as is.
+
+    :param value: Timestamp to convert.
+    :rtype: int
+    :return: Seconds since 1970-01-01T00:00:00Z.
+    """
+    if isinstance(value, datetime):
+        if value.utcoffset() is not None:
+            value = value.replace(tzinfo=None) - value.utcoffset()
+        return timegm(value.timetuple())
+
+    if not isinstance(value, string_types):
+        return int(value)
+
+    match = TIMESTAMP_RE.match(value.strip())
+    if match is None:
+        raise Exception('Invalid ISO 8601 timestamp "{}"'.format(value))
+
+    fields = match.groupdict()
+    epoch = timegm(datetime(
+        int(fields['year']), int(fields['month']), int(fields['day']),
+        int(fields['hour'] or 0), int(fields['minute'] or 0),
+        int(fields['second'] or 0)
+    ).timetuple())
+
+    zone = fields['zone']
+    if zone and zone != 'Z':
+        offset = timedelta(
+            hours=int(zone[1:3]), minutes=int(zone[-2:])
+        )
+        seconds = offset.days * 86400 + offset.seconds
+        epoch += -seconds if zone[0] == '+' else seconds
+
+    return epoch
+
+
+class IntervalTree(object):
+    """
+    Static centered interval tree over closed intervals.
+
+    Stabbing and overlap queries run in ``O(log n + k)``, with ``k`` the
+    number of intervals found.
+
+    :param intervals: Iterable of tuples (start, end, payload).
+    """
+
+    def __init__(self, intervals):
+        self._root = self._build(list(intervals))
+
+    def _build(self, intervals):
+        if not intervals:
+            return None
+
+        points = sorted(
+            point for start, end, _ in intervals for point in (start, end)
+        )
+        center = points[len(points) // 2]
+
+        left = []
+        right = []
+        here = []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        return (
+            center,
+            sorted(here, key=lambda interval: interval[0]),
+            sorted(here, key=lambda interval: interval[1], reverse=True),
+            self._build(left),
+            self._build(right)
+        )
+
+    def overlap(self, low, high):
+        """
+        Find the intervals that overlap with the interval [low, high].
+
+        :return: An iterator of the payloads of the matching intervals.
+        """
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            center, by_start, by_end, left, right = node
+
+            if high < center:
+                for start, end, payload in by_start:
+                    if start > high:
+                        break
+                    yield payload
+                stack.append(left)
+            elif low > center:
+                for start, end, payload in by_end:
+                    if end < low:
+                        break
+                    yield payload
+                stack.append(right)
+            else:
+                for _, _, payload in by_start:
+                    yield payload
+                stack.append(left)
+                stack.append(right)
+
+    def stab(self, point):
+        """
+        Find the intervals that contain the given point.
+
+        :return: An iterator of the payloads of the matching intervals.
+        """
+        return self.overlap(point, point)
+
+
+class NamespaceIndex(object):
+    """
+    Base class for all namespace indexes.
+
+    Subclasses override the notification callbacks they are interested in.
+    """
+
+    def bootstrap(self, namespace):
+        """
+        Index all objects already registered into a namespace.
+
+        :param namespace: :py:class:`OrderedDict` with the registered objects.
+        """
+        for obj in namespace.values():
+            self.object_registered(obj)
+
+    def object_registered(self, obj):
+        """
+        Called when an object is registered into the namespace.
+
+        The default implementation reports all the relations of the object as
+        added.
+
+        :param NMLObject obj: The registered object.
+        """
+        for relation, related in obj.iter_relations():
+            self.relation_changed(obj, relation, (related, ), ())
+
+    def object_unregistered(self, obj):
+        """
+        Called when an object is unregistered from the namespace.
+
+        The default implementation reports all the relations of the object as
+        removed.
+
+        :param NMLObject obj: The unregistered object.
+        """
+        for relation, related in obj.iter_relations():
+            self.relation_changed(obj, relation, (), (related, ))
+
+    def relation_changed(self, obj, relation, added, removed):
+        """
+        Called when a relation of a registered object changes.
+
+        :param NMLObject obj: The object whose relation changed.
+        :param str relation: Name of the relation.
+        :param tuple added: Objects added to the relation.
+        :param tuple removed: Objects removed from the relation.
+        """
+
+    def attribute_changed(self, obj, attribute, value):
+        """
+        Called when an attribute of a registered object changes.
+
+        :param NMLObject obj: The object whose attribute changed.
+        :param str attribute: Name of the attribute.
+        :param value: New value of the attribute.
+        """
+
+
+class TripleStore(NamespaceIndex):
+    """
+    Store of all the relations in a namespace as integer encoded triples.
+
+    Each relation is stored as a ``(subject, relation, object)`` row in three
+    ``array('i')`` columns. Objects are encoded by the ordinal of their
+    identifier in :attr:`identifiers` and relations by the ordinal of their
+    name in :attr:`relations`. Removed rows are marked with a relation of
+    ``-1`` and compacted lazily.
+
+    If the optional NumPy package is installed :meth:`select` is vectorized
+    over the columns.
+
+    :var identifiers: List mapping each object ordinal to its identifier.
+    :var relations: List mapping each relation ordinal to its name.
+    """
+
+    def __init__(self):
+        self.identifiers = []
+        self.relations = []
+        self._identifier_ordinals = {}
+        self._relation_ordinals = {}
+        self._subjects = array(str('i'))
+        self._predicates = array(str('i'))
+        self._objects = array(str('i'))
+        self._rows = {}
+        self._removed = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _encode(self, ordinals, values, value):
+        """
+        Get the ordinal of a value, adding it if not present.
+        """
+        ordinal = ordinals.get(value, None)
+        if ordinal is None:
+            ordinal = len(values)
+            values.append(value)
+            ordinals[value] = ordinal
+        return ordinal
+
+    def relation_changed(self, obj, relation, added, removed):
+        subject = self._encode(
+            self._identifier_ordinals, self.identifiers, obj.identifier
+        )
+        predicate = self._encode(
+            self._relation_ordinals, self.relations, relation
+        )
+
+        for related in removed:
+            ordinal = self._identifier_ordinals.get(related.identifier, None)
+            row = self._rows.pop((subject, predicate, ordinal), None)
+            if row is not None:
+                self._predicates[row] = -1
+                self._removed += 1
+
+        for related in added:
+            key = (
+                subject, predicate, self._encode(
+                    self._identifier_ordinals, self.identifiers,
+                    related.identifier
+                )
+            )
+            if key in self._rows:
+                continue
+            self._rows[key] = len(self._subjects)
+            self._subjects.append(key[0])
+            self._predicates.append(key[1])
+            self._objects.append(key[2])
+
+        if self._removed > len(self._rows):
+            self.compact()
+
+    def compact(self):
+        """
+        Remove the rows of deleted triples from the columns.
+        """
+        subjects = array(str('i'))
+        predicates = array(str('i'))
+        objects = array(str('i'))
+        rows = {}
+        for key in self._rows:
+            rows[key] = len(subjects)
+            subjects.append(key[0])
+            predicates.append(key[1])
+            objects.append(key[2])
+
+        self._subjects = subjects
+        self._predicates = predicates
+        self._objects = objects
+        self._rows = rows
+        self._removed = 0
+
+    def _views(self):
+        """
+        Get NumPy views sharing memory with the columns.
+
+        The views must be released before the store is modified again, as
+        arrays cannot be resized while their buffer is exported.
+        """
+        return tuple(
+            numpy.frombuffer(column, dtype=numpy.intc)
+            if len(column) else numpy.zeros(0, dtype=numpy.intc)
+            for column in (self._subjects, self._predicates, self._objects)
+        )
+
+    def columns(self):
+        """
+        Get a copy of the subject, relation and object columns.
+
+        Rows of deleted triples have a relation of ``-1``.
+
+        :return: A tuple (subjects, relations, objects) of NumPy arrays if
+         NumPy is installed, or of ``array('i')`` if not.
+        """
+        if numpy is None:
+            return tuple(
+                array(str('i'), column) for column in
+                (self._subjects, self._predicates, self._objects)
+            )
+        return tuple(view.copy() for view in self._views())
+
+    def select(self, relation=None, subject=None, target=None):
+        """
+        Select the triples matching the given relation and endpoints.
+
+        Any of the filters can be ``None`` to match everything.
+
+        :param str relation: Relation name to match.
+        :param subject: Subject object or identifier to match.
+        :param target: Related object or identifier to match.
+        :return: A tuple (subjects, relations, objects) of integer columns
+         with the matching triples. See :attr:`identifiers` and
+         :attr:`relations` to decode them.
+        """
+        filters = []
+        for ordinals, value, column in (
+                (self._relation_ordinals, relation, 1),
+                (self._identifier_ordinals, subject, 0),
+                (self._identifier_ordinals, target, 2)):
+            if value is None:
+                continue
+            value = getattr(value, 'identifier', value)
+            ordinal = ordinals.get(value, None)
+            if ordinal is None:
+                ordinal = -2  # Nothing will match
+            filters.append((column, ordinal))
+
+        if numpy is not None:
+            columns = self._views()
+            mask = columns[1] >= 0
+            for column, ordinal in filters:
+                mask &= columns[column] == ordinal
+            return tuple(column[mask] for column in columns)
+
+        columns = (self._subjects, self._predicates, self._objects)
+        selected = tuple(array(str('i')) for _ in columns)
+        for row in range(len(columns[0])):
+            if columns[1][row] < 0:
+                continue
+            if all(columns[col][row] == ordinal for col, ordinal in filters):
+                for col in range(3):
+                    selected[col].append(columns[col][row])
+        return selected
+
+    def triples(self, relation=None, subject=None, target=None):
+        """
+        Iterate over the triples matching the given relation and endpoints.
+
+        See :meth:`select` for the meaning of the arguments.
+
+        :return: An iterator of tuples (subject identifier, relation name,
+         object identifier).
+        """
+        identifiers = self.identifiers
+        relations = self.relations
+        for subj, pred, obj in zip(
+                *self.select(relation, subject, target)):
+            yield identifiers[subj], relations[pred], identifiers[obj]
+
+
+@add_metaclass(ABCMeta)
+class RelatedValueIndex(NamespaceIndex):
+    """
+    Base class of the indexes of a value computed from the targets of a
+    relation.
+
+    The value of each target is computed once with :meth:`_parse` when it is
+    first related from a registered object, and computed again only when any
+    of the target ``attributes`` changes. Subclasses implement :meth:`_parse`
+    and are told that the values changed through :meth:`_changed`.
+
+    :var str relation: Name of the relation to index.
+    :var tuple attributes: Names of the attributes of the targets the value
+     depends on.
+    """
+
+    relation = None
+    attributes = ()
+
+    def __init__(self):
+        self._values = {}
+        self._subjects = {}
+        self._targets = {}
+
+    @abstractmethod
+    def _parse(self, target):
+        """
+        Compute the value of a target of the relation.
+        """
+
+    def _changed(self):
+        """
+        Called when values were added, removed or modified.
+        """
+
+    def relation_changed(self, obj, relation, added, removed):
+        if relation != self.relation:
+            return
+
+        for target in removed:
+            subjects = self._subjects.get(target.identifier, None)
+            if subjects is None:
+                continue
+            if subjects.pop(obj.identifier, None) is None:
+                continue
+            targets = self._targets[obj.identifier]
+            targets.remove(target.identifier)
+            if not targets:
+                del self._targets[obj.identifier]
+            if not subjects:
+                del self._subjects[target.identifier]
+                del self._values[target.identifier]
+                target.observers.remove(self)
+            self._changed()
+
+        for target in added:
+            if target.identifier not in self._values:
+                # Follow the changes of targets even if not registered
+                target.observers.append(self)
+                self._values[target.identifier] = self._parse(target)
+                self._subjects[target.identifier] = OrderedDict()
+            subjects = self._subjects[target.identifier]
+            if obj.identifier not in subjects:
+                subjects[obj.identifier] = obj
+                self._targets.setdefault(obj.identifier, []).append(
+                    target.identifier
+                )
+            self._changed()
+
+    def attribute_changed(self, obj, attribute, value):
+        if attribute not in self.attributes or \
+                obj.identifier not in self._values:
+            return
+        self._values[obj.identifier] = self._parse(obj)
+        self._changed()
+
+    def is_related(self, obj):
+        """
+        Check if an object is related to any target of the relation.
+
+        :param NMLObject obj: Object to check.
+        :rtype: bool
+        """
+        return obj.identifier in self._targets
+
+    def values(self, obj):
+        """
+        Get the values of the targets an object is related to.
+
+        :param NMLObject obj: Subject of the relation.
+        :rtype: list
+        """
+        return [
+            self._values[target_id]
+            for target_id in self._targets.get(obj.identifier, ())
+        ]
+
+    def _subjects_of(self, targets):
+        """
+        Collect the unique subjects of the given target identifiers.
+        """
+        found = OrderedDict()
+        for target_id in targets:
+            for subject_id, subject in self._subjects[target_id].items():
+                found[subject_id] = subject
+        return list(found.values())
+
+
+class LifetimeIndex(RelatedValueIndex):
+    """
+    Index of the ``existsDuring`` relations of a namespace.
+
+    The bounds of each related :class:`pynml.nml.Lifetime` are parsed once to
+    epochs (see :func:`parse_timestamp`) and stored in an
+    :class:`IntervalTree` rebuilt on the first query after a change.
+    """
+
+    relation = 'existsDuring'
+    attributes = ('start', 'end')
+
+    def __init__(self):
+        super(LifetimeIndex, self).__init__()
+        self._tree = None
+
+    def _parse(self, lifetime):
+        """
+        Parse the bounds of a lifetime. Missing bounds are unbounded.
+        """
+        start = float('-inf')
+        if lifetime.start is not None:
+            start = parse_timestamp(lifetime.start)
+        end = float('inf')
+        if lifetime.end is not None:
+            end = parse_timestamp(lifetime.end)
+        return start, end
+
+    def _changed(self):
+        self._tree = None
+
+    def tree(self):
+        """
+        Get the interval tree of all lifetimes.
+
+        :rtype: :class:`IntervalTree`
+        :return: Tree with the lifetime identifiers as payload.
+        """
+        if self._tree is None:
+            self._tree = IntervalTree(
+                (start, end, lifetime_id)
+                for lifetime_id, (start, end) in self._values.items()
+            )
+        return self._tree
+
+    def active_at(self, timestamp):
+        """
+        Find the objects with a lifetime that contains a timestamp.
+
+        :param timestamp: Timestamp, see :func:`parse_timestamp`.
+        :rtype: list
+        """
+        return self._subjects_of(
+            self.tree().stab(parse_timestamp(timestamp))
+        )
+
+    def active_between(self, start, end):
+        """
+        Find the objects with a lifetime that overlaps an interval.
+
+        :param start: Start of the interval, see :func:`parse_timestamp`.
+        :param end: End of the interval, see :func:`parse_timestamp`.
+        :rtype: list
+        """
+        return self._subjects_of(self.tree().overlap(
+            parse_timestamp(start), parse_timestamp(end)
+        ))
+
+
+class SpatialIndex(RelatedValueIndex):
+    """
+    Index of the ``locatedAt`` relations of a namespace.
+
+    The coordinates of each related :class:`pynml.nml.Location` are parsed
+    once to floats and stored in a :class:`pynml.spatial.KDTree` rebuilt on
+    the first query after a change. Locations without valid latitude and
+    longitude are not indexed.
+    """
+
+    relation = 'locatedAt'
+    attributes = ('latitude', 'longitude')
+
+    def __init__(self):
+        super(SpatialIndex, self).__init__()
+        self._tree = None
+
+    def _parse(self, location):
+        """
+        Parse the coordinates of a location, or `None` if not valid.
+        """
+        try:
+            coordinates = float(location.latitude), float(location.longitude)
+        except (TypeError, ValueError):
+            return None
+        if not -90 <= coordinates[0] <= 90:
+            return None
+        return coordinates
+
+    def _changed(self):
+        self._tree = None
+
+    def tree(self):
+        """
+        Get the k-d tree of all located locations.
+
+        :rtype: :class:`pynml.spatial.KDTree`
+        :return: Tree with the location identifiers as payload.
+        """
+        if self._tree is None:
+            self._tree = KDTree(
+                (to_cartesian(*coordinates), location_id)
+                for location_id, coordinates in self._values.items()
+                if coordinates is not None
+            )
+        return self._tree
+
+    def _located(self, found):
+        """
+        Expand (chord, location identifier) tuples to sorted
+        (kilometers, object) tuples.
+        """
+        return sorted((
+            (chord_to_km(chord), subject)
+            for chord, location_id in found
+            for subject in self._subjects[location_id].values()
+        ), key=lambda entry: entry[0])
+
+    def within_radius(self, latitude, longitude, km):
+        """
+        Find the objects located at most at the given distance of a point.
+
+        :param float latitude: Latitude of the point in decimal degrees.
+        :param float longitude: Longitude of the point in decimal degrees.
+        :param float km: Maximum great-circle distance in kilometers.
+        :rtype: list
+        :return: A list of tuples (distance in kilometers, object) sorted by
+         distance.
+        """
+        return self._located(self.tree().within(
+            to_cartesian(latitude, longitude), km_to_chord(km)
+        ))
+
+    def nearest(self, latitude, longitude, k=1):
+        """
+        Find the ``k`` objects located closest to a point.
+
+        :param float latitude: Latitude of the point in decimal degrees.
+        :param float longitude: Longitude of the point in decimal degrees.
+        :param int k: Number of objects to find.
+        :rtype: list
+        :return: A list of tuples (distance in kilometers, object) sorted by
+         distance.
+        """
+        # Each location has at least one object, so the nearest k objects
+        # are located at the nearest k locations
+        return self._located(self.tree().nearest(
+            to_cartesian(latitude, longitude), k
+        ))[:k]
+
+    def coordinates(self):
+        """
+        Get the coordinates of all located objects.
+
+        :rtype: tuple
+        :return: A tuple (objects, latitudes, longitudes) of lists.
+        """
+        objects = []
+        latitudes = []
+        longitudes = []
+        for location_id, coordinates in self._values.items():
+            if coordinates is None:
+                continue
+            for subject in self._subjects[location_id].values():
+                objects.append(subject)
+                latitudes.append(coordinates[0])
+                longitudes.append(coordinates[1])
+        return objects, latitudes, longitudes
+
+
+class LabelIndex(RelatedValueIndex):
+    """
+    Index of the ``hasLabel`` relations of a namespace.
+
+    The value of each related :class:`pynml.nml.Label` is converted once to a
+    :class:`pynml.labels.LabelSet` (see :meth:`pynml.labels.LabelSet.coerce`)
+    and stored along its label type.
+    """
+
+    relation = 'hasLabel'
+    attributes = ('labeltype', 'value')
+
+    def _parse(self, label):
+        """
+        Get the tuple (label type, label set) of a label.
+        """
+        return label.labeltype, LabelSet.coerce(label.value)
+
+
+class LabelGroupIndex(LabelIndex):
+    """
+    Index of the ``hasLabelGroup`` relations of a namespace.
+
+    See :class:`LabelIndex`.
+    """
+
+    relation = 'hasLabelGroup'
+
+
+class LayeredGraphIndex(NamespaceIndex):
+    """
+    Directed multi-layer graph of the ports of a namespace.
+
+    Each registered :class:`pynml.nml.Port` is a vertex, and each edge carries
+    a tuple (kind, object) with the kind of hop and the object that provides
+    it:
+
+    ``link``
+     From the source to the sinks of a :class:`pynml.nml.Link`.
+    ``node``
+     From each inbound port of a :class:`pynml.nml.Node` to each of its
+     outbound ports with the same encoding.
+    ``switching``
+     From each inbound port of a :class:`pynml.nml.SwitchingService` to each
+     of its outbound ports.
+    ``adaptation``
+     From each port an :class:`pynml.nml.AdaptationService` provides, or can
+     provide, to the port that has the service, where their data is embedded.
+    ``deadaptation``
+     From the port that has a :class:`pynml.nml.DeAdaptationService` to each
+     port the service provides, or can provide, where the data is extracted.
+
+    The graph is built on the first query after any of the relations or port
+    encodings it depends on changes.
+    """
+
+    relations = frozenset((
+        'isSource', 'isSink', 'hasInboundPort', 'hasOutboundPort',
+        'hasService', 'providesPort', 'canProvidePort'
+    ))
+
+    def __init__(self):
+        self._namespace = None
+        self._graph = None
+
+    def bootstrap(self, namespace):
+        self._namespace = namespace
+
+    def object_registered(self, obj):
+        self._graph = None
+
+    def object_unregistered(self, obj):
+        self._graph = None
+
+    def relation_changed(self, obj, relation, added, removed):
+        if relation in self.relations:
+            self._graph = None
+
+    def attribute_changed(self, obj, attribute, value):
+        if attribute == 'encoding':
+            self._graph = None
+
+    def graph(self):
+        """
+        Get the layered graph, building it if required.
+
+        :rtype: :class:`pynml.graph.Graph`
+        :return: A directed graph with the ports as vertices, keyed by
+         identifier.
+        """
+        if self._graph is not None:
+            return self._graph
+
+        graph = Graph(directed=True)
+        index = graph.index
+
+        for obj in self._namespace.values():
+            if isinstance(obj, Port):
+                graph.add_vertex(obj.identifier, obj)
+
+        def connect(sources, targets, payload, same_encoding=False):
+            for source in sources:
+                for target in targets:
+                    if source.identifier not in index or \
+                            target.identifier not in index:
+                        continue
+                    if same_encoding and source.encoding != target.encoding:
+                        continue
+                    graph.add_edge(
+                        index[source.identifier], index[target.identifier],
+                        payload
+                    )
+
+        sources = OrderedDict()
+        sinks = {}
+        for port in graph.vertices:
+            for relation, related in port.iter_relations():
+                if relation == 'isSource':
+                    sources.setdefault(related.identifier, (related, []))
+                    sources[related.identifier][1].append(port)
+                elif relation == 'isSink':
+                    sinks.setdefault(related.identifier, []).append(port)
+
+        for link_id, (link, link_sources) in sources.items():
+            connect(link_sources, sinks.get(link_id, ()), ('link', link))
+
+        for obj in self._namespace.values():
+            if isinstance(obj, Node):
+                connect(
+                    obj.get_has_inbound_port().values(),
+                    obj.get_has_outbound_port().values(),
+                    ('node', obj), same_encoding=True
+                )
+            elif isinstance(obj, SwitchingService):
+                connect(
+                    obj.get_has_inbound_port().values(),
+                    obj.get_has_outbound_port().values(),
+                    ('switching', obj)
+                )
+
+        for port in list(graph.vertices):
+            for service in port.get_has_service().values():
+                provided = list(service.get_provides_port().values()) + \
+                    list(service.get_can_provide_port().values())
+                if isinstance(service, AdaptationService):
+                    connect(provided, (port, ), ('adaptation', service))
+                elif isinstance(service, DeAdaptationService):
+                    connect((port, ), provided, ('deadaptation', service))
+
+        self._graph = graph
+        return graph
+
+
+class ForwardingDomainIndex(NamespaceIndex):
+    """
+    Forwarding domains of the ports of a namespace.
+
+    Ports are in the same forwarding domain if they are bridged by a
+    :class:`pynml.nml.SwitchingService` (``hasInboundPort``,
+    ``hasOutboundPort``) or connected by a :class:`pynml.nml.Link`
+    (``isSource``, ``isSink``), directly or through other ports. Services and
+    links are kept in a :class:`pynml.graph.UnionFind` along the ports, so
+    domains are found in near constant time.
+
+    The sets are merged as relations are added, and rebuilt on the first query
+    after a relation is removed, as sets cannot be split.
+    """
+
+    def __init__(self):
+        self._namespace = None
+        self._sets = None
+        self._ports = None
+
+    def bootstrap(self, namespace):
+        self._namespace = namespace
+        self._sets = None
+
+    def object_registered(self, obj):
+        if self._sets is not None:
+            for relation, related in obj.iter_relations():
+                self.relation_changed(obj, relation, (related, ), ())
+
+    def object_unregistered(self, obj):
+        self._sets = None
+
+    def _union(self, obj, related):
+        """
+        Merge the sets of two objects.
+        """
+        for item in (obj, related):
+            if item.identifier not in self._sets:
+                self._sets.add(item.identifier)
+                if isinstance(item, Port):
+                    self._ports[item.identifier] = item
+        self._sets.union(obj.identifier, related.identifier)
+
+    def relation_changed(self, obj, relation, added, removed):
+        if relation in ('isSource', 'isSink'):
+            if not isinstance(obj, Port):
+                return
+        elif relation in ('hasInboundPort', 'hasOutboundPort',
+                          'providesLink'):
+            if not isinstance(obj, SwitchingService):
+                return
+        else:
+            return
+
+        if removed:
+            self._sets = None
+        if self._sets is None:
+            return
+        for related in added:
+            self._union(obj, related)
+
+    def _build(self):
+        """
+        Build the sets from all the objects of the namespace.
+        """
+        self._sets = UnionFind()
+        self._ports = {}
+        for obj in self._namespace.values():
+            self.object_registered(obj)
+
+    def domain(self, port):
+        """
+        Get the forwarding domain of a port.
+
+        :param port: The port.
+        :type port: :class:`pynml.nml.Port`
+        :rtype: list
+        :return: A list of all :class:`pynml.nml.Port` in the domain of the
+         port, including itself.
+        """
+        if self._sets is None:
+            self._build()
+        if port.identifier not in self._sets:
+            return [port]
+        return [
+            self._ports[member]
+            for member in self._sets.members(port.identifier)
+            if member in self._ports
+        ]
+
+    def domains(self):
+        """
+        Get all forwarding domains with at least one port.
+
+        :rtype: list
+        :return: A list of lists of :class:`pynml.nml.Port`, one per domain.
+        """
+        if self._sets is None:
+            self._build()
+        domains = []
+        for members in self._sets.sets():
+            ports = [
+                self._ports[member] for member in members
+                if member in self._ports
+            ]
+            if ports:
+                domains.append(ports)
+        return domains
+
+
+class AliasIndex(NamespaceIndex):
+    """
+    Equivalence classes of the ``isAlias`` relations of a namespace.
+
+    Aliases are kept in a :class:`pynml.graph.UnionFind`, so the relation is
+    treated as symmetric and transitive. The canonical object of each class
+    is the one with the lowest identifier, so it doesn't depend on the order
+    objects were registered or related.
+
+    Classes are merged as relations are added, and rebuilt on the first query
+    after a relation is removed, as sets cannot be split.
+    """
+
+    def __init__(self):
+        self._namespace = None
+        self._sets = None
+        self._objects = None
+        self._canonical = None
+
+    def bootstrap(self, namespace):
+        self._namespace = namespace
+        self._sets = None
+
+    def object_registered(self, obj):
+        if self._sets is not None:
+            for relation, related in obj.iter_relations():
+                self.relation_changed(obj, relation, (related, ), ())
+
+    def object_unregistered(self, obj):
+        self._sets = None
+
+    def relation_changed(self, obj, relation, added, removed):
+        if relation != 'isAlias':
+            return
+        if removed:
+            self._sets = None
+        if self._sets is None:
+            return
+
+        sets = self._sets
+        canonical = self._canonical
+        for related in added:
+            self._add(obj)
+            self._add(related)
+            root_a = sets.find(obj.identifier)
+            root_b = sets.find(related.identifier)
+            if not sets.union(root_a, root_b):
+                continue
+
+            canonical[sets.find(root_a)] = min(
+                canonical.pop(root_a), canonical.pop(root_b)
+            )
+
+    def _add(self, obj):
+        """
+        Add an object in its own class. Does nothing if already present.
+        """
+        if obj.identifier in self._sets:
+            return
+        self._objects[obj.identifier] = obj
+        self._sets.add(obj.identifier)
+        self._canonical[obj.identifier] = obj.identifier
+
+    def _build(self):
+        """
+        Build the classes from all the objects of the namespace.
+        """
+        self._sets = UnionFind()
+        self._objects = {}
+        self._canonical = {}
+        for obj in self._namespace.values():
+            self.object_registered(obj)
+
+    def canonical(self, obj):
+        """
+        Get the canonical object of the aliases of an object.
+
+        :param NMLObject obj: The object.
+        :return: The canonical object, which can be the object itself.
+        """
+        if self._sets is None:
+            self._build()
+        if obj.identifier not in self._sets:
+            return obj
+        return self._objects[
+            self._canonical[self._sets.find(obj.identifier)]
+        ]
+
+    def aliases(self, obj):
+        """
+        Get all the aliases of an object.
+
+        :param NMLObject obj: The object.
+        :rtype: list
+        :return: A list of all the objects that denote the same entity,
+         including the object itself.
+        """
+        if self._sets is None:
+            self._build()
+        if obj.identifier not in self._sets:
+            return [obj]
+        return [
+            self._objects[member]
+            for member in self._sets.members(obj.identifier)
+        ]
+
+
+class RelationClosureIndex(NamespaceIndex):
+    """
+    Base class of the indexes of the transitive closure of a set of
+    hierarchical relations.
+
+    The direct targets of each subject are kept in both directions, and the
+    flattened descendants and ancestors of each object are computed on demand
+    and memoized. When a relation of a subject changes, only the memoized
+    descendants of it and its ancestors, and the memoized ancestors of its
+    targets and their descendants, are dropped.
+
+    :var frozenset relations: Names of the relations to index.
+    """
+
+    relations = frozenset()
+
+    def __init__(self):
+        self._children = {}
+        self._parents = {}
+        self._counts = {}
+        self._descendants = {}
+        self._ancestors = {}
+
+    def relation_changed(self, obj, relation, added, removed):
+        if relation not in self.relations:
+            return
+
+        changed = []
+        for related in removed:
+            key = (obj.identifier, related.identifier)
+            count = self._counts.get(key, 0)
+            if not count:
+                continue
+            changed.append(related.identifier)
+            if count > 1:
+                self._counts[key] = count - 1
+                continue
+            del self._counts[key]
+            for links, node_id, other_id in (
+                    (self._children, obj.identifier, related.identifier),
+                    (self._parents, related.identifier, obj.identifier)):
+                del links[node_id][other_id]
+                if not links[node_id]:
+                    del links[node_id]
+
+        for related in added:
+            key = (obj.identifier, related.identifier)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._children.setdefault(
+                obj.identifier, OrderedDict()
+            )[related.identifier] = related
+            self._parents.setdefault(
+                related.identifier, OrderedDict()
+            )[obj.identifier] = obj
+            changed.append(related.identifier)
+
+        self._invalidate((obj.identifier, ), self._parents, self._descendants)
+        self._invalidate(changed, self._children, self._ancestors)
+
+    def _invalidate(self, identifiers, links, closures):
+        """
+        Drop the memoized closures of some objects and of all the objects
+        reachable from them through the given links.
+        """
+        if not closures:
+            return
+        visited = set(identifiers)
+        stack = list(visited)
+        while stack:
+            node_id = stack.pop()
+            closures.pop(node_id, None)
+            for other_id in links.get(node_id, ()):
+                if other_id not in visited:
+                    visited.add(other_id)
+                    stack.append(other_id)
+
+    def _closure(self, identifier, links, closures):
+        """
+        Get the memoized closure of an object through the given links.
+
+        :raises Exception: If there is a cycle in the relations.
+        """
+        if identifier in closures:
+            return closures[identifier]
+
+        empty = OrderedDict()
+        visiting = {identifier}
+        stack = [(identifier, iter(links.get(identifier, empty)))]
+        while stack:
+            node_id, pending = stack[-1]
+
+            for other_id in pending:
+                if other_id in closures or other_id not in links:
+                    continue
+                if other_id in visiting:
+                    raise Exception(
+                        'Cycle in relations {} through {}'.format(
+                            ', '.join(sorted(self.relations)), other_id
+                        )
+                    )
+                visiting.add(other_id)
+                stack.append((other_id, iter(links[other_id])))
+                break
+            else:
+                stack.pop()
+                visiting.discard(node_id)
+                flat = OrderedDict()
+                for other_id, other in links.get(node_id, empty).items():
+                    flat[other_id] = other
+                    flat.update(closures.get(other_id, empty))
+                closures[node_id] = flat
+
+        return closures[identifier]
+
+    def descendants(self, obj, recursive=True):
+        """
+        Get the objects related from an object.
+
+        :param NMLObject obj: The subject object.
+        :param bool recursive: Follow the relations transitively.
+        :rtype: list
+        :return: The related objects, in depth-first order.
+        :raises Exception: If there is a cycle in the relations.
+        """
+        if not recursive:
+            return list(self._children.get(obj.identifier, {}).values())
+        return list(self._closure(
+            obj.identifier, self._children, self._descendants
+        ).values())
+
+    def ancestors(self, obj, recursive=True):
+        """
+        Get the objects an object is related from.
+
+        :param NMLObject obj: The target object.
+        :param bool recursive: Follow the relations transitively.
+        :rtype: list
+        :return: The objects related to it, in depth-first order.
+        :raises Exception: If there is a cycle in the relations.
+        """
+        if not recursive:
+            return list(self._parents.get(obj.identifier, {}).values())
+        return list(self._closure(
+            obj.identifier, self._parents, self._ancestors
+        ).values())
+
+
+class MembershipIndex(RelationClosureIndex):
+    """
+    Index of the membership of topologies, groups and their members.
+
+    Membership relations are those that relate a topology, group or node with
+    the nodes, ports, links, services and sub-topologies it contains, like
+    ``Topology.hasTopology``, ``Topology.hasNode`` or ``PortGroup.hasPort``.
+    """
+
+    relations = frozenset((
+        'hasTopology', 'hasNode', 'hasInboundPort', 'hasOutboundPort',
+        'hasPort', 'hasLink', 'hasService'
+    ))
+
+
+class ImplementationIndex(RelationClosureIndex):
+    """
+    Index of the ``implementedBy`` relations between virtual and physical
+    nodes, in both directions.
+    """
+
+    relations = frozenset(('implementedBy', ))
+
+
+class InternIndex(NamespaceIndex):
+    """
+    Index of the registered value objects of a namespace by their values.
+
+    Value objects are the :class:`pynml.nml.Lifetime`,
+    :class:`pynml.nml.Location`, :class:`pynml.nml.Label` and
+    :class:`pynml.nml.LabelGroup`. The value of an object is the tuple of all
+    its attributes but ``identifier`` and ``name``, so objects of the same
+    class with the same value are interchangeable. The first registered object
+    of each value is the shared one.
+
+    :var tuple types: Classes of the value objects.
+    :var frozenset ignored: Attributes that are not part of the value.
+    """
+
+    types = (Lifetime, Location, Label, LabelGroup)
+    ignored = frozenset(('identifier', 'name'))
+
+    def __init__(self):
+        self._keys = {}
+        self._objects = {}
+
+    def key(self, obj):
+        """
+        Get the hashable value of a value object.
+
+        :param NMLObject obj: The value object.
+        :return: A tuple with the class of the object and its value.
+        """
+        return (obj.__class__, tuple(
+            getattr(obj, attribute) for attribute in obj.attributes
+            if attribute not in self.ignored
+        ))
+
+    def object_registered(self, obj):
+        if not isinstance(obj, self.types):
+            return
+        key = self.key(obj)
+        self._keys[id(obj)] = key
+        self._objects.setdefault(key, []).append(obj)
+
+    def object_unregistered(self, obj):
+        key = self._keys.pop(id(obj), None)
+        if key is None:
+            return
+        objects = self._objects[key]
+        objects.remove(obj)
+        if not objects:
+            del self._objects[key]
+
+    def attribute_changed(self, obj, attribute, value):
+        if attribute in self.ignored or id(obj) not in self._keys:
+            return
+        self.object_unregistered(obj)
+        self.object_registered(obj)
+
+    def shared(self, obj):
+        """
+        Get the shared registered object with the same value as an object.
+
+        :param NMLObject obj: The value object.
+        :return: The shared object, or `None` if no registered object has the
+         same value.
+        """
+        objects = self._objects.get(self.key(obj), None)
+        if not objects:
+            return None
+        return objects[0]
+
+
+class MerkleIndex(MembershipIndex):
+    """
+    Content and Merkle hashes of the objects of a namespace.
+
+    The content hash of an object covers its attributes and the identifiers
+    of its related objects (see :func:`pynml.diff.content_hash`). The Merkle
+    hash of an object covers its content hash and the Merkle hashes of its
+    members (see :class:`MembershipIndex`), so it changes if anything in the
+    subtree of a topology, group or node changes.
+
+    The root hash of the namespace is the sum, modulo 2 ** 160, of a hash of
+    the identifier and Merkle hash of each object that isn't a member of any
+    other, so it is updated by replacing the terms of the changed objects
+    only.
+
+    Hashes are computed on demand and memoized. A change drops the hashes of
+    the changed object and of its containers, stopping at the ones already
+    dropped, as the hash of a container is never memoized without the hashes
+    of its members.
+    """
+
+    modulus = 2 ** 160
+
+    def __init__(self):
+        super(MerkleIndex, self).__init__()
+        self._namespace = None
+        self._contents = {}
+        self._merkles = {}
+        self._terms = {}
+        self._dirty = set()
+        self._root = 0
+
+    def bootstrap(self, namespace):
+        self._namespace = namespace
+        super(MerkleIndex, self).bootstrap(namespace)
+
+    def object_registered(self, obj):
+        super(MerkleIndex, self).object_registered(obj)
+        self._touch((obj.identifier, ))
+
+    def object_unregistered(self, obj):
+        super(MerkleIndex, self).object_unregistered(obj)
+        self._touch((obj.identifier, ))
+        self._contents.pop(obj.identifier, None)
+        self._dirty.discard(obj.identifier)
+
+    def relation_changed(self, obj, relation, added, removed):
+        super(MerkleIndex, self).relation_changed(
+            obj, relation, added, removed
+        )
+        self._contents.pop(obj.identifier, None)
+        self._touch((obj.identifier, ))
+        if relation in self.relations:
+            # Members can enter or leave the top level
+            self._touch(related.identifier for related in added + removed)
+
+    def attribute_changed(self, obj, attribute, value):
+        self._contents.pop(obj.identifier, None)
+        self._touch((obj.identifier, ))
+
+    def _touch(self, identifiers):
+        """
+        Drop the Merkle hashes of some objects and of their containers.
+        """
+        stack = list(identifiers)
+        while stack:
+            identifier = stack.pop()
+            if identifier not in self._parents:
+                self._dirty.add(identifier)
+            if self._merkles.pop(identifier, None) is None:
+                continue
+            term = self._terms.pop(identifier, None)
+            if term is not None:
+                self._root = (self._root - term) % self.modulus
+            stack.extend(self._parents.get(identifier, ()))
+
+    def content(self, obj):
+        """
+        Get the content hash of an object.
+
+        :param NMLObject obj: The object.
+        :rtype: str
+        """
+        digest = self._contents.get(obj.identifier, None)
+        if digest is None:
+            digest = self._contents[obj.identifier] = content_hash(obj)
+        return digest
+
+    def merkle(self, obj):
+        """
+        Get the Merkle hash of an object.
+
+        :param NMLObject obj: The object.
+        :rtype: str
+        :raises Exception: If there is a cycle in the membership relations.
+        """
+        merkles = self._merkles
+        if obj.identifier in merkles:
+            return merkles[obj.identifier]
+
+        empty = OrderedDict()
+        visiting = {obj.identifier}
+        stack = [(obj, iter(self._children.get(obj.identifier, empty)))]
+        while stack:
+            node, pending = stack[-1]
+
+            for member_id in pending:
+                if member_id in merkles:
+                    continue
+                if member_id in visiting:
+                    raise Exception(
+                        'Cycle in membership relations through {}'.format(
+                            member_id
+                        )
+                    )
+                visiting.add(member_id)
+                member = self._children[node.identifier][member_id]
+                stack.append((member, iter(self._children.get(
+                    member_id, empty
+                ))))
+                break
+            else:
+                stack.pop()
+                visiting.discard(node.identifier)
+                # Members related but not registered hash differently, so
+                # registering them changes the hashes of their containers
+                registered = self._namespace.get(node.identifier, None)
+                digest = sha1('{}{}'.format(
+                    '+' if registered is node else '-', self.content(node)
+                ).encode('utf-8'))
+                for member_id in sorted(
+                        self._children.get(node.identifier, empty)):
+                    digest.update('\x1e{}\x1f{}'.format(
+                        member_id, merkles[member_id]
+                    ).encode('utf-8'))
+                merkles[node.identifier] = digest.hexdigest()
+
+        return merkles[obj.identifier]
+
+    def _refresh(self):
+        """
+        Update the terms of the root hash of the dirty top level objects.
+        """
+        for identifier in self._dirty:
+            obj = self._namespace.get(identifier, None)
+            if obj is None or identifier in self._parents or \
+                    identifier in self._terms:
+                continue
+            term = int(sha1('{}\x1f{}'.format(
+                identifier, self.merkle(obj)
+            ).encode('utf-8')).hexdigest(), 16)
+            self._terms[identifier] = term
+            self._root = (self._root + term) % self.modulus
+        self._dirty.clear()
+
+    def root(self):
+        """
+        Get the root hash of the namespace.
+
+        :rtype: str
+        :return: The hash as 40 hexadecimal digits.
+        :raises Exception: If there is a cycle in the membership relations.
+        """
+        self._refresh()
+        return '{:040x}'.format(self._root)
+
+    def top_level(self):
+        """
+        Get the objects that are not members of any other.
+
+        :rtype: list
+        :raises Exception: If there is a cycle in the membership relations.
+        """
+        self._refresh()
+        return [self._namespace[identifier] for identifier in self._terms]
+
+
+class ChangeLogIndex(NamespaceIndex):
+    """
+    Log of the last change of each object of a namespace.
+
+    Each registration, unregistration, relation change or attribute change
+    increments :attr:`epoch` and moves the changed object to the end of the
+    log, so the objects changed after an epoch are found by walking the log
+    backwards, in time proportional to their number.
+
+    Unregistered objects are kept in the log until forgotten with
+    :meth:`compact`.
+
+    :var int epoch: Number of changes logged.
+    :var int compacted: Epoch up to which unregistered objects were
+     forgotten.
+    """
+
+    def __init__(self):
+        self.epoch = 0
+        self.compacted = 0
+        self._log = OrderedDict()
+
+    def _touch(self, obj, removed=False):
+        """
+        Log a change of an object.
+        """
+        self.epoch += 1
+        self._log.pop(obj.identifier, None)
+        self._log[obj.identifier] = (self.epoch, None if removed else obj)
+
+    def object_registered(self, obj):
+        self._touch(obj)
+
+    def object_unregistered(self, obj):
+        self._touch(obj, removed=True)
+
+    def relation_changed(self, obj, relation, added, removed):
+        self._touch(obj)
+
+    def attribute_changed(self, obj, attribute, value):
+        self._touch(obj)
+
+    def since(self, epoch):
+        """
+        Get the objects changed after an epoch.
+
+        :param int epoch: The epoch.
+        :rtype: list
+        :return: A list of tuples (identifier, object) in the order the
+         objects last changed, where object is `None` if the object was
+         unregistered.
+        """
+        changes = []
+        for identifier in reversed(self._log):
+            changed, obj = self._log[identifier]
+            if changed <= epoch:
+                break
+            changes.append((identifier, obj))
+        changes.reverse()
+        return changes
+
+    def compact(self, epoch):
+        """
+        Forget the objects unregistered up to an epoch.
+
+        The log is walked from its oldest change, so the cost is proportional
+        to the number of objects changed up to the epoch.
+
+        :param int epoch: The epoch.
+        :rtype: int
+        :return: The number of unregistered objects forgotten.
+        """
+        forgotten = [
+            identifier for identifier, (changed, obj) in takewhile(
+                lambda entry: entry[1][0] <= epoch, self._log.items()
+            )
+            if obj is None
+        ]
+        for identifier in forgotten:
+            del self._log[identifier]
+        self.compacted = max(self.compacted, min(epoch, self.epoch))
+        return len(forgotten)
+
+
+__all__ = [
+    'NamespaceIndex',
+    'TripleStore',
+    'IntervalTree',
+    'RelatedValueIndex',
+    'LifetimeIndex',
+    'SpatialIndex',
+    'LabelIndex',
+    'LabelGroupIndex',
+    'LayeredGraphIndex',
+    'ForwardingDomainIndex',
+    'AliasIndex',
+    'RelationClosureIndex',
+    'MembershipIndex',
+    'ImplementationIndex',
+    'InternIndex',
+    'MerkleIndex',
+    'ChangeLogIndex',
+    'parse_timestamp'
+]
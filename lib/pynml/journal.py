@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Append only journal of the changes of a namespace.
+
+The journal records every registration, unregistration, attribute change and
+relation change of a namespace as a compact binary record. Records are
+buffered and written and synced to disk in batches. A checkpoint writes a
+snapshot of the namespace (see :meth:`pynml.manager.NMLManager.export_delta`)
+and starts a new journal, so recovering a namespace costs loading the last
+snapshot plus replaying the records since it.
+
+Each record is a header with its kind, the length of its payload and the
+CRC-32 of its payload, followed by the payload, a sequence of length prefixed
+UTF-8 strings. Reading stops at the first incomplete or corrupt record, as
+left by a crash in the middle of a write.
+
+The journal starts with a record with the SHA-1 digest of the snapshot it
+follows. If the snapshot was replaced but the journal was not restarted, the
+digests don't match and the journal is ignored, as the snapshot already has
+all its changes.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+import os
+from struct import Struct
+from zlib import crc32
+from hashlib import sha1
+from os.path import exists
+
+from six import text_type
+
+from . import nml
+from .nml import unset
+from .index import NamespaceIndex
+from .delta import encode_value, decode_value
+from .mixins import OrderedListMixin
+from .validation import relation_specs
+
+
+HEADER = Struct(str('>BII'))
+LENGTH = Struct(str('>I'))
+
+BEGIN = 1
+REGISTER = 2
+UNREGISTER = 3
+ATTRIBUTE = 4
+UNSET = 5
+ADD = 6
+REMOVE = 7
+SET = 8
+ITEMS = 9
+
+
+def snapshot_digest(snapshot):
+    """
+    Compute the digest of a snapshot file.
+
+    :param str snapshot: Path to the snapshot.
+    :rtype: str
+    :return: The hexadecimal SHA-1 digest, or an empty string if the file
+     doesn't exist.
+    """
+    if not exists(snapshot):
+        return ''
+    digest = sha1()
+    with open(snapshot, 'rb') as fd:
+        for chunk in iter(lambda: fd.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_record(kind, fields):
+    """
+    Encode a record.
+
+    :param int kind: Kind of the record.
+    :param fields: Iterable of the strings of the record.
+    :rtype: bytes
+    """
+    payload = b''.join(
+        LENGTH.pack(len(data)) + data
+        for data in (text_type(field).encode('utf-8') for field in fields)
+    )
+    return HEADER.pack(
+        kind, len(payload), crc32(payload) & 0xffffffff
+    ) + payload
+
+
+def decode_records(data):
+    """
+    Decode the complete records of a journal.
+
+    :param bytes data: Contents of the journal.
+    :return: An iterator of tuples (kind, fields, end), where ``end`` is the
+     offset just after the record.
+    """
+    offset = 0
+    while offset + HEADER.size <= len(data):
+        kind, length, checksum = HEADER.unpack_from(data, offset)
+        start = offset + HEADER.size
+        end = start + length
+        if end > len(data) or \
+                crc32(data[start:end]) & 0xffffffff != checksum:
+            return
+
+        fields = []
+        position = start
+        while position < end:
+            size, = LENGTH.unpack_from(data, position)
+            position += LENGTH.size
+            fields.append(data[position:position + size].decode('utf-8'))
+            position += size
+
+        yield kind, fields, end
+        offset = end
+
+
+def _call(obj, action, relation, *args):
+    """
+    Call the method of an object that performs an action on a relation, like
+    ``add_has_node``.
+    """
+    getter = obj.relations[relation]
+    suffix = getter.__name__[len('get_'):]
+    return getattr(obj, '{}_{}'.format(action, suffix))(*args)
+
+
+class Journal(NamespaceIndex):
+    """
+    Append only journal of the changes of a namespace.
+
+    A journal is attached to a manager by
+    :meth:`pynml.manager.NMLManager.recover`, which also replays it:
+
+    ::
+
+        journal = Journal('topology.journal')
+        manager = NMLManager.recover('topology.snapshot', journal)
+        ...
+        journal.checkpoint(manager, 'topology.snapshot')
+
+    Records are kept in memory until :attr:`batch_size` of them are pending,
+    or :meth:`flush` is called, and then written and synced to disk, so a
+    crash loses at most the last batch of changes.
+
+    Relations with objects that are not registered when the journal is
+    replayed are skipped. Attribute values are replayed with their type if
+    it is one of the types of :func:`pynml.delta.encode_value`, and as text
+    otherwise.
+
+    :param str path: Path to the journal file.
+    :param int batch_size: Number of records written and synced at once.
+    """
+
+    def __init__(self, path, batch_size=1024):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        self._file = None
+        self._specs = {}
+
+    def _append(self, kind, *fields):
+        """
+        Add a record to the pending batch, writing it if full.
+        """
+        self._pending.append(encode_record(kind, fields))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write and sync to disk all the pending records.
+        """
+        if not self._pending:
+            return
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+        self._file.write(b''.join(self._pending))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        del self._pending[:]
+
+    def close(self):
+        """
+        Write the pending records and close the journal file.
+        """
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _restart(self, digest, size=0):
+        """
+        Truncate the journal, and start it with the digest of its snapshot if
+        empty.
+        """
+        self.close()
+        with open(self.path, 'ab') as fd:
+            fd.truncate(size)
+            if not size:
+                fd.write(encode_record(BEGIN, (digest, )))
+            fd.flush()
+            os.fsync(fd.fileno())
+
+    def _fixed(self, obj, relation):
+        """
+        Check if a relation of an object has a fixed cardinality.
+        """
+        cls = obj.__class__
+        specs = self._specs.get(cls, None)
+        if specs is None:
+            specs = self._specs[cls] = relation_specs(cls)
+        return specs.get(relation, ('+', ))[0] != '+'
+
+    def object_registered(self, obj):
+        self._append(REGISTER, obj.__class__.__name__, obj.identifier)
+        for attribute in obj.attributes:
+            self.attribute_changed(obj, attribute, getattr(obj, attribute))
+        for relation, relgetter in obj.relations.items():
+            associated = relgetter()
+            if self._fixed(obj, relation):
+                if any(related is not None for related in associated):
+                    self._append(
+                        SET, obj.identifier, relation,
+                        *(related.identifier for related in associated)
+                    )
+            elif associated:
+                self._append(
+                    ADD, obj.identifier, relation,
+                    *(related.identifier for related in associated.values())
+                )
+        if isinstance(obj, OrderedListMixin) and len(obj):
+            self.attribute_changed(obj, 'items', obj)
+
+    def object_unregistered(self, obj):
+        self._append(UNREGISTER, obj.identifier)
+
+    def relation_changed(self, obj, relation, added, removed):
+        if self._fixed(obj, relation):
+            # Notifications only carry the objects that changed
+            self._append(
+                SET, obj.identifier, relation, *(
+                    related.identifier
+                    for related in obj.relations[relation]()
+                )
+            )
+            return
+        if removed:
+            self._append(
+                REMOVE, obj.identifier, relation,
+                *(related.identifier for related in removed)
+            )
+        if added:
+            self._append(
+                ADD, obj.identifier, relation,
+                *(related.identifier for related in added)
+            )
+
+    def attribute_changed(self, obj, attribute, value):
+        if attribute == 'identifier':
+            return
+        if attribute == 'items' and isinstance(obj, OrderedListMixin):
+            self._append(
+                ITEMS, obj.identifier, *(item.identifier for item in obj)
+            )
+        elif value is unset or value is None:
+            self._append(UNSET, obj.identifier, attribute)
+        else:
+            kind, text = encode_value(value)
+            self._append(
+                ATTRIBUTE, obj.identifier, attribute, text,
+                *((kind, ) if kind else ())
+            )
+
+    def _replay(self, manager, kind, fields):
+        """
+        Apply a record to a namespace.
+        """
+        namespace = manager.namespace
+
+        if kind == REGISTER:
+            cls_name, identifier = fields
+            cls = getattr(nml, cls_name)
+            obj = namespace.get(identifier, None)
+            if obj is not None and obj.__class__ is not cls:
+                manager.unregister_object(obj)
+                obj = None
+            if obj is None:
+                manager.register_object(cls(identifier=identifier))
+            return
+
+        obj = namespace.get(fields[0], None)
+        if obj is None:
+            return
+
+        if kind == UNREGISTER:
+            manager.unregister_object(obj)
+
+        elif kind == ATTRIBUTE:
+            value_type = fields[3] if len(fields) > 3 else ''
+            setattr(obj, fields[1], decode_value(value_type, fields[2]))
+
+        elif kind == UNSET:
+            setattr(obj, fields[1], unset)
+
+        elif kind == ITEMS:
+            del obj[:]
+            obj.extend(
+                namespace[identifier] for identifier in fields[1:]
+                if identifier in namespace
+            )
+
+        elif kind in (ADD, REMOVE, SET):
+            relation = fields[1]
+            targets = [
+                namespace[identifier] for identifier in fields[2:]
+                if identifier in namespace
+            ]
+            if kind == SET:
+                if len(targets) == len(fields) - 2:
+                    _call(obj, 'set', relation, *targets)
+                return
+            action = 'add' if kind == ADD else 'remove'
+            for target in targets:
+                _call(obj, action, relation, target)
+
+    def recover(self, manager, digest=''):
+        """
+        Replay this journal into a namespace and prepare it for appending.
+
+        If the journal doesn't follow the snapshot with the given digest it
+        is ignored. Incomplete or corrupt records at the end of the journal
+        are discarded.
+
+        :param manager: The :class:`pynml.manager.NMLManager` to replay the
+         journal into, with the snapshot already loaded.
+        :param str digest: The :func:`snapshot_digest` of the snapshot.
+        :rtype: int
+        :return: The number of records replayed.
+        """
+        self.close()
+        data = b''
+        if exists(self.path):
+            with open(self.path, 'rb') as fd:
+                data = fd.read()
+
+        replayed = 0
+        size = 0
+        for kind, fields, end in decode_records(data):
+            if not size:
+                if kind != BEGIN or fields != [digest]:
+                    break
+            else:
+                self._replay(manager, kind, fields)
+                replayed += 1
+            size = end
+
+        self._restart(digest, size=size)
+        return replayed
+
+    def checkpoint(self, manager, snapshot):
+        """
+        Write a snapshot of a namespace and restart this journal.
+
+        The snapshot is written to a temporary file and then renamed over the
+        previous one, so a crash leaves either snapshot and its journal.
+
+        :param manager: The :class:`pynml.manager.NMLManager` this journal is
+         attached to.
+        :param str snapshot: Path to the snapshot.
+        """
+        self.flush()
+
+        temporary = '{}.tmp'.format(snapshot)
+        with open(temporary, 'wb') as fd:
+            fd.write(manager.export_delta(pretty=False).encode('utf-8'))
+            fd.flush()
+            os.fsync(fd.fileno())
+        getattr(os, 'replace', os.rename)(temporary, snapshot)
+
+        self._restart(snapshot_digest(snapshot))
+
+
+__all__ = [
+    'Journal',
+    'snapshot_digest',
+    'encode_record',
+    'decode_records'
+]
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+pynml label sets module.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+from six import string_types, python_2_unicode_compatible
+
+from .nml import unset
+
+
+@python_2_unicode_compatible
+class LabelSet(object):
+    """
+    Immutable set of non-negative integer labels, like VLAN identifiers or
+    wavelength channels.
+
+    Labels are stored as the bits of a Python integer, so union, intersection
+    and difference are single big integer operations no matter how many
+    labels the sets hold. The string representation is the compact range
+    syntax accepted by :meth:`parse`:
+
+    ::
+
+        >>> LabelSet.parse('1-100,200-4094') - LabelSet.parse('50-300')
+        LabelSet('1-49,301-4094')
+
+    :param int bits: Bitmap of the labels, where bit ``n`` is set if label
+     ``n`` is in the set.
+    """
+
+    __slots__ = ('bits',)
+
+    def __init__(self, bits=0):
+        if bits < 0:
+            raise Exception('Label set bitmap must be non-negative')
+        self.bits = bits
+
+    @classmethod
+    def from_range(cls, start, end):
+        """
+        Create a set with all the labels of an inclusive range.
+
+        :param int start: First label of the range.
+        :param int end: Last label of the range.
+        :rtype: :class:`LabelSet`
+        """
+        if start < 0 or end < start:
+            raise Exception(
+                'Invalid label range {}-{}'.format(start, end)
+            )
+        return cls(((1 << (end - start + 1)) - 1) << start)
+
+    @classmethod
+    def from_labels(cls, labels):
+        """
+        Create a set from an iterable of labels.
+
+        :param labels: Iterable of integer labels.
+        :rtype: :class:`LabelSet`
+        """
+        bits = 0
+        for label in labels:
+            if label < 0:
+                raise Exception('Invalid label {}'.format(label))
+            bits |= 1 << label
+        return cls(bits)
+
+    @classmethod
+    def parse(cls, value):
+        """
+        Parse a set from the range syntax, like ``1-100,200,300-4094``.
+
+        :param str value: Comma separated labels and inclusive ranges of
+         labels.
+        :rtype: :class:`LabelSet`
+        """
+        bits = 0
+        for item in value.split(','):
+            item = item.strip()
+            if not item:
+                continue
+            start, _, end = item.partition('-')
+            try:
+                start = int(start)
+                end = int(end) if end else start
+            except ValueError:
+                raise Exception('Invalid label range "{}"'.format(item))
+            bits |= cls.from_range(start, end).bits
+        return cls(bits)
+
+    @classmethod
+    def coerce(cls, value):
+        """
+        Convert the value of a :class:`pynml.nml.Label` or
+        :class:`pynml.nml.LabelGroup` to a set.
+
+        :param value: A :class:`LabelSet`, an integer label, or a string in
+         the syntax of :meth:`parse`.
+        :rtype: :class:`LabelSet`
+        :return: The set, or `None` if the value is `None` or unset.
+        """
+        if value is None or value is unset:
+            return None
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, string_types):
+            return cls.parse(value)
+        return cls.from_labels((int(value),))
+
+    def ranges(self):
+        """
+        Iterate the inclusive ranges of consecutive labels of this set.
+
+        :return: An iterator of tuples (start, end).
+        """
+        bits = self.bits
+        while bits:
+            start = (bits & -bits).bit_length() - 1
+            # The lowest clear bit above start ends the run
+            filled = bits | ((1 << start) - 1)
+            end = (~filled & (filled + 1)).bit_length() - 2
+            yield start, end
+            bits &= ~((1 << (end + 1)) - 1)
+
+    def __iter__(self):
+        for start, end in self.ranges():
+            for label in range(start, end + 1):
+                yield label
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __bool__(self):
+        return self.bits != 0
+
+    __nonzero__ = __bool__
+
+    def __contains__(self, label):
+        return label >= 0 and bool((self.bits >> label) & 1)
+
+    def __eq__(self, other):
+        if not isinstance(other, LabelSet):
+            return NotImplemented
+        return self.bits == other.bits
+
+    def __ne__(self, other):
+        if not isinstance(other, LabelSet):
+            return NotImplemented
+        return self.bits != other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __or__(self, other):
+        return LabelSet(self.bits | other.bits)
+
+    def __and__(self, other):
+        return LabelSet(self.bits & other.bits)
+
+    def __sub__(self, other):
+        return LabelSet(self.bits & ~other.bits)
+
+    def __xor__(self, other):
+        return LabelSet(self.bits ^ other.bits)
+
+    def __le__(self, other):
+        return self.bits & ~other.bits == 0
+
+    def __ge__(self, other):
+        return other.bits & ~self.bits == 0
+
+    def isdisjoint(self, other):
+        """
+        Check if this set has no labels in common with another one.
+
+        :rtype: bool
+        """
+        return self.bits & other.bits == 0
+
+    def __str__(self):
+        return ','.join(
+            '{}'.format(start) if start == end
+            else '{}-{}'.format(start, end)
+            for start, end in self.ranges()
+        )
+
+    def __repr__(self):
+        return 'LabelSet(\'{}\')'.format(self)
+
+
+__all__ = ['LabelSet']
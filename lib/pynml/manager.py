@@ -24,7 +24,8 @@ from __future__ import print_function, division
 
 from logging import getLogger
 from os import makedirs, remove
-from os.path import dirname, abspath, splitext, isdir
+from os.path import dirname, abspath, splitext, isdir, exists
+from itertools import chain, combinations
 from collections import OrderedDict
 from xml.dom import minidom
 from xml.etree import ElementTree as etree  # noqa
@@ -33,9 +34,29 @@ from distutils.spawn import find_executable
 
 from six import StringIO, text_type
 
-from .nml import NAMESPACES
+from .nml import NAMESPACES, unset
+from .cache import PathCache
+from .index import (
+    TripleStore, LifetimeIndex, SpatialIndex, LabelIndex, LabelGroupIndex,
+    LayeredGraphIndex, ForwardingDomainIndex, AliasIndex, MembershipIndex,
+    ImplementationIndex, InternIndex, MerkleIndex, ChangeLogIndex
+)
+from .labels import LabelSet
+from .mixins import HandleTable, OrderedListMixin
+from .spatial import haversine_matrix
+from .validation import validate
+from .delta import export_delta, apply_delta
+from .journal import snapshot_digest
+from .simulation import (
+    ScenarioResult, FrozenTopology, simulate, sample_availability
+)
+from .graph import (
+    Graph, UnionFind, bfs_path, label_path, dijkstra_path, k_shortest_paths,
+    sparse_adjacency, strongly_connected_components, cut_elements
+)
 from .nml import (
-    Node, Port, BidirectionalPort, Link, BidirectionalLink, Environment
+    Node, Port, BidirectionalPort, Link, BidirectionalLink, Environment,
+    Topology
 )
 
 
@@ -99,6 +120,8 @@ class NMLManager(object):
         self.name = name
         self.namespace = OrderedDict()
         self.metadata = kwargs
+        self._indexes = OrderedDict()
+        self._handles = HandleTable()
 
     def register_object(self, obj):
         """
@@ -112,6 +135,34 @@ class NMLManager(object):
                 'Object already in namespace {}'.format(obj.identifier)
             )
         self.namespace[obj.identifier] = obj
+        obj.observers.append(self)
+
+        # Ordered lists of a namespace share their handles
+        if isinstance(obj, OrderedListMixin):
+            obj.attach(self._handles)
+
+        for index in self._indexes.values():
+            index.object_registered(obj)
+
+    def unregister_object(self, obj):
+        """
+        Unregister a NML object from the namespace managed by this Manager.
+
+        Relations of other objects with the unregistered object are not
+        modified.
+
+        :param NetworkObject obj: Object to unregister from the namespace.
+        :raises Exception: If object not in namespace.
+        """
+        if self.namespace.get(obj.identifier, None) is not obj:
+            raise Exception(
+                'Object not in namespace {}'.format(obj.identifier)
+            )
+        del self.namespace[obj.identifier]
+        obj.observers.remove(self)
+
+        for index in self._indexes.values():
+            index.object_unregistered(obj)
 
     def get_object(self, identifier):
         """
@@ -123,11 +174,800 @@ class NMLManager(object):
         """
         return self.namespace.get(identifier, None)
 
-    def export_nml(self, pretty=True):
+    def relation_changed(self, obj, relation, added, removed):
+        """
+        Observer callback called by registered objects when a relation changes.
+
+        See :meth:`pynml.nml.NMLObject._notify_relation`.
+        """
+        for index in self._indexes.values():
+            index.relation_changed(obj, relation, added, removed)
+
+    def attribute_changed(self, obj, attribute, value):
+        """
+        Observer callback called by registered objects when an attribute
+        changes.
+
+        See :meth:`pynml.nml.NMLObject._notify_attribute`.
+        """
+        for index in self._indexes.values():
+            index.attribute_changed(obj, attribute, value)
+
+    def _index(self, name, factory):
+        """
+        Get an index by name, creating and bootstrapping it if required.
+        """
+        index = self._indexes.get(name, None)
+        if index is None:
+            index = factory()
+            index.bootstrap(self.namespace)
+            self._indexes[name] = index
+        return index
+
+    def triples(self):
+        """
+        Get the store of all relations in the namespace as integer triples.
+
+        The store is created the first time this method is called and from
+        then on it is kept up to date when relations of registered objects
+        change.
+
+        :rtype: :class:`pynml.index.TripleStore`
+        :return: The relations triple store of this namespace.
+        """
+        return self._index('triples', TripleStore)
+
+    def lifetimes(self):
+        """
+        Get the interval index of the lifetimes of the namespace.
+
+        :rtype: :class:`pynml.index.LifetimeIndex`
+        :return: The ``existsDuring`` index of this namespace.
+        """
+        return self._index('lifetimes', LifetimeIndex)
+
+    def active_at(self, timestamp):
+        """
+        Find the objects that exist during a point in time.
+
+        An object exists during a point in time if any of the
+        :class:`pynml.nml.Lifetime` it is related to with ``existsDuring``
+        contains it. Objects without lifetimes are not returned.
+
+        :param timestamp: ISO 8601 string, :py:class:`datetime.datetime` or
+         seconds since the epoch.
+        :rtype: list
+        :return: A list of :class:`pynml.nml.NetworkObject`.
+        """
+        return self.lifetimes().active_at(timestamp)
+
+    def active_between(self, start, end):
+        """
+        Find the objects that exist at some point during a time interval.
+
+        :param start: Start of the interval. See :meth:`active_at`.
+        :param end: End of the interval. See :meth:`active_at`.
+        :rtype: list
+        :return: A list of :class:`pynml.nml.NetworkObject`.
+        """
+        return self.lifetimes().active_between(start, end)
+
+    def locations(self):
+        """
+        Get the spatial index of the locations of the namespace.
+
+        :rtype: :class:`pynml.index.SpatialIndex`
+        :return: The ``locatedAt`` index of this namespace.
+        """
+        return self._index('locations', SpatialIndex)
+
+    def within_radius(self, latitude, longitude, km):
+        """
+        Find the objects located within a distance of a point.
+
+        Objects are located by the :class:`pynml.nml.Location` they are
+        related to with ``locatedAt``, and distances are great-circle
+        distances.
+
+        :param float latitude: Latitude of the point in decimal degrees.
+        :param float longitude: Longitude of the point in decimal degrees.
+        :param float km: Maximum distance in kilometers.
+        :rtype: list
+        :return: A list of tuples (distance in kilometers,
+         :class:`pynml.nml.NetworkObject`) sorted by distance.
+        """
+        return self.locations().within_radius(latitude, longitude, km)
+
+    def nearest(self, latitude, longitude, k=1):
+        """
+        Find the objects located closest to a point.
+
+        See :meth:`within_radius`.
+
+        :param float latitude: Latitude of the point in decimal degrees.
+        :param float longitude: Longitude of the point in decimal degrees.
+        :param int k: Maximum number of objects to find.
+        :rtype: list
+        :return: A list of tuples (distance in kilometers,
+         :class:`pynml.nml.NetworkObject`) sorted by distance.
+        """
+        return self.locations().nearest(latitude, longitude, k)
+
+    def distance_matrix(self):
+        """
+        Compute the great-circle distances between all located objects.
+
+        This function requires the optional NumPy package.
+
+        :rtype: tuple
+        :return: A tuple (objects, distances) with the list of located
+         :class:`pynml.nml.NetworkObject` and a :py:class:`numpy.ndarray`
+         with the distances between them in kilometers.
+        """
+        objects, latitudes, longitudes = self.locations().coordinates()
+        return objects, haversine_matrix(latitudes, longitudes)
+
+    def labels(self):
+        """
+        Get the index of the labels of the namespace.
+
+        :rtype: :class:`pynml.index.LabelIndex`
+        :return: The ``hasLabel`` index of this namespace.
+        """
+        return self._index('labels', LabelIndex)
+
+    def label_groups(self):
+        """
+        Get the index of the label groups of the namespace.
+
+        :rtype: :class:`pynml.index.LabelGroupIndex`
+        :return: The ``hasLabelGroup`` index of this namespace.
+        """
+        return self._index('label_groups', LabelGroupIndex)
+
+    def available_labels(self, obj, labeltype=None):
+        """
+        Compute the labels available at a port or a link.
+
+        The available labels are the intersection of the labels
+        (``hasLabel``) of the object and of its subports or sublinks
+        (``hasPort`` and ``hasLink``), and of the label groups
+        (``hasLabelGroup``) of the groups that contain any of them.
+
+        :param obj: The port or link.
+        :type obj: :class:`pynml.nml.Port` or :class:`pynml.nml.Link`
+        :param str labeltype: If given, consider only the labels of this
+         type.
+        :rtype: :class:`pynml.labels.LabelSet`
+        :return: The available labels, or ``None`` if they are not
+         constrained.
+        """
+        bits = self._available_labels(obj, labeltype)
+        return None if bits < 0 else LabelSet(bits)
+
+    def _available_labels(self, obj, labeltype):
+        """
+        Compute the bitmap of the labels available at a port or a link, where
+        ``-1`` means any label.
+        """
+        labels = self.labels()
+        groups = self.label_groups()
+        triples = self.triples()
+
+        members = [obj] + [
+            related for relname, related in obj.iter_relations()
+            if relname in ('hasPort', 'hasLink')
+        ]
+
+        values = []
+        for member in members:
+            values.extend(labels.values(member))
+            for relation in ('hasPort', 'hasLink'):
+                for group_id, _, _ in triples.triples(relation, target=member):
+                    group = self.namespace[group_id]
+                    values.extend(groups.values(group))
+
+        bits = -1
+        for value_labeltype, label_set in values:
+            if label_set is None:
+                continue
+            if labeltype is not None and value_labeltype != labeltype:
+                continue
+            bits &= label_set.bits
+        return bits
+
+    def _port_links(self, weight=None):
+        """
+        Gather the directed port to port entries defined by links.
+
+        The ``isSource`` and ``isSink`` relations are read from the
+        :meth:`triples` store.
+
+        :return: A tuple (ports, rows, cols, data) with the list of registered
+         ports and, for each entry, the ordinal of the source port, the
+         ordinal of the sink port and the weight of the link.
+        """
+        ports = [
+            obj for obj in self.namespace.values() if isinstance(obj, Port)
+        ]
+        ordinals = {
+            port.identifier: ordinal for ordinal, port in enumerate(ports)
+        }
+        triples = self.triples()
+
+        # Index the sink ports of every link
+        sinks = {}
+        for port_id, _, link_id in triples.triples('isSink'):
+            if port_id in ordinals:
+                sinks.setdefault(link_id, []).append(ordinals[port_id])
+
+        rows = []
+        cols = []
+        data = []
+        for port_id, _, link_id in triples.triples('isSource'):
+            ordinal = ordinals.get(port_id, None)
+            if ordinal is None or link_id not in sinks:
+                continue
+            value = 1
+            if weight is not None:
+                link = ports[ordinal]._is_source_links[link_id]
+                value = link.metadata.get(weight, 1)
+            for sink in sinks[link_id]:
+                rows.append(ordinal)
+                cols.append(sink)
+                data.append(value)
+
+        return ports, rows, cols, data
+
+    def strongly_connected_components(self):
+        """
+        Find the strongly connected components of the directed traffic graph.
+
+        The vertices of the graph are the registered :class:`pynml.nml.Node`
+        and :class:`pynml.nml.Port`. Links add edges from their source port to
+        their sink ports (see :meth:`adjacency`), and nodes add edges from
+        their inbound ports to themselves and from themselves to their outbound
+        ports, so traffic can traverse them.
+
+        :rtype: list
+        :return: A list of lists of :class:`pynml.nml.Node` and
+         :class:`pynml.nml.Port`, one per component.
+        """
+        ports, rows, cols, _ = self._port_links()
+        nodes = [
+            obj for obj in self.namespace.values() if isinstance(obj, Node)
+        ]
+        vertices = ports + nodes
+        ordinals = {
+            port.identifier: ordinal for ordinal, port in enumerate(ports)
+        }
+
+        successors = [[] for _ in vertices]
+        for row, col in zip(rows, cols):
+            successors[row].append(col)
+
+        node_ordinals = {
+            node.identifier: ordinal
+            for ordinal, node in enumerate(nodes, len(ports))
+        }
+
+        triples = self.triples()
+        for relation, inbound in (
+                ('hasInboundPort', True), ('hasOutboundPort', False)):
+            for node_id, _, port_id in triples.triples(relation):
+                node = node_ordinals.get(node_id, None)
+                port = ordinals.get(port_id, None)
+                if node is None or port is None:
+                    continue
+                if inbound:
+                    successors[port].append(node)
+                else:
+                    successors[node].append(port)
+
+        return [
+            [vertices[ordinal] for ordinal in component]
+            for component in strongly_connected_components(successors)
+        ]
+
+    def adjacency(self, format='csr', weight=None):
+        """
+        Export the directed adjacency matrix of the ports in the namespace.
+
+        Each registered :class:`pynml.nml.Port` is a vertex, and there is an
+        entry from port A to port B for every :class:`pynml.nml.Link` that has
+        port A as source (``Port.isSource``) and port B as sink
+        (``Port.isSink``).
+
+        This function requires the optional NumPy package.
+
+        :param str format: Matrix format, either ``csr`` or ``coo``.
+        :param str weight: Key in the ``metadata`` of the links holding their
+         weight. If ``None``, or if the key is missing, each link counts as
+         ``1``. Parallel links are summed.
+        :rtype: :class:`pynml.graph.CSRAdjacency` or
+         :class:`pynml.graph.COOAdjacency`
+        :return: The adjacency matrix of the ports.
+        """
+        ports, rows, cols, data = self._port_links(weight)
+        return sparse_adjacency(
+            len(ports), rows, cols, data,
+            [port.identifier for port in ports], format=format
+        )
+
+    def layered_graph(self):
+        """
+        Get the directed multi-layer graph of the ports of the namespace.
+
+        The graph is built once and cached until the relations it depends on
+        change. See :class:`pynml.index.LayeredGraphIndex` for the kinds of
+        hops it has. It must not be modified by the caller.
+
+        :rtype: :class:`pynml.graph.Graph`
+        :return: The layered graph of the ports.
+        """
+        return self._index('layered_graph', LayeredGraphIndex).graph()
+
+    def layered_path(self, port_a, port_b, weight=None):
+        """
+        Find the shortest path between two ports across layers.
+
+        Besides links, the path can traverse nodes and switching services,
+        and go down and up the layers through adaptation and de-adaptation
+        services. For example, from an Ethernet port, adapted into an OTN
+        port, over a fiber link, and de-adapted back to Ethernet.
+
+        :param port_a: Source port.
+        :type port_a: :class:`pynml.nml.Port`
+        :param port_b: Destination port.
+        :type port_b: :class:`pynml.nml.Port`
+        :param str weight: Key in the ``metadata`` of the objects providing
+         each hop holding its weight. If ``None`` the path with the minimum
+         number of hops is found. A missing key counts as ``1``.
+        :rtype: list
+        :return: The path as a list of tuples (:class:`pynml.nml.Port`, kind,
+         object), with the port, the kind of the hop leaving it and the
+         object that provides the hop. The last tuple is the destination port
+         with ``None`` kind and object. ``None`` is returned if there is no
+         path between the ports.
+        """
+        graph = self.layered_graph()
+        source = graph.index[port_a.identifier]
+        target = graph.index[port_b.identifier]
+
+        if weight is None:
+            path = bfs_path(graph, source, target)
+        else:
+            edge_data = graph.edge_data
+
+            def edge_weight(edge):
+                return edge_data[edge][1].metadata.get(weight, 1)
+
+            path = dijkstra_path(graph, source, target, edge_weight)
+
+        if path is None:
+            return None
+
+        vertices, edges = path
+        hops = [
+            (graph.vertices[vertex], ) + graph.edge_data[edge]
+            for vertex, edge in zip(vertices, edges)
+        ]
+        hops.append((graph.vertices[vertices[-1]], None, None))
+        return hops
+
+    def forwarding_domain(self, port):
+        """
+        Get the forwarding domain of a port.
+
+        Ports are in the same forwarding domain, or broadcast domain, if they
+        are bridged by the same :class:`pynml.nml.SwitchingService` or
+        connected by a :class:`pynml.nml.Link`, directly or through other
+        ports. See :class:`pynml.index.ForwardingDomainIndex`.
+
+        :param port: The port.
+        :type port: :class:`pynml.nml.Port`
+        :rtype: list
+        :return: A list of all :class:`pynml.nml.Port` in the domain of the
+         port, including itself.
+        """
+        return self._index(
+            'forwarding_domains', ForwardingDomainIndex
+        ).domain(port)
+
+    def forwarding_domains(self):
+        """
+        Get all the forwarding domains of the namespace.
+
+        See :meth:`forwarding_domain`.
+
+        :rtype: list
+        :return: A list of lists of :class:`pynml.nml.Port`, one per domain.
+         Ports without services nor links are not included.
+        """
+        return self._index(
+            'forwarding_domains', ForwardingDomainIndex
+        ).domains()
+
+    def members(self, group, recursive=True):
+        """
+        Get the members of a topology, group or node.
+
+        Members are the objects related with membership relations, like
+        ``Topology.hasTopology``, ``Topology.hasNode``, ``Node.hasInboundPort``
+        or ``PortGroup.hasPort``. See :class:`pynml.index.MembershipIndex`.
+
+        The flattened members of each object are cached until its membership
+        relations, or those of its members, change.
+
+        :param group: The topology, group or node.
+        :param bool recursive: Include the members of the members.
+        :rtype: list
+        :return: A list of the members, in depth-first order.
+        :raises Exception: If the membership relations have a cycle.
+        """
+        return self._index('membership', MembershipIndex).descendants(
+            group, recursive=recursive
+        )
+
+    def containers(self, obj, recursive=True):
+        """
+        Get the topologies, groups and nodes an object is a member of.
+
+        See :meth:`members`.
+
+        :param obj: The member object.
+        :param bool recursive: Include the containers of the containers.
+        :rtype: list
+        :return: A list of the containers, in depth-first order.
+        """
+        return self._index('membership', MembershipIndex).ancestors(
+            obj, recursive=recursive
+        )
+
+    def hosts(self, node, recursive=True):
+        """
+        Get the objects that implement a virtual object.
+
+        Objects are implemented by others with ``implementedBy``, like a
+        virtual node implemented by a virtual machine, itself implemented by
+        a physical node. See :class:`pynml.index.ImplementationIndex`.
+
+        :param node: The virtual object.
+        :param bool recursive: Include the objects that implement the
+         implementing objects, down to the physical ones.
+        :rtype: list
+        :return: A list of the implementing objects, in depth-first order.
+        :raises Exception: If the ``implementedBy`` relations have a cycle.
+        """
+        return self._index('implementation', ImplementationIndex).descendants(
+            node, recursive=recursive
+        )
+
+    def hosted(self, node, recursive=True):
+        """
+        Get the virtual objects implemented by an object.
+
+        The flattened objects implemented by each object are cached until
+        the ``implementedBy`` relations of it, or of the objects it
+        implements, change. See :meth:`hosts`.
+
+        :param node: The implementing, usually physical, object.
+        :param bool recursive: Include the objects implemented by the
+         implemented objects.
+        :rtype: list
+        :return: A list of the implemented objects, in depth-first order.
+        :raises Exception: If the ``implementedBy`` relations have a cycle.
+        """
+        return self._index('implementation', ImplementationIndex).ancestors(
+            node, recursive=recursive
+        )
+
+    def aliases(self, obj):
+        """
+        Get all the aliases of an object.
+
+        Objects are aliases if they are related with ``isAlias``, in any
+        direction, directly or through other aliases. See
+        :class:`pynml.index.AliasIndex`.
+
+        :param NMLObject obj: The object.
+        :rtype: list
+        :return: A list of all the objects that denote the same entity,
+         including the object itself.
+        """
+        return self._index('aliases', AliasIndex).aliases(obj)
+
+    def canonical(self, obj):
+        """
+        Get the canonical object of the aliases of an object.
+
+        The canonical object is the alias with the lowest identifier. See
+        :meth:`aliases`.
+
+        :param NMLObject obj: The object.
+        :return: The canonical object, which can be the object itself.
+        """
+        return self._index('aliases', AliasIndex).canonical(obj)
+
+    def intern(self, obj):
+        """
+        Get the registered object with the same value as a value object.
+
+        Value objects are the :class:`pynml.nml.Lifetime`,
+        :class:`pynml.nml.Location`, :class:`pynml.nml.Label` and
+        :class:`pynml.nml.LabelGroup`, and their value is given by all their
+        attributes but ``identifier`` and ``name``. See
+        :class:`pynml.index.InternIndex`.
+
+        If a registered object of the same class has the same value it is
+        returned instead of the given object, else the given object is
+        registered and returned:
+
+        ::
+
+            for port in ports:
+                port.add_exists_during(manager.intern(
+                    Lifetime(start='20160101T000000Z', end='20160102T000000Z')
+                ))
+
+        Shared objects are exported once by :meth:`export_nml` and referenced
+        by identifier. Changing the attributes of a shared object changes them
+        for all the objects related to it.
+
+        :param NMLObject obj: The value object.
+        :return: The shared object, which can be the given object.
+        :raises Exception: If the object is not a value object.
+        """
+        index = self._index('interning', InternIndex)
+        if not isinstance(obj, index.types):
+            raise Exception(
+                'Cannot intern objects of type {}'.format(
+                    obj.__class__.__name__
+                )
+            )
+
+        shared = index.shared(obj)
+        if shared is None:
+            self.register_object(obj)
+            shared = obj
+        return shared
+
+    def _default_roots(self):
+        """
+        Get the objects :meth:`collect_orphans` keeps when no roots are given.
+        """
+        return [
+            obj for obj in self.namespace.values()
+            if isinstance(obj, (Topology, Node))
+        ]
+
+    def collect_orphans(self, roots=None):
+        """
+        Unregister all the objects that can't be reached from the roots.
+
+        Objects are reached by following the relations of the roots, and then
+        the relations of the reached objects, like the ports of a node, the
+        links of the ports, or the lifetimes and labels of any of them.
+
+        :param roots: Iterable of the objects to keep. If ``None``, all the
+         :class:`pynml.nml.Topology` and :class:`pynml.nml.Node` in the
+         namespace are used.
+        :rtype: list
+        :return: A list of the unregistered objects. Its length is the number
+         of objects collected.
+        """
+        if roots is None:
+            roots = self._default_roots()
+
+        # Mark
+        marked = set()
+        stack = list(roots)
+        while stack:
+            obj = stack.pop()
+            if id(obj) in marked:
+                continue
+            marked.add(id(obj))
+            for _, related in obj.iter_relations():
+                if id(related) not in marked:
+                    stack.append(related)
+
+        # Sweep
+        freed = [
+            obj for obj in self.namespace.values() if id(obj) not in marked
+        ]
+        for obj in freed:
+            self.unregister_object(obj)
+        return freed
+
+    def content_hash(self, obj):
+        """
+        Get the content hash of an object.
+
+        The hash covers the attributes of the object and the identifiers of
+        its related objects, and is cached until any of them changes. See
+        :func:`pynml.diff.content_hash`.
+
+        :param NMLObject obj: The object.
+        :rtype: str
+        """
+        return self._index('hashes', MerkleIndex).content(obj)
+
+    def merkle_hash(self, obj):
+        """
+        Get the Merkle hash of an object and all its members.
+
+        The hash covers the content hash of the object and the Merkle hashes
+        of its members (see :meth:`members`), so it changes if any object in
+        the subtree of a topology, group or node changes. Hashes are cached
+        and only the ones of the changed objects and their containers are
+        recomputed. See :class:`pynml.index.MerkleIndex`.
+
+        :param NMLObject obj: The object.
+        :rtype: str
+        :raises Exception: If the membership relations have a cycle.
+        """
+        return self._index('hashes', MerkleIndex).merkle(obj)
+
+    def root_hash(self):
+        """
+        Get a hash of the whole namespace.
+
+        Two namespaces with the same objects, attributes and relations have
+        the same root hash. Use :func:`pynml.diff.diff` to find what changed
+        between two namespaces with different root hashes.
+
+        :rtype: str
+        :raises Exception: If the membership relations have a cycle.
+        """
+        return self._index('hashes', MerkleIndex).root()
+
+    def top_level(self):
+        """
+        Get the objects that are not a member of any other object.
+
+        The subtrees of these objects, as given by :meth:`members`, cover the
+        whole namespace.
+
+        :rtype: list
+        :raises Exception: If the membership relations have a cycle.
+        """
+        return self._index('hashes', MerkleIndex).top_level()
+
+    def validate(self):
+        """
+        Check the relations of all the objects of this namespace.
+
+        Relations are checked for objects not registered in this namespace,
+        fixed cardinality relations with unset objects, like a
+        :class:`pynml.nml.BidirectionalPort` without ports, and objects of
+        types not allowed by the specification. Such relations are otherwise
+        silently skipped by :meth:`export_nml`.
+
+        See :func:`pynml.validation.validate`.
+
+        :rtype: list
+        :return: A list of :data:`pynml.validation.Violation`, empty if the
+         namespace is valid.
+        """
+        return validate(self.namespace)
+
+    def changelog(self):
+        """
+        Get the log of the last change of each object of the namespace.
+
+        The log is created the first time this method is called, logging
+        every object already registered, and from then on it is kept up to
+        date when the namespace changes.
+
+        :rtype: :class:`pynml.index.ChangeLogIndex`
+        :return: The change log of this namespace.
+        """
+        return self._index('changelog', ChangeLogIndex)
+
+    @property
+    def epoch(self):
+        """
+        Number of changes of this namespace since its changes are logged.
+
+        Each registration, unregistration, relation change or attribute
+        change of a registered object increments the epoch. See
+        :meth:`changelog`.
+
+        :rtype: int
+        """
+        return self.changelog().epoch
+
+    def compact_changelog(self, epoch):
+        """
+        Forget the objects unregistered up to an epoch.
+
+        Call it with the oldest epoch acknowledged by all the consumers of
+        the patches of :meth:`export_delta`, as patches since older epochs
+        can no longer be exported.
+
+        :param int epoch: The epoch.
+        :rtype: int
+        :return: The number of unregistered objects forgotten.
+        """
+        return self.changelog().compact(epoch)
+
+    def export_delta(self, since_epoch=0, pretty=True):
+        """
+        Export the changes of this namespace after an epoch as a patch.
+
+        The patch has the objects created or modified after the epoch, with
+        all their attributes and relations, and the identifiers of the
+        objects unregistered after it. Its size is proportional to the number
+        of changed objects. See :mod:`pynml.delta`.
+
+        :param int since_epoch: The :attr:`epoch` returned by the last patch
+         applied by the consumer, or 0 for a copy of the whole namespace to
+         apply to an empty one.
+        :param pretty: Pretty print the output XML.
+        :rtype: str
+        :return: The patch in NML XML format.
+        :raises Exception: If the unregistered objects after the epoch were
+         forgotten by :meth:`compact_changelog`.
+        """
+        return export_delta(
+            self.namespace, self.changelog(), since=since_epoch, pretty=pretty
+        )
+
+    def apply_delta(self, patch):
+        """
+        Apply a patch exported by :meth:`export_delta` to this namespace.
+
+        :param str patch: The patch in NML XML format.
+        :rtype: int
+        :return: The epoch of the namespace the patch was exported from, to
+         request the next patch with.
+        """
+        return apply_delta(self, patch)
+
+    @classmethod
+    def recover(cls, snapshot, journal, **kwargs):
+        """
+        Rebuild a namespace from a snapshot and a journal.
+
+        The snapshot, if it exists, is loaded with :meth:`apply_delta` and
+        then the records of the journal since the snapshot are replayed. The
+        journal is then attached to the new manager, so it records all its
+        changes from then on. Use :meth:`pynml.journal.Journal.checkpoint`
+        to write a new snapshot and restart the journal.
+
+        Only the namespace is rebuilt, the helpers of subclasses like
+        :class:`ExtendedNMLManager` don't know about the recovered objects.
+        Attribute values get back their type if it is one of the types of
+        :func:`pynml.delta.encode_value`, like the
+        :py:class:`datetime.datetime` of lifetimes, and come back as text
+        otherwise.
+
+        :param str snapshot: Path to the snapshot.
+        :param journal: The :class:`pynml.journal.Journal`.
+        :rtype: :class:`NMLManager`
+        :return: A new manager of this class, created with the given keyword
+         arguments.
+        """
+        manager = cls(**kwargs)
+        if exists(snapshot):
+            with open(snapshot, 'rb') as fd:
+                manager.apply_delta(fd.read())
+
+        journal.recover(manager, snapshot_digest(snapshot))
+        manager._indexes['journal'] = journal
+        return manager
+
+    def export_nml(self, pretty=True, at=None, collapse_aliases=False):
         """
         Export current namespace as a NML XML format.
 
         :param pretty: Pretty print the output XML.
+        :param at: If given, export only the topology that exists during this
+         point in time (see :meth:`active_at`). Objects with lifetimes that
+         don't contain it, and relations to them, are skipped. Objects
+         without lifetimes are always exported.
+        :param bool collapse_aliases: Export only the :meth:`canonical` object
+         of each set of aliases, and reference it instead of its aliases.
         :rtype: str
         :return: The current NML namespace in NML XML format.
         """
@@ -135,8 +975,40 @@ class NMLManager(object):
         for xmlns, uri in NAMESPACES.items():
             root.attrib['xmlns:{}'.format(xmlns)] = uri
 
+        skipped = set()
+        if at is not None:
+            index = self.lifetimes()
+            active = {obj.identifier for obj in index.active_at(at)}
+            skipped = {
+                obj_id for obj_id, obj in self.namespace.items()
+                if obj_id not in active and index.is_related(obj)
+            }
+
+        canonical = None
+        if collapse_aliases:
+            canonical = self._index('aliases', AliasIndex).canonical
+
+        def resolver(obj):
+            if not skipped and canonical is None:
+                return None
+
+            def resolve(related):
+                if related.identifier in skipped:
+                    return None
+                if canonical is not None:
+                    related = canonical(related)
+                    if related is obj:
+                        return None
+                return related
+
+            return resolve
+
         for obj_id, obj in self.namespace.items():
-            obj.as_nml(parent=root)
+            if obj_id in skipped:
+                continue
+            if canonical is not None and canonical(obj) is not obj:
+                continue
+            obj.as_nml(parent=root, resolve=resolver(obj))
 
         xml = etree.tostring(root, encoding='utf-8')
         if pretty:
@@ -309,14 +1181,22 @@ class ExtendedNMLManager(NMLManager):
     The original proposed name for this class was
     ``NMLManagerWithCommonHelpersThatMakeSeveralAssumptions``, but it was too
     long.
+
+    :param int path_cache_size: Maximum number of paths kept in
+     :attr:`path_cache`.
+    :var path_cache: :class:`pynml.cache.PathCache` of the paths found by
+     :meth:`shortest_path`.
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, path_cache_size=1024, **kwargs):
         super(ExtendedNMLManager, self).__init__(**kwargs)
         self._environment = None
         self._nodes = OrderedDict()
         self._biport_node_map = OrderedDict()
         self._bilink_biport_map = OrderedDict()
+        self._graph = None
+        self._components = None
+        self.path_cache = PathCache(path_cache_size)
 
     def create_environment(self, **kwargs):
         """
@@ -356,6 +1236,9 @@ class ExtendedNMLManager(NMLManager):
         node = Node(**kwargs)
         self.register_object(node)
         self._nodes[node.identifier] = node
+        self._graph = None
+        if self._components is not None:
+            self._components.add(node.identifier)
         return node
 
     def create_biport(self, node, **kwargs):
@@ -424,8 +1307,141 @@ class ExtendedNMLManager(NMLManager):
         biport_b._has_port_ports[1].add_is_source(link_b_a)  # outbound port
 
         self._bilink_biport_map[bilink.identifier] = (biport_a, biport_b)
+        self._graph = None
+        if self._components is not None:
+            self._components.union(
+                self._biport_node_map[biport_a.identifier].identifier,
+                self._biport_node_map[biport_b.identifier].identifier
+            )
+
+        # A new bilink can make any path shorter
+        self.path_cache.clear()
         return bilink
 
+    def remove_bilink(self, bilink):
+        """
+        Helper to remove a :class:`pynml.nml.BidirectionalLink`.
+
+        Removes the bilink created by :meth:`create_bilink` along with its
+        sublinks and their relations with the subports.
+
+        :param bilink: The bilink to remove.
+        :type bilink: :class:`pynml.nml.BidirectionalLink`
+        """
+        biport_a, biport_b = self._bilink_biport_map.pop(bilink.identifier)
+        link_a_b, link_b_a = bilink.get_has_link()
+
+        biport_a._has_port_ports[0].remove_is_sink(link_b_a)
+        biport_a._has_port_ports[1].remove_is_source(link_a_b)
+
+        biport_b._has_port_ports[0].remove_is_sink(link_a_b)
+        biport_b._has_port_ports[1].remove_is_source(link_b_a)
+
+        self.unregister_object(bilink)
+        self.unregister_object(link_a_b)
+        self.unregister_object(link_b_a)
+
+        self._graph = None
+        self._components = None
+        self.path_cache.invalidate(bilink.identifier)
+
+    def remove_biport(self, biport):
+        """
+        Helper to remove a :class:`pynml.nml.BidirectionalPort`.
+
+        Removes the biport created by :meth:`create_biport` along with its
+        subports, their relations with the node and all the bilinks connected
+        to it.
+
+        :param biport: The biport to remove.
+        :type biport: :class:`pynml.nml.BidirectionalPort`
+        """
+        for bilink_id, biports in list(self._bilink_biport_map.items()):
+            if biport in biports:
+                self.remove_bilink(self.namespace[bilink_id])
+
+        node = self._biport_node_map.pop(biport.identifier)
+        in_port, out_port = biport.get_has_port()
+
+        node.remove_has_inbound_port(in_port)
+        node.remove_has_outbound_port(out_port)
+
+        self.unregister_object(biport)
+        self.unregister_object(in_port)
+        self.unregister_object(out_port)
+
+    def remove_node(self, node):
+        """
+        Helper to remove a :class:`pynml.nml.Node`.
+
+        Removes the node created by :meth:`create_node` along with all its
+        biports and the bilinks connected to them.
+
+        :param node: The node to remove.
+        :type node: :class:`pynml.nml.Node`
+        """
+        for biport_id, biport_node in list(self._biport_node_map.items()):
+            if biport_node is node:
+                self.remove_biport(self.namespace[biport_id])
+
+        del self._nodes[node.identifier]
+        self.unregister_object(node)
+
+        self._graph = None
+        self._components = None
+        self.path_cache.invalidate(node.identifier)
+
+    def _default_roots(self):
+        """
+        Also keep the environment, biports and bilinks created by the helpers
+        of this manager, as they aren't related from any node.
+        """
+        roots = super(ExtendedNMLManager, self)._default_roots()
+        if self._environment is not None:
+            roots.append(self._environment)
+        roots.extend(
+            self.namespace[identifier] for identifier in chain(
+                self._biport_node_map, self._bilink_biport_map
+            )
+        )
+        return roots
+
+    def collect_orphans(self, roots=None):
+        """
+        Unregister all the objects that can't be reached from the roots.
+
+        Unlike :meth:`NMLManager.collect_orphans`, the environment, biports
+        and bilinks created by this manager are also kept if no roots are
+        given. As they aren't related from any node, given roots must include
+        the ones to keep. Collected nodes, biports and bilinks are forgotten
+        by the helpers of this manager.
+
+        See :meth:`NMLManager.collect_orphans`.
+        """
+        freed = super(ExtendedNMLManager, self).collect_orphans(roots=roots)
+        if not freed:
+            return freed
+
+        freed_ids = set(id(obj) for obj in freed)
+        if id(self._environment) in freed_ids:
+            self._environment = None
+        for node in list(self._nodes.values()):
+            if id(node) in freed_ids:
+                del self._nodes[node.identifier]
+        for biport_id, node in list(self._biport_node_map.items()):
+            if id(node) in freed_ids or biport_id not in self.namespace:
+                del self._biport_node_map[biport_id]
+        for bilink_id, biports in list(self._bilink_biport_map.items()):
+            if bilink_id not in self.namespace or any(
+                    biport.identifier not in self._biport_node_map
+                    for biport in biports):
+                del self._bilink_biport_map[bilink_id]
+
+        self._graph = None
+        self._components = None
+        self.path_cache.clear()
+        return freed
+
     def nodes(self):
         """
         Iterate over all registered :class:`pynml.nml.Node` s in the namespace.
@@ -476,6 +1492,480 @@ class ExtendedNMLManager(NMLManager):
                 self.namespace[bilink_id]
             )
 
+    def graph(self):
+        """
+        Get the :class:`pynml.graph.Graph` of nodes and bilinks.
+
+        Each vertex of the graph is a :class:`pynml.nml.Node`, in the order
+        they were added into the namespace, and each edge carries a tuple
+        (:class:`pynml.nml.BidirectionalPort` A,
+        :class:`pynml.nml.BidirectionalPort` B,
+        :class:`pynml.nml.BidirectionalLink`).
+
+        The graph is cached until a node or a bilink is created, so it must not
+        be modified by the caller.
+
+        :rtype: :class:`pynml.graph.Graph`
+        :return: The graph of the topology.
+        """
+        if self._graph is not None:
+            return self._graph
+
+        graph = Graph()
+        for node in self._nodes.values():
+            graph.add_vertex(node.identifier, node)
+
+        index = graph.index
+        for (node_a, biport_a), (node_b, biport_b), bilink in self.bilinks():
+            graph.add_edge(
+                index[node_a.identifier], index[node_b.identifier],
+                (biport_a, biport_b, bilink)
+            )
+
+        self._graph = graph
+        return graph
+
+    def adjacency(self, format='csr', weight=None):
+        """
+        Export the undirected adjacency matrix of the nodes in the namespace.
+
+        Each :class:`pynml.nml.Node` is a vertex, in the order they were added
+        into the namespace, and each :class:`pynml.nml.BidirectionalLink`
+        adds a symmetric entry between the nodes of its biports.
+
+        This function requires the optional NumPy package.
+
+        :param str format: Matrix format, either ``csr`` or ``coo``.
+        :param str weight: Key in the ``metadata`` of the bilinks holding their
+         weight. If ``None``, or if the key is missing, each bilink counts as
+         ``1``. Parallel bilinks are summed.
+        :rtype: :class:`pynml.graph.CSRAdjacency` or
+         :class:`pynml.graph.COOAdjacency`
+        :return: The adjacency matrix of the nodes.
+        """
+        graph = self.graph()
+
+        rows = []
+        cols = []
+        data = []
+        for (u, v), (_, _, bilink) in zip(graph.edges, graph.edge_data):
+            value = 1 if weight is None else bilink.metadata.get(weight, 1)
+            rows.append(u)
+            cols.append(v)
+            data.append(value)
+            if u != v:
+                rows.append(v)
+                cols.append(u)
+                data.append(value)
+
+        return sparse_adjacency(
+            len(graph), rows, cols, data,
+            [node.identifier for node in graph.vertices], format=format
+        )
+
+    def _union_find(self):
+        """
+        Get the union-find of the nodes, rebuilding it after removals.
+        """
+        if self._components is None:
+            components = UnionFind(self._nodes)
+            for (node_a, _), (node_b, _), _ in self.bilinks():
+                components.union(node_a.identifier, node_b.identifier)
+            self._components = components
+        return self._components
+
+    def components(self):
+        """
+        Get the connected components of the topology.
+
+        Components are maintained incrementally as nodes and bilinks are
+        created, and rebuilt on first use after a removal.
+
+        :rtype: list
+        :return: A list of lists of :class:`pynml.nml.Node`, one per
+         component.
+        """
+        return [
+            [self._nodes[node_id] for node_id in component]
+            for component in self._union_find().sets()
+        ]
+
+    def count_components(self):
+        """
+        Get the number of connected components of the topology.
+
+        :rtype: int
+        :return: The number of connected components, in constant time.
+        """
+        return self._union_find().count
+
+    def connected(self, node_a, node_b):
+        """
+        Check if there is a path between two nodes.
+
+        :param node_a: First node.
+        :type node_a: :class:`pynml.nml.Node`
+        :param node_b: Second node.
+        :type node_b: :class:`pynml.nml.Node`
+        :rtype: bool
+        :return: True if both nodes are in the same connected component.
+        """
+        return self._union_find().connected(
+            node_a.identifier, node_b.identifier
+        )
+
+    def bridges(self):
+        """
+        Find the bilinks whose failure partitions the topology.
+
+        :rtype: list
+        :return: A list of :class:`pynml.nml.BidirectionalLink`, in the order
+         they were added into the namespace.
+        """
+        graph = self.graph()
+        bridges, _ = cut_elements(graph)
+        return [graph.edge_data[edge][2] for edge in bridges]
+
+    def articulation_points(self):
+        """
+        Find the nodes whose failure partitions the topology.
+
+        :rtype: list
+        :return: A list of :class:`pynml.nml.Node`, in the order they were
+         added into the namespace.
+        """
+        graph = self.graph()
+        _, articulations = cut_elements(graph)
+        return [graph.vertices[vertex] for vertex in articulations]
+
+    def simulate_failures(
+            self, kind='link', order=1, elements=None, workers=None,
+            chunksize=64):
+        """
+        Simulate all the scenarios of `order` simultaneous failures.
+
+        The scenarios are evaluated over a frozen copy of the adjacency of
+        :meth:`graph`, fanned out to a pool of processes that share it, so the
+        namespace is never modified. Single bilink failures of bilinks that
+        are not bridges (see :meth:`bridges`) don't change the connectivity
+        and are resolved without being simulated.
+
+        :param str kind: Either ``link`` to fail
+         :class:`pynml.nml.BidirectionalLink` s or ``node`` to fail
+         :class:`pynml.nml.Node` s.
+        :param int order: Number of simultaneous failures per scenario, for
+         example ``1`` for N-1 and ``2`` for N-2 analysis.
+        :param elements: Bilinks or nodes that can fail. All of them if
+         ``None``.
+        :param int workers: Number of worker processes. If ``0`` no process
+         pool is used. If ``None`` a pool with a process per CPU is used only
+         for :data:`pynml.simulation.PARALLEL_THRESHOLD` scenarios or more.
+        :param int chunksize: Number of scenarios sent to a worker at once.
+        :rtype: list
+        :return: A list of :class:`pynml.simulation.ScenarioResult`, one per
+         combination of failed elements.
+        """
+        graph = self.graph()
+
+        if kind == 'link':
+            ordinals = {
+                bilink.identifier: edge
+                for edge, (_, _, bilink) in enumerate(graph.edge_data)
+            }
+            payloads = [bilink for _, _, bilink in graph.edge_data]
+        elif kind == 'node':
+            ordinals = graph.index
+            payloads = graph.vertices
+        else:
+            raise Exception(
+                'Unknown failure kind "{}". '
+                'Supported kinds are: link, node'.format(kind)
+            )
+
+        if elements is None:
+            candidates = list(range(len(payloads)))
+        else:
+            candidates = [ordinals[element.identifier] for element in elements]
+
+        topology = FrozenTopology.from_graph(graph)
+        baseline = topology.evaluate()
+        bridges = None
+        if kind == 'link' and order == 1:
+            bridges = set(cut_elements(graph)[0])
+
+        # Build the scenarios that need to be simulated
+        failures = list(combinations(candidates, order))
+        results = [None] * len(failures)
+        scenarios = []
+        positions = []
+        for position, failed in enumerate(failures):
+            if bridges is not None and failed[0] not in bridges:
+                results[position] = baseline
+            elif kind == 'link':
+                scenarios.append(((), frozenset(failed)))
+                positions.append(position)
+            else:
+                scenarios.append((failed, ()))
+                positions.append(position)
+
+        simulated = simulate(
+            topology, scenarios, workers=workers, chunksize=chunksize
+        )
+        for position, result in zip(positions, simulated):
+            results[position] = result
+
+        return [
+            ScenarioResult(
+                tuple(payloads[ordinal].identifier for ordinal in failed),
+                *result
+            )
+            for failed, result in zip(failures, results)
+        ]
+
+    def availability(
+            self, pairs, samples=10000, seed=None,
+            probability='failure_probability', confidence=0.95, batch=1000):
+        """
+        Estimate the end-to-end availability between pairs of nodes.
+
+        The failure probability of each :class:`pynml.nml.BidirectionalLink`
+        and :class:`pynml.nml.Node` is read from its ``metadata`` (a missing
+        key means it never fails). Failure masks for all bilinks and nodes are
+        drawn in batches and the connectivity of each batch is evaluated at
+        once with NumPy.
+
+        This function requires the optional NumPy package.
+
+        :param list pairs: List of tuples (:class:`pynml.nml.Node`,
+         :class:`pynml.nml.Node`) of the connections to evaluate.
+        :param int samples: Number of samples.
+        :param seed: Seed of the random number generator, or a
+         :py:class:`numpy.random.RandomState`.
+        :param str probability: Metadata key holding the failure probability.
+        :param float confidence: Confidence level of the intervals.
+        :param int batch: Number of samples evaluated at once.
+        :rtype: list
+        :return: A list of :class:`pynml.simulation.Availability`, one per
+         pair.
+        :raises ValueError: If ``samples`` or ``batch`` are not positive or
+         ``confidence`` is not between 0 and 1 exclusive.
+        """
+        graph = self.graph()
+        index = graph.index
+
+        return sample_availability(
+            len(graph),
+            [u for u, _ in graph.edges],
+            [v for _, v in graph.edges],
+            [
+                bilink.metadata.get(probability, 0.0)
+                for _, _, bilink in graph.edge_data
+            ],
+            [node.metadata.get(probability, 0.0) for node in graph.vertices],
+            [
+                (index[node_a.identifier], index[node_b.identifier])
+                for node_a, node_b in pairs
+            ],
+            samples=samples, seed=seed, confidence=confidence, batch=batch
+        )
+
+    def _weight(self, graph, weight):
+        """
+        Build the edge weight function for the given metadata key.
+        """
+        if weight is None:
+            return None
+
+        edge_data = graph.edge_data
+
+        def edge_weight(edge):
+            return edge_data[edge][2].metadata.get(weight, 1)
+
+        return edge_weight
+
+    def _hops(self, graph, path):
+        """
+        Convert a path of vertex and edge ordinals to a list of hops.
+        """
+        vertices, edges = path
+        hops = []
+        for vertex, edge in zip(vertices, edges):
+            biport_a, biport_b, bilink = graph.edge_data[edge]
+            biport = biport_a if graph.edges[edge][0] == vertex else biport_b
+            hops.append((graph.vertices[vertex], biport, bilink))
+        hops.append((graph.vertices[vertices[-1]], None, None))
+        return hops
+
+    def relation_changed(self, obj, relation, added, removed):
+        """
+        Observer callback override. See :meth:`NMLManager.relation_changed`.
+
+        Changes to bilinks and nodes evict the cached paths that traverse
+        them.
+        """
+        super(ExtendedNMLManager, self).relation_changed(
+            obj, relation, added, removed
+        )
+        if isinstance(obj, (BidirectionalLink, Node)):
+            self.path_cache.invalidate(obj.identifier)
+
+    def invalidate_paths(self, obj):
+        """
+        Evict the cached paths that traverse the given bilink or node.
+
+        Call this after changing the ``metadata`` weights of a bilink, as
+        those changes cannot be detected.
+
+        :param obj: The changed bilink or node.
+        :rtype: int
+        :return: The number of evicted paths.
+        """
+        return self.path_cache.invalidate(obj.identifier)
+
+    def shortest_path(self, node_a, node_b, weight=None):
+        """
+        Find the shortest path between two nodes.
+
+        If `weight` is ``None`` the path with the minimum number of hops is
+        found using a breadth-first search. If not, `weight` is the key in the
+        ``metadata`` of each :class:`pynml.nml.BidirectionalLink` holding its
+        weight (a missing key counts as ``1``), and Dijkstra's algorithm is
+        used.
+
+        Paths are kept in :attr:`path_cache` until a bilink is created or a
+        bilink or node they traverse is removed or changed.
+
+        :param node_a: Source node.
+        :type node_a: :class:`pynml.nml.Node`
+        :param node_b: Destination node.
+        :type node_b: :class:`pynml.nml.Node`
+        :param str weight: Metadata key of the bilinks weight.
+        :rtype: list
+        :return: The path as a list of tuples
+         (:class:`pynml.nml.Node`, :class:`pynml.nml.BidirectionalPort`,
+         :class:`pynml.nml.BidirectionalLink`) with the node, the biport the
+         path leaves the node through and the bilink it traverses. The last
+         tuple is the destination node with ``None`` biport and bilink.
+         ``None`` is returned if there is no path between the nodes.
+        """
+        key = (node_a.identifier, node_b.identifier, weight)
+        hops = self.path_cache.get(key, unset)
+        if hops is not unset:
+            return None if hops is None else list(hops)
+
+        hops = self._shortest_path(node_a, node_b, weight)
+
+        traversed = []
+        for node, _, bilink in hops or ():
+            traversed.append(node.identifier)
+            if bilink is not None:
+                traversed.append(bilink.identifier)
+        self.path_cache.put(key, hops, traversed)
+
+        return None if hops is None else list(hops)
+
+    def _shortest_path(self, node_a, node_b, weight):
+        """
+        Find the shortest path between two nodes without using the cache.
+        """
+        graph = self.graph()
+        source = graph.index[node_a.identifier]
+        target = graph.index[node_b.identifier]
+
+        if weight is None:
+            path = bfs_path(graph, source, target)
+        else:
+            path = dijkstra_path(
+                graph, source, target, self._weight(graph, weight)
+            )
+
+        if path is None:
+            return None
+        return self._hops(graph, path)
+
+    def shortest_paths(self, node_a, node_b, k, weight=None):
+        """
+        Find the `k` shortest simple paths between two nodes.
+
+        See :meth:`shortest_path` for the meaning of `weight` and the format of
+        the paths.
+
+        :param node_a: Source node.
+        :type node_a: :class:`pynml.nml.Node`
+        :param node_b: Destination node.
+        :type node_b: :class:`pynml.nml.Node`
+        :param int k: Maximum number of paths to find.
+        :param str weight: Metadata key of the bilinks weight.
+        :rtype: list
+        :return: A list of up to `k` paths, shortest first.
+        """
+        graph = self.graph()
+        paths = k_shortest_paths(
+            graph,
+            graph.index[node_a.identifier],
+            graph.index[node_b.identifier],
+            k, self._weight(graph, weight)
+        )
+        return [self._hops(graph, path) for path in paths]
+
+    def label_path(self, node_a, node_b, labels=None, labeltype=None):
+        """
+        Find the path with the fewest hops between two nodes along which the
+        same label is available on every hop.
+
+        This is the label continuity constraint of VLANs or wavelengths
+        without conversion. The labels available on each hop are the
+        intersection of the :meth:`available_labels` of its biports and its
+        bilink, and the search carries the labels that survive each partial
+        path as a bitmap, pruning it as soon as they are empty.
+
+        :param node_a: Source node.
+        :type node_a: :class:`pynml.nml.Node`
+        :param node_b: Destination node.
+        :type node_b: :class:`pynml.nml.Node`
+        :param labels: Candidate labels, as a :class:`pynml.labels.LabelSet`
+         or a string in its range syntax. If ``None``, any label.
+        :param str labeltype: If given, consider only the labels of this
+         type.
+        :rtype: tuple
+        :return: A tuple (path, labels) with the path in the format of
+         :meth:`shortest_path` and the :class:`pynml.labels.LabelSet` of the
+         labels available along all of it, or ``None`` if no hop constrains
+         them. ``None`` is returned if there is no such path.
+        """
+        graph = self.graph()
+        candidates = -1
+        if labels is not None:
+            candidates = LabelSet.coerce(labels).bits
+
+        available = {}
+
+        def object_labels(obj):
+            bits = available.get(obj.identifier, None)
+            if bits is None:
+                bits = self._available_labels(obj, labeltype)
+                available[obj.identifier] = bits
+            return bits
+
+        def edge_labels(edge):
+            biport_a, biport_b, bilink = graph.edge_data[edge]
+            return (
+                object_labels(biport_a) & object_labels(biport_b) &
+                object_labels(bilink)
+            )
+
+        found = label_path(
+            graph,
+            graph.index[node_a.identifier],
+            graph.index[node_b.identifier],
+            candidates, edge_labels
+        )
+        if found is None:
+            return None
+
+        path, bits = found
+        return self._hops(graph, path), None if bits < 0 else LabelSet(bits)
+
     def export_graphviz(self):
         """
         Graphiz export override. See :meth:`NMLManager.export_graphviz`.
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Hand written behavior of the generated NML classes.
+
+The classes of the specification listing a mixin in ``NML_SPEC`` inherit from
+it before their parent class. This module must not import :mod:`pynml.nml` at
+module level, as that module imports this one.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+from array import array
+from xml.etree import ElementTree as etree  # noqa
+
+
+class HandleTable(object):
+    """
+    Map between objects and compact integer handles.
+
+    Objects are given consecutive handles the first time they are seen and
+    are kept alive by the table. Each :class:`pynml.manager.NMLManager` has a
+    table shared by all its ordered lists, so each object costs one entry in
+    the table however many lists hold it, and objects are freed with the
+    manager.
+    """
+
+    def __init__(self):
+        self._objects = []
+        self._handles = {}
+
+    def __len__(self):
+        return len(self._objects)
+
+    def handle(self, obj):
+        """
+        Get the handle of an object, assigning a new one if required.
+
+        :param NMLObject obj: The object.
+        :rtype: int
+        """
+        handle = self._handles.get(id(obj), None)
+        if handle is None:
+            handle = len(self._objects)
+            self._objects.append(obj)
+            self._handles[id(obj)] = handle
+        return handle
+
+    def resolve(self, handle):
+        """
+        Get the object of a handle.
+
+        :param int handle: The handle.
+        :rtype: NMLObject
+        """
+        return self._objects[handle]
+
+
+class OrderedListMixin(object):
+    """
+    Compact array backed sequence of objects for
+    :class:`pynml.nml.OrderedList`.
+
+    Items are stored as an ``array('i')`` of handles of a
+    :class:`HandleTable`. Lists registered into a manager use the table of
+    the manager, so each item costs four bytes instead of one ``ListItem``
+    object, plus one table entry per distinct object of the namespace.
+    Indexing is O(1), and slicing copies the selected handles, O(k), into a
+    new list sharing the same table. Changes of the items are notified to
+    the observers as changes of an ``items`` attribute.
+
+    :param items: Iterable of the initial items.
+    :param HandleTable table: Table of handles. If ``None``, the list gets a
+     table of its own until it is registered into a manager.
+    """
+
+    def __init__(self, items=(), table=None, **kwargs):
+        super(OrderedListMixin, self).__init__(**kwargs)
+        self._table = HandleTable() if table is None else table
+        self._items = array(str('i'), map(self._table.handle, items))
+
+    @property
+    def handles(self):
+        """
+        Get the array of handles of the items.
+
+        :rtype: :py:class:`array.array`
+        """
+        return self._items
+
+    def attach(self, table):
+        """
+        Move the handles of the items to another table.
+
+        :param HandleTable table: The new table of handles.
+        """
+        if table is self._table:
+            return
+        self._items = array(str('i'), map(table.handle, self))
+        self._table = table
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        resolve = self._table.resolve
+        for handle in self._items:
+            yield resolve(handle)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            sliced = self.__class__(table=self._table)
+            sliced._items = self._items[index]
+            return sliced
+        return self._table.resolve(self._items[index])
+
+    def __setitem__(self, index, item):
+        if isinstance(index, slice):
+            self._items[index] = array(
+                str('i'), map(self._table.handle, item)
+            )
+        else:
+            self._items[index] = self._table.handle(item)
+        self._notify_attribute('items', self)
+
+    def __delitem__(self, index):
+        del self._items[index]
+        self._notify_attribute('items', self)
+
+    def append(self, item):
+        """
+        Append an item at the end of the list.
+
+        :param NMLObject item: The item to append.
+        """
+        self._items.append(self._table.handle(item))
+        self._notify_attribute('items', self)
+
+    def extend(self, items):
+        """
+        Append all the given items at the end of the list.
+
+        :param items: Iterable of the items to append.
+        """
+        self._items.extend(map(self._table.handle, items))
+        self._notify_attribute('items', self)
+
+    def as_nml(self, this=None, parent=None, resolve=None):
+        """
+        Build NML representation of this list.
+
+        Items are written in order, each one related to the following one
+        with a ``next`` relation.
+
+        See :meth:`pynml.nml.NMLObject.as_nml`.
+        """
+        from .nml import NAMESPACES
+
+        this = super(OrderedListMixin, self).as_nml(
+            this=this, parent=parent, resolve=resolve
+        )
+
+        items = list(self)
+        if resolve is not None:
+            items = [
+                resolved for resolved in map(resolve, items)
+                if resolved is not None
+            ]
+
+        for item, following in zip(items, items[1:] + [None]):
+            element = etree.SubElement(
+                this, item.__class__.__name__, id=item.identifier
+            )
+            if following is not None:
+                relation = etree.SubElement(
+                    element, 'Relation',
+                    type='{}#next'.format(NAMESPACES['nml'])
+                )
+                etree.SubElement(
+                    relation, following.__class__.__name__,
+                    id=following.identifier
+                )
+
+        return this
+
+
+__all__ = ['HandleTable', 'OrderedListMixin']
@@ -28,9 +28,12 @@ from collections import OrderedDict
 from abc import ABCMeta, abstractmethod
 from xml.etree import ElementTree as etree  # noqa
 
-from six import add_metaclass
+from six import add_metaclass, text_type
 from rfc3986 import is_valid_uri
 
+from .mixins import (
+    OrderedListMixin
+)
 from .exceptions import (
     RelationExistsDuringError,
     RelationIsAliasError,
@@ -81,6 +84,70 @@ class NMLObject(object):
         self.attributes = []
         self.relations = OrderedDict()
         self.metadata = kwargs
+        self.observers = []
+
+    def iter_relations(self):
+        """
+        Iterate over all the objects related with this object.
+
+        Unset members of fixed cardinality relations are skipped.
+
+        :return: An iterator of tuples (relation name, related object).
+        """
+        for relname, relgetter in self.relations.items():
+
+            # Composition elements are tuples
+            # Aggregation elements are OrderedDict
+            associated = relgetter()
+            if isinstance(associated, OrderedDict):
+                associated = associated.values()
+
+            for related in associated:
+                if related is not None:
+                    yield relname, related
+
+    def _notify_relation(self, relation, added, removed):
+        """
+        Notify the observers of this object that a relation changed.
+
+        Each observer must implement a
+        ``relation_changed(obj, relation, added, removed)`` method.
+
+        :param str relation: Name of the relation that changed.
+        :param added: Objects related by this change.
+        :param removed: Objects no longer related after this change.
+        """
+        if not self.observers:
+            return
+
+        added_ids = set(id(obj) for obj in added)
+        removed_ids = set(id(obj) for obj in removed)
+        added = tuple(
+            obj for obj in added
+            if obj is not None and id(obj) not in removed_ids
+        )
+        removed = tuple(
+            obj for obj in removed
+            if obj is not None and id(obj) not in added_ids
+        )
+        if not added and not removed:
+            return
+
+        for observer in self.observers:
+            observer.relation_changed(self, relation, added, removed)
+
+    def _notify_attribute(self, attribute, value):
+        """
+        Notify the observers of this object that an attribute changed.
+
+        Each observer must implement a
+        ``attribute_changed(obj, attribute, value)`` method.
+
+        :param str attribute: Name of the attribute that changed.
+        :param value: New value of the attribute.
+        """
+        for observer in self.observers:
+            observer.attribute_changed(self, attribute, value)
 
     def _describe_object(self):
         """
@@ -119,7 +186,7 @@ class NMLObject(object):
                 this = etree.SubElement(parent, name)
         return this
 
-    def as_nml(self, this=None, parent=None):
+    def as_nml(self, this=None, parent=None, resolve=None):
         """
         Build NML representation of this node.
 
@@ -128,6 +195,9 @@ class NMLObject(object):
         :param parent: Parent node to hook to. If `None`, a root node is
          created.
         :type parent: :py:class:`xml.etree.ElementTree`
+        :param resolve: Optional callable that receives each related object
+         and returns the object to reference instead, or `None` to skip it.
+         Objects resolved more than once per relation are referenced once.
         :rtype: :py:class:`xml.etree.ElementTree`
         :return: The NML representation of this node.
         """
@@ -136,8 +206,8 @@ class NMLObject(object):
         # Attributes
         for attr_name in self.attributes:
             attr = getattr(self, attr_name)
-            if attr is not unset:
-                this.attrib[attr_name] = attr
+            if attr is not unset and attr is not None:
+                this.attrib[attr_name] = text_type(attr)
 
         # Relations
         for relname, relgetter in self.relations.items():
@@ -149,9 +219,19 @@ class NMLObject(object):
                 associated = associated.values()
 
             # Ignore empty relations
-            if not associated or not all(associated):
+            if not associated or \
+                    any(related is None for related in associated):
                 continue
 
+            if resolve is not None:
+                associated = list(OrderedDict(
+                    (resolved.identifier, resolved)
+                    for resolved in map(resolve, associated)
+                    if resolved is not None
+                ).values())
+                if not associated:
+                    continue
+
             # Create subelement
             relation = etree.SubElement(
                 this, 'Relation',
@@ -234,6 +314,7 @@ class NetworkObject(NMLObject):
         if name is not unset and not name:
             raise AttributeNameError()
         self._name = name
+        self._notify_attribute('name', name)
 
     @property
     def identifier(self):
@@ -255,6 +336,7 @@ class NetworkObject(NMLObject):
         if identifier is not unset and not is_valid_uri(identifier):
             raise AttributeIdError()
         self._identifier = identifier
+        self._notify_attribute('identifier', identifier)
 
     @property
     def version(self):
@@ -274,6 +356,7 @@ class NetworkObject(NMLObject):
         :param str version: Time stamp formatted as ISO 8601.
         """
         self._version = version
+        self._notify_attribute('version', version)
 
     def exists_during(self, lifetime):
         """
@@ -286,8 +369,8 @@ class NetworkObject(NMLObject):
         :return: True if `lifetime` is related to `self` with `existsDuring`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
         return lifetime.identifier in \
@@ -300,12 +383,30 @@ class NetworkObject(NMLObject):
         :param lifetime: Object to add to the `existsDuring` relation.
         :type lifetime: Lifetime
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
-        self._exists_during_lifetimes[lifetime.identifier] = \
-            lifetime
+        collection = self._exists_during_lifetimes
+        previous = collection.get(lifetime.identifier, None)
+        collection[lifetime.identifier] = lifetime
+        self._notify_relation(
+            'existsDuring', (lifetime, ), (previous, )
+        )
+
+    def remove_exists_during(self, lifetime):
+        """
+        Remove given `lifetime` from this object `existsDuring` relations.
+
+        Does nothing if `lifetime` is not related to `self`.
+
+        :param lifetime: Object to remove from the `existsDuring` relation.
+        :type lifetime: Lifetime
+        """
+        previous = self._exists_during_lifetimes.pop(
+            lifetime.identifier, None
+        )
+        self._notify_relation('existsDuring', (), (previous, ))
 
     def get_exists_during(self):
         """
@@ -327,8 +428,8 @@ class NetworkObject(NMLObject):
         :return: True if `network_object` is related to `self` with `isAlias`.
         :rtype: bool
         """
-        if network_object.__class__ not in (
-                NetworkObject, ):
+        if not isinstance(network_object, (
+                NetworkObject, )):
             raise RelationIsAliasError()
 
         return network_object.identifier in \
@@ -341,12 +442,30 @@ class NetworkObject(NMLObject):
         :param network_object: Object to add to the `isAlias` relation.
         :type network_object: NetworkObject
         """
-        if network_object.__class__ not in (
-                NetworkObject, ):
+        if not isinstance(network_object, (
+                NetworkObject, )):
             raise RelationIsAliasError()
 
-        self._is_alias_network_objects[network_object.identifier] = \
-            network_object
+        collection = self._is_alias_network_objects
+        previous = collection.get(network_object.identifier, None)
+        collection[network_object.identifier] = network_object
+        self._notify_relation(
+            'isAlias', (network_object, ), (previous, )
+        )
+
+    def remove_is_alias(self, network_object):
+        """
+        Remove given `network_object` from this object `isAlias` relations.
+
+        Does nothing if `network_object` is not related to `self`.
+
+        :param network_object: Object to remove from the `isAlias` relation.
+        :type network_object: NetworkObject
+        """
+        previous = self._is_alias_network_objects.pop(
+            network_object.identifier, None
+        )
+        self._notify_relation('isAlias', (), (previous, ))
 
     def get_is_alias(self):
         """
@@ -368,8 +487,8 @@ class NetworkObject(NMLObject):
         :return: True if `location` is related to `self` with `locatedAt`.
         :rtype: bool
         """
-        if location.__class__ not in (
-                Location, ):
+        if not isinstance(location, (
+                Location, )):
             raise RelationLocatedAtError()
 
         return location in \
@@ -385,10 +504,12 @@ class NetworkObject(NMLObject):
         arg_tuple = (location, )
 
         for arg in arg_tuple:
-            if arg.__class__ not in (Location, ):
+            if not isinstance(arg, (Location, )):
                 raise RelationLocatedAtError()
 
+        previous = self._located_at_locations
         self._located_at_locations = arg_tuple
+        self._notify_relation('locatedAt', arg_tuple, previous)
 
     def get_located_at(self):
         """
@@ -436,9 +557,9 @@ class Node(NetworkObject):
         :return: True if `port` is related to `self` with `hasInboundPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasInboundPortError()
 
         return port.identifier in \
@@ -451,13 +572,31 @@ class Node(NetworkObject):
         :param port: Object to add to the `hasInboundPort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasInboundPortError()
 
-        self._has_inbound_port_ports[port.identifier] = \
-            port
+        collection = self._has_inbound_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'hasInboundPort', (port, ), (previous, )
+        )
+
+    def remove_has_inbound_port(self, port):
+        """
+        Remove given `port` from this object `hasInboundPort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `hasInboundPort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._has_inbound_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('hasInboundPort', (), (previous, ))
 
     def get_has_inbound_port(self):
         """
@@ -480,9 +619,9 @@ class Node(NetworkObject):
         :return: True if `port` is related to `self` with `hasOutboundPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasOutboundPortError()
 
         return port.identifier in \
@@ -495,13 +634,31 @@ class Node(NetworkObject):
         :param port: Object to add to the `hasOutboundPort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasOutboundPortError()
 
-        self._has_outbound_port_ports[port.identifier] = \
-            port
+        collection = self._has_outbound_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'hasOutboundPort', (port, ), (previous, )
+        )
+
+    def remove_has_outbound_port(self, port):
+        """
+        Remove given `port` from this object `hasOutboundPort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `hasOutboundPort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._has_outbound_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('hasOutboundPort', (), (previous, ))
 
     def get_has_outbound_port(self):
         """
@@ -526,8 +683,8 @@ class Node(NetworkObject):
          `hasService`.
         :rtype: bool
         """
-        if switching_service.__class__ not in (
-                SwitchingService, ):
+        if not isinstance(switching_service, (
+                SwitchingService, )):
             raise RelationHasServiceError()
 
         return switching_service.identifier in \
@@ -540,12 +697,32 @@ class Node(NetworkObject):
         :param switching_service: Object to add to the `hasService` relation.
         :type switching_service: SwitchingService
         """
-        if switching_service.__class__ not in (
-                SwitchingService, ):
+        if not isinstance(switching_service, (
+                SwitchingService, )):
             raise RelationHasServiceError()
 
-        self._has_service_switching_services[switching_service.identifier] = \
-            switching_service
+        collection = self._has_service_switching_services
+        previous = collection.get(switching_service.identifier, None)
+        collection[switching_service.identifier] = switching_service
+        self._notify_relation(
+            'hasService', (switching_service, ), (previous, )
+        )
+
+    def remove_has_service(self, switching_service):
+        """
+        Remove given `switching_service` from this object `hasService`
+        relations.
+
+        Does nothing if `switching_service` is not related to `self`.
+
+        :param switching_service: Object to remove from the `hasService`
+         relation.
+        :type switching_service: SwitchingService
+        """
+        previous = self._has_service_switching_services.pop(
+            switching_service.identifier, None
+        )
+        self._notify_relation('hasService', (), (previous, ))
 
     def get_has_service(self):
         """
@@ -567,8 +744,8 @@ class Node(NetworkObject):
         :return: True if `node` is related to `self` with `implementedBy`.
         :rtype: bool
         """
-        if node.__class__ not in (
-                Node, ):
+        if not isinstance(node, (
+                Node, )):
             raise RelationImplementedByError()
 
         return node.identifier in \
@@ -581,12 +758,30 @@ class Node(NetworkObject):
         :param node: Object to add to the `implementedBy` relation.
         :type node: Node
         """
-        if node.__class__ not in (
-                Node, ):
+        if not isinstance(node, (
+                Node, )):
             raise RelationImplementedByError()
 
-        self._implemented_by_nodes[node.identifier] = \
-            node
+        collection = self._implemented_by_nodes
+        previous = collection.get(node.identifier, None)
+        collection[node.identifier] = node
+        self._notify_relation(
+            'implementedBy', (node, ), (previous, )
+        )
+
+    def remove_implemented_by(self, node):
+        """
+        Remove given `node` from this object `implementedBy` relations.
+
+        Does nothing if `node` is not related to `self`.
+
+        :param node: Object to remove from the `implementedBy` relation.
+        :type node: Node
+        """
+        previous = self._implemented_by_nodes.pop(
+            node.identifier, None
+        )
+        self._notify_relation('implementedBy', (), (previous, ))
 
     def get_implemented_by(self):
         """
@@ -655,6 +850,7 @@ class Port(NetworkObject):
         if encoding is not unset and not is_valid_uri(encoding):
             raise AttributeEncodingError()
         self._encoding = encoding
+        self._notify_attribute('encoding', encoding)
 
     def has_label(self, label):
         """
@@ -667,8 +863,8 @@ class Port(NetworkObject):
         :return: True if `label` is related to `self` with `hasLabel`.
         :rtype: bool
         """
-        if label.__class__ not in (
-                Label, ):
+        if not isinstance(label, (
+                Label, )):
             raise RelationHasLabelError()
 
         return label in \
@@ -684,10 +880,12 @@ class Port(NetworkObject):
         arg_tuple = (label, )
 
         for arg in arg_tuple:
-            if arg.__class__ not in (Label, ):
+            if not isinstance(arg, (Label, )):
                 raise RelationHasLabelError()
 
+        previous = self._has_label_labels
         self._has_label_labels = arg_tuple
+        self._notify_relation('hasLabel', arg_tuple, previous)
 
     def get_has_label(self):
         """
@@ -711,9 +909,9 @@ class Port(NetworkObject):
          `hasService`.
         :rtype: bool
         """
-        if adaptation_service.__class__ not in (
+        if not isinstance(adaptation_service, (
                 AdaptationService,
-                DeAdaptationService, ):
+                DeAdaptationService, )):
             raise RelationHasServiceError()
 
         return adaptation_service.identifier in \
@@ -726,13 +924,33 @@ class Port(NetworkObject):
         :param adaptation_service: Object to add to the `hasService` relation.
         :type adaptation_service: AdaptationService or DeAdaptationService
         """
-        if adaptation_service.__class__ not in (
+        if not isinstance(adaptation_service, (
                 AdaptationService,
-                DeAdaptationService, ):
+                DeAdaptationService, )):
             raise RelationHasServiceError()
 
-        self._has_service_adaptation_services[adaptation_service.identifier] = \
-            adaptation_service
+        collection = self._has_service_adaptation_services
+        previous = collection.get(adaptation_service.identifier, None)
+        collection[adaptation_service.identifier] = adaptation_service
+        self._notify_relation(
+            'hasService', (adaptation_service, ), (previous, )
+        )
+
+    def remove_has_service(self, adaptation_service):
+        """
+        Remove given `adaptation_service` from this object `hasService`
+        relations.
+
+        Does nothing if `adaptation_service` is not related to `self`.
+
+        :param adaptation_service: Object to remove from the `hasService`
+         relation.
+        :type adaptation_service: AdaptationService or DeAdaptationService
+        """
+        previous = self._has_service_adaptation_services.pop(
+            adaptation_service.identifier, None
+        )
+        self._notify_relation('hasService', (), (previous, ))
 
     def get_has_service(self):
         """
@@ -754,8 +972,8 @@ class Port(NetworkObject):
         :return: True if `link` is related to `self` with `isSink`.
         :rtype: bool
         """
-        if link.__class__ not in (
-                Link, ):
+        if not isinstance(link, (
+                Link, )):
             raise RelationIsSinkError()
 
         return link.identifier in \
@@ -768,12 +986,30 @@ class Port(NetworkObject):
         :param link: Object to add to the `isSink` relation.
         :type link: Link
         """
-        if link.__class__ not in (
-                Link, ):
+        if not isinstance(link, (
+                Link, )):
             raise RelationIsSinkError()
 
-        self._is_sink_links[link.identifier] = \
-            link
+        collection = self._is_sink_links
+        previous = collection.get(link.identifier, None)
+        collection[link.identifier] = link
+        self._notify_relation(
+            'isSink', (link, ), (previous, )
+        )
+
+    def remove_is_sink(self, link):
+        """
+        Remove given `link` from this object `isSink` relations.
+
+        Does nothing if `link` is not related to `self`.
+
+        :param link: Object to remove from the `isSink` relation.
+        :type link: Link
+        """
+        previous = self._is_sink_links.pop(
+            link.identifier, None
+        )
+        self._notify_relation('isSink', (), (previous, ))
 
     def get_is_sink(self):
         """
@@ -795,8 +1031,8 @@ class Port(NetworkObject):
         :return: True if `link` is related to `self` with `isSource`.
         :rtype: bool
         """
-        if link.__class__ not in (
-                Link, ):
+        if not isinstance(link, (
+                Link, )):
             raise RelationIsSourceError()
 
         return link.identifier in \
@@ -809,12 +1045,30 @@ class Port(NetworkObject):
         :param link: Object to add to the `isSource` relation.
         :type link: Link
         """
-        if link.__class__ not in (
-                Link, ):
+        if not isinstance(link, (
+                Link, )):
             raise RelationIsSourceError()
 
-        self._is_source_links[link.identifier] = \
-            link
+        collection = self._is_source_links
+        previous = collection.get(link.identifier, None)
+        collection[link.identifier] = link
+        self._notify_relation(
+            'isSource', (link, ), (previous, )
+        )
+
+    def remove_is_source(self, link):
+        """
+        Remove given `link` from this object `isSource` relations.
+
+        Does nothing if `link` is not related to `self`.
+
+        :param link: Object to remove from the `isSource` relation.
+        :type link: Link
+        """
+        previous = self._is_source_links.pop(
+            link.identifier, None
+        )
+        self._notify_relation('isSource', (), (previous, ))
 
     def get_is_source(self):
         """
@@ -874,6 +1128,7 @@ class Link(NetworkObject):
         if encoding is not unset and not is_valid_uri(encoding):
             raise AttributeEncodingError()
         self._encoding = encoding
+        self._notify_attribute('encoding', encoding)
 
     def has_label(self, label):
         """
@@ -886,8 +1141,8 @@ class Link(NetworkObject):
         :return: True if `label` is related to `self` with `hasLabel`.
         :rtype: bool
         """
-        if label.__class__ not in (
-                Label, ):
+        if not isinstance(label, (
+                Label, )):
             raise RelationHasLabelError()
 
         return label in \
@@ -903,10 +1158,12 @@ class Link(NetworkObject):
         arg_tuple = (label, )
 
         for arg in arg_tuple:
-            if arg.__class__ not in (Label, ):
+            if not isinstance(arg, (Label, )):
                 raise RelationHasLabelError()
 
+        previous = self._has_label_labels
         self._has_label_labels = arg_tuple
+        self._notify_relation('hasLabel', arg_tuple, previous)
 
     def get_has_label(self):
         """
@@ -988,6 +1245,7 @@ class SwitchingService(Service):
         if encoding is not unset and not is_valid_uri(encoding):
             raise AttributeEncodingError()
         self._encoding = encoding
+        self._notify_attribute('encoding', encoding)
 
     def has_inbound_port(self, port):
         """
@@ -1000,9 +1258,9 @@ class SwitchingService(Service):
         :return: True if `port` is related to `self` with `hasInboundPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasInboundPortError()
 
         return port.identifier in \
@@ -1015,13 +1273,31 @@ class SwitchingService(Service):
         :param port: Object to add to the `hasInboundPort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasInboundPortError()
 
-        self._has_inbound_port_ports[port.identifier] = \
-            port
+        collection = self._has_inbound_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'hasInboundPort', (port, ), (previous, )
+        )
+
+    def remove_has_inbound_port(self, port):
+        """
+        Remove given `port` from this object `hasInboundPort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `hasInboundPort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._has_inbound_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('hasInboundPort', (), (previous, ))
 
     def get_has_inbound_port(self):
         """
@@ -1044,9 +1320,9 @@ class SwitchingService(Service):
         :return: True if `port` is related to `self` with `hasOutboundPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasOutboundPortError()
 
         return port.identifier in \
@@ -1059,13 +1335,31 @@ class SwitchingService(Service):
         :param port: Object to add to the `hasOutboundPort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasOutboundPortError()
 
-        self._has_outbound_port_ports[port.identifier] = \
-            port
+        collection = self._has_outbound_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'hasOutboundPort', (port, ), (previous, )
+        )
+
+    def remove_has_outbound_port(self, port):
+        """
+        Remove given `port` from this object `hasOutboundPort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `hasOutboundPort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._has_outbound_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('hasOutboundPort', (), (previous, ))
 
     def get_has_outbound_port(self):
         """
@@ -1088,9 +1382,9 @@ class SwitchingService(Service):
         :return: True if `link` is related to `self` with `providesLink`.
         :rtype: bool
         """
-        if link.__class__ not in (
+        if not isinstance(link, (
                 Link,
-                LinkGroup, ):
+                LinkGroup, )):
             raise RelationProvidesLinkError()
 
         return link.identifier in \
@@ -1103,13 +1397,31 @@ class SwitchingService(Service):
         :param link: Object to add to the `providesLink` relation.
         :type link: Link or LinkGroup
         """
-        if link.__class__ not in (
+        if not isinstance(link, (
                 Link,
-                LinkGroup, ):
+                LinkGroup, )):
             raise RelationProvidesLinkError()
 
-        self._provides_link_links[link.identifier] = \
-            link
+        collection = self._provides_link_links
+        previous = collection.get(link.identifier, None)
+        collection[link.identifier] = link
+        self._notify_relation(
+            'providesLink', (link, ), (previous, )
+        )
+
+    def remove_provides_link(self, link):
+        """
+        Remove given `link` from this object `providesLink` relations.
+
+        Does nothing if `link` is not related to `self`.
+
+        :param link: Object to remove from the `providesLink` relation.
+        :type link: Link or LinkGroup
+        """
+        previous = self._provides_link_links.pop(
+            link.identifier, None
+        )
+        self._notify_relation('providesLink', (), (previous, ))
 
     def get_provides_link(self):
         """
@@ -1165,9 +1477,9 @@ class AdaptationService(Service):
         :return: True if `port` is related to `self` with `canProvidePort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationCanProvidePortError()
 
         return port.identifier in \
@@ -1180,13 +1492,31 @@ class AdaptationService(Service):
         :param port: Object to add to the `canProvidePort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationCanProvidePortError()
 
-        self._can_provide_port_ports[port.identifier] = \
-            port
+        collection = self._can_provide_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'canProvidePort', (port, ), (previous, )
+        )
+
+    def remove_can_provide_port(self, port):
+        """
+        Remove given `port` from this object `canProvidePort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `canProvidePort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._can_provide_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('canProvidePort', (), (previous, ))
 
     def get_can_provide_port(self):
         """
@@ -1209,8 +1539,8 @@ class AdaptationService(Service):
         :return: True if `lifetime` is related to `self` with `existsDuring`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
         return lifetime.identifier in \
@@ -1223,12 +1553,30 @@ class AdaptationService(Service):
         :param lifetime: Object to add to the `existsDuring` relation.
         :type lifetime: Lifetime
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
-        self._exists_during_lifetimes[lifetime.identifier] = \
-            lifetime
+        collection = self._exists_during_lifetimes
+        previous = collection.get(lifetime.identifier, None)
+        collection[lifetime.identifier] = lifetime
+        self._notify_relation(
+            'existsDuring', (lifetime, ), (previous, )
+        )
+
+    def remove_exists_during(self, lifetime):
+        """
+        Remove given `lifetime` from this object `existsDuring` relations.
+
+        Does nothing if `lifetime` is not related to `self`.
+
+        :param lifetime: Object to remove from the `existsDuring` relation.
+        :type lifetime: Lifetime
+        """
+        previous = self._exists_during_lifetimes.pop(
+            lifetime.identifier, None
+        )
+        self._notify_relation('existsDuring', (), (previous, ))
 
     def get_exists_during(self):
         """
@@ -1250,9 +1598,9 @@ class AdaptationService(Service):
         :return: True if `port` is related to `self` with `providesPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationProvidesPortError()
 
         return port.identifier in \
@@ -1265,13 +1613,31 @@ class AdaptationService(Service):
         :param port: Object to add to the `providesPort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationProvidesPortError()
 
-        self._provides_port_ports[port.identifier] = \
-            port
+        collection = self._provides_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'providesPort', (port, ), (previous, )
+        )
+
+    def remove_provides_port(self, port):
+        """
+        Remove given `port` from this object `providesPort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `providesPort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._provides_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('providesPort', (), (previous, ))
 
     def get_provides_port(self):
         """
@@ -1327,9 +1693,9 @@ class DeAdaptationService(Service):
         :return: True if `port` is related to `self` with `canProvidePort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationCanProvidePortError()
 
         return port.identifier in \
@@ -1342,13 +1708,31 @@ class DeAdaptationService(Service):
         :param port: Object to add to the `canProvidePort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationCanProvidePortError()
 
-        self._can_provide_port_ports[port.identifier] = \
-            port
+        collection = self._can_provide_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'canProvidePort', (port, ), (previous, )
+        )
+
+    def remove_can_provide_port(self, port):
+        """
+        Remove given `port` from this object `canProvidePort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `canProvidePort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._can_provide_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('canProvidePort', (), (previous, ))
 
     def get_can_provide_port(self):
         """
@@ -1371,8 +1755,8 @@ class DeAdaptationService(Service):
         :return: True if `lifetime` is related to `self` with `existsDuring`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
         return lifetime.identifier in \
@@ -1385,12 +1769,30 @@ class DeAdaptationService(Service):
         :param lifetime: Object to add to the `existsDuring` relation.
         :type lifetime: Lifetime
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
-        self._exists_during_lifetimes[lifetime.identifier] = \
-            lifetime
+        collection = self._exists_during_lifetimes
+        previous = collection.get(lifetime.identifier, None)
+        collection[lifetime.identifier] = lifetime
+        self._notify_relation(
+            'existsDuring', (lifetime, ), (previous, )
+        )
+
+    def remove_exists_during(self, lifetime):
+        """
+        Remove given `lifetime` from this object `existsDuring` relations.
+
+        Does nothing if `lifetime` is not related to `self`.
+
+        :param lifetime: Object to remove from the `existsDuring` relation.
+        :type lifetime: Lifetime
+        """
+        previous = self._exists_during_lifetimes.pop(
+            lifetime.identifier, None
+        )
+        self._notify_relation('existsDuring', (), (previous, ))
 
     def get_exists_during(self):
         """
@@ -1412,9 +1814,9 @@ class DeAdaptationService(Service):
         :return: True if `port` is related to `self` with `providesPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationProvidesPortError()
 
         return port.identifier in \
@@ -1427,13 +1829,31 @@ class DeAdaptationService(Service):
         :param port: Object to add to the `providesPort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationProvidesPortError()
 
-        self._provides_port_ports[port.identifier] = \
-            port
+        collection = self._provides_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'providesPort', (port, ), (previous, )
+        )
+
+    def remove_provides_port(self, port):
+        """
+        Remove given `port` from this object `providesPort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `providesPort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._provides_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('providesPort', (), (previous, ))
 
     def get_provides_port(self):
         """
@@ -1506,8 +1926,8 @@ class Topology(Group):
         :return: True if `lifetime` is related to `self` with `existsDuring`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
         return lifetime.identifier in \
@@ -1520,12 +1940,30 @@ class Topology(Group):
         :param lifetime: Object to add to the `existsDuring` relation.
         :type lifetime: Lifetime
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
-        self._exists_during_lifetimes[lifetime.identifier] = \
-            lifetime
+        collection = self._exists_during_lifetimes
+        previous = collection.get(lifetime.identifier, None)
+        collection[lifetime.identifier] = lifetime
+        self._notify_relation(
+            'existsDuring', (lifetime, ), (previous, )
+        )
+
+    def remove_exists_during(self, lifetime):
+        """
+        Remove given `lifetime` from this object `existsDuring` relations.
+
+        Does nothing if `lifetime` is not related to `self`.
+
+        :param lifetime: Object to remove from the `existsDuring` relation.
+        :type lifetime: Lifetime
+        """
+        previous = self._exists_during_lifetimes.pop(
+            lifetime.identifier, None
+        )
+        self._notify_relation('existsDuring', (), (previous, ))
 
     def get_exists_during(self):
         """
@@ -1547,8 +1985,8 @@ class Topology(Group):
         :return: True if `node` is related to `self` with `hasNode`.
         :rtype: bool
         """
-        if node.__class__ not in (
-                Node, ):
+        if not isinstance(node, (
+                Node, )):
             raise RelationHasNodeError()
 
         return node.identifier in \
@@ -1561,12 +1999,30 @@ class Topology(Group):
         :param node: Object to add to the `hasNode` relation.
         :type node: Node
         """
-        if node.__class__ not in (
-                Node, ):
+        if not isinstance(node, (
+                Node, )):
             raise RelationHasNodeError()
 
-        self._has_node_nodes[node.identifier] = \
-            node
+        collection = self._has_node_nodes
+        previous = collection.get(node.identifier, None)
+        collection[node.identifier] = node
+        self._notify_relation(
+            'hasNode', (node, ), (previous, )
+        )
+
+    def remove_has_node(self, node):
+        """
+        Remove given `node` from this object `hasNode` relations.
+
+        Does nothing if `node` is not related to `self`.
+
+        :param node: Object to remove from the `hasNode` relation.
+        :type node: Node
+        """
+        previous = self._has_node_nodes.pop(
+            node.identifier, None
+        )
+        self._notify_relation('hasNode', (), (previous, ))
 
     def get_has_node(self):
         """
@@ -1588,9 +2044,9 @@ class Topology(Group):
         :return: True if `port` is related to `self` with `hasInboundPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasInboundPortError()
 
         return port.identifier in \
@@ -1603,13 +2059,31 @@ class Topology(Group):
         :param port: Object to add to the `hasInboundPort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasInboundPortError()
 
-        self._has_inbound_port_ports[port.identifier] = \
-            port
+        collection = self._has_inbound_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'hasInboundPort', (port, ), (previous, )
+        )
+
+    def remove_has_inbound_port(self, port):
+        """
+        Remove given `port` from this object `hasInboundPort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `hasInboundPort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._has_inbound_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('hasInboundPort', (), (previous, ))
 
     def get_has_inbound_port(self):
         """
@@ -1632,9 +2106,9 @@ class Topology(Group):
         :return: True if `port` is related to `self` with `hasOutboundPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasOutboundPortError()
 
         return port.identifier in \
@@ -1647,13 +2121,31 @@ class Topology(Group):
         :param port: Object to add to the `hasOutboundPort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasOutboundPortError()
 
-        self._has_outbound_port_ports[port.identifier] = \
-            port
+        collection = self._has_outbound_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'hasOutboundPort', (port, ), (previous, )
+        )
+
+    def remove_has_outbound_port(self, port):
+        """
+        Remove given `port` from this object `hasOutboundPort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `hasOutboundPort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._has_outbound_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('hasOutboundPort', (), (previous, ))
 
     def get_has_outbound_port(self):
         """
@@ -1678,8 +2170,8 @@ class Topology(Group):
          `hasService`.
         :rtype: bool
         """
-        if switching_service.__class__ not in (
-                SwitchingService, ):
+        if not isinstance(switching_service, (
+                SwitchingService, )):
             raise RelationHasServiceError()
 
         return switching_service.identifier in \
@@ -1692,12 +2184,32 @@ class Topology(Group):
         :param switching_service: Object to add to the `hasService` relation.
         :type switching_service: SwitchingService
         """
-        if switching_service.__class__ not in (
-                SwitchingService, ):
+        if not isinstance(switching_service, (
+                SwitchingService, )):
             raise RelationHasServiceError()
 
-        self._has_service_switching_services[switching_service.identifier] = \
-            switching_service
+        collection = self._has_service_switching_services
+        previous = collection.get(switching_service.identifier, None)
+        collection[switching_service.identifier] = switching_service
+        self._notify_relation(
+            'hasService', (switching_service, ), (previous, )
+        )
+
+    def remove_has_service(self, switching_service):
+        """
+        Remove given `switching_service` from this object `hasService`
+        relations.
+
+        Does nothing if `switching_service` is not related to `self`.
+
+        :param switching_service: Object to remove from the `hasService`
+         relation.
+        :type switching_service: SwitchingService
+        """
+        previous = self._has_service_switching_services.pop(
+            switching_service.identifier, None
+        )
+        self._notify_relation('hasService', (), (previous, ))
 
     def get_has_service(self):
         """
@@ -1720,8 +2232,8 @@ class Topology(Group):
          `hasEnvironment`.
         :rtype: bool
         """
-        if environment.__class__ not in (
-                Environment, ):
+        if not isinstance(environment, (
+                Environment, )):
             raise RelationHasEnvironmentError()
 
         return environment.identifier in \
@@ -1734,12 +2246,31 @@ class Topology(Group):
         :param environment: Object to add to the `hasEnvironment` relation.
         :type environment: Environment
         """
-        if environment.__class__ not in (
-                Environment, ):
+        if not isinstance(environment, (
+                Environment, )):
             raise RelationHasEnvironmentError()
 
-        self._has_environment_environments[environment.identifier] = \
-            environment
+        collection = self._has_environment_environments
+        previous = collection.get(environment.identifier, None)
+        collection[environment.identifier] = environment
+        self._notify_relation(
+            'hasEnvironment', (environment, ), (previous, )
+        )
+
+    def remove_has_environment(self, environment):
+        """
+        Remove given `environment` from this object `hasEnvironment` relations.
+
+        Does nothing if `environment` is not related to `self`.
+
+        :param environment: Object to remove from the `hasEnvironment`
+         relation.
+        :type environment: Environment
+        """
+        previous = self._has_environment_environments.pop(
+            environment.identifier, None
+        )
+        self._notify_relation('hasEnvironment', (), (previous, ))
 
     def get_has_environment(self):
         """
@@ -1762,8 +2293,8 @@ class Topology(Group):
         :return: True if `topology` is related to `self` with `hasTopology`.
         :rtype: bool
         """
-        if topology.__class__ not in (
-                Topology, ):
+        if not isinstance(topology, (
+                Topology, )):
             raise RelationHasTopologyError()
 
         return topology.identifier in \
@@ -1776,12 +2307,30 @@ class Topology(Group):
         :param topology: Object to add to the `hasTopology` relation.
         :type topology: Topology
         """
-        if topology.__class__ not in (
-                Topology, ):
+        if not isinstance(topology, (
+                Topology, )):
             raise RelationHasTopologyError()
 
-        self._has_topology_topologies[topology.identifier] = \
-            topology
+        collection = self._has_topology_topologies
+        previous = collection.get(topology.identifier, None)
+        collection[topology.identifier] = topology
+        self._notify_relation(
+            'hasTopology', (topology, ), (previous, )
+        )
+
+    def remove_has_topology(self, topology):
+        """
+        Remove given `topology` from this object `hasTopology` relations.
+
+        Does nothing if `topology` is not related to `self`.
+
+        :param topology: Object to remove from the `hasTopology` relation.
+        :type topology: Topology
+        """
+        previous = self._has_topology_topologies.pop(
+            topology.identifier, None
+        )
+        self._notify_relation('hasTopology', (), (previous, ))
 
     def get_has_topology(self):
         """
@@ -1810,7 +2359,7 @@ class PortGroup(Group):
         self._exists_during_lifetimes = OrderedDict()
         self.relations['hasLabelGroup'] = \
             self.get_has_label_group
-        self._has_label_group_lifetimes = (None, )
+        self._has_label_group_label_groups = (None, )
         self.relations['hasPort'] = \
             self.get_has_port
         self._has_port_ports = OrderedDict()
@@ -1832,8 +2381,8 @@ class PortGroup(Group):
         :return: True if `lifetime` is related to `self` with `existsDuring`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
         return lifetime.identifier in \
@@ -1846,12 +2395,30 @@ class PortGroup(Group):
         :param lifetime: Object to add to the `existsDuring` relation.
         :type lifetime: Lifetime
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
-        self._exists_during_lifetimes[lifetime.identifier] = \
-            lifetime
+        collection = self._exists_during_lifetimes
+        previous = collection.get(lifetime.identifier, None)
+        collection[lifetime.identifier] = lifetime
+        self._notify_relation(
+            'existsDuring', (lifetime, ), (previous, )
+        )
+
+    def remove_exists_during(self, lifetime):
+        """
+        Remove given `lifetime` from this object `existsDuring` relations.
+
+        Does nothing if `lifetime` is not related to `self`.
+
+        :param lifetime: Object to remove from the `existsDuring` relation.
+        :type lifetime: Lifetime
+        """
+        previous = self._exists_during_lifetimes.pop(
+            lifetime.identifier, None
+        )
+        self._notify_relation('existsDuring', (), (previous, ))
 
     def get_exists_during(self):
         """
@@ -1862,38 +2429,41 @@ class PortGroup(Group):
         """
         return copy(self._exists_during_lifetimes)
 
-    def has_label_group(self, lifetime):
+    def has_label_group(self, label_group):
         """
-        Check `hasLabelGroup` relation with given `lifetime` object.
+        Check `hasLabelGroup` relation with given `label_group` object.
 
         FIXME: Document hasLabelGroup relation.
 
-        :param lifetime: Object to validate relation `hasLabelGroup` with.
-        :type lifetime: Lifetime
-        :return: True if `lifetime` is related to `self` with `hasLabelGroup`.
+        :param label_group: Object to validate relation `hasLabelGroup` with.
+        :type label_group: LabelGroup
+        :return: True if `label_group` is related to `self` with
+         `hasLabelGroup`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(label_group, (
+                LabelGroup, )):
             raise RelationHasLabelGroupError()
 
-        return lifetime in \
-            self._has_label_group_lifetimes
+        return label_group in \
+            self._has_label_group_label_groups
 
-    def set_has_label_group(self, lifetime):
+    def set_has_label_group(self, label_group):
         """
         Set the `hasLabelGroup` relation to given objects.
 
-        :param lifetime: Object to set to the `hasLabelGroup` relation.
-        :type lifetime: Lifetime
+        :param label_group: Object to set to the `hasLabelGroup` relation.
+        :type label_group: LabelGroup
         """
-        arg_tuple = (lifetime, )
+        arg_tuple = (label_group, )
 
         for arg in arg_tuple:
-            if arg.__class__ not in (Lifetime, ):
+            if not isinstance(arg, (LabelGroup, )):
                 raise RelationHasLabelGroupError()
 
-        self._has_label_group_lifetimes = arg_tuple
+        previous = self._has_label_group_label_groups
+        self._has_label_group_label_groups = arg_tuple
+        self._notify_relation('hasLabelGroup', arg_tuple, previous)
 
     def get_has_label_group(self):
         """
@@ -1902,7 +2472,7 @@ class PortGroup(Group):
         :rtype: set
         :return: A copy of the collection of objects related with this object.
         """
-        return copy(self._has_label_group_lifetimes)
+        return copy(self._has_label_group_label_groups)
 
     def has_port(self, port):
         """
@@ -1915,9 +2485,9 @@ class PortGroup(Group):
         :return: True if `port` is related to `self` with `hasPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasPortError()
 
         return port.identifier in \
@@ -1930,13 +2500,31 @@ class PortGroup(Group):
         :param port: Object to add to the `hasPort` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasPortError()
 
-        self._has_port_ports[port.identifier] = \
-            port
+        collection = self._has_port_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'hasPort', (port, ), (previous, )
+        )
+
+    def remove_has_port(self, port):
+        """
+        Remove given `port` from this object `hasPort` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `hasPort` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._has_port_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('hasPort', (), (previous, ))
 
     def get_has_port(self):
         """
@@ -1958,8 +2546,8 @@ class PortGroup(Group):
         :return: True if `link_group` is related to `self` with `isSink`.
         :rtype: bool
         """
-        if link_group.__class__ not in (
-                LinkGroup, ):
+        if not isinstance(link_group, (
+                LinkGroup, )):
             raise RelationIsSinkError()
 
         return link_group.identifier in \
@@ -1972,12 +2560,30 @@ class PortGroup(Group):
         :param link_group: Object to add to the `isSink` relation.
         :type link_group: LinkGroup
         """
-        if link_group.__class__ not in (
-                LinkGroup, ):
+        if not isinstance(link_group, (
+                LinkGroup, )):
             raise RelationIsSinkError()
 
-        self._is_sink_link_groups[link_group.identifier] = \
-            link_group
+        collection = self._is_sink_link_groups
+        previous = collection.get(link_group.identifier, None)
+        collection[link_group.identifier] = link_group
+        self._notify_relation(
+            'isSink', (link_group, ), (previous, )
+        )
+
+    def remove_is_sink(self, link_group):
+        """
+        Remove given `link_group` from this object `isSink` relations.
+
+        Does nothing if `link_group` is not related to `self`.
+
+        :param link_group: Object to remove from the `isSink` relation.
+        :type link_group: LinkGroup
+        """
+        previous = self._is_sink_link_groups.pop(
+            link_group.identifier, None
+        )
+        self._notify_relation('isSink', (), (previous, ))
 
     def get_is_sink(self):
         """
@@ -1999,8 +2605,8 @@ class PortGroup(Group):
         :return: True if `link_group` is related to `self` with `isSource`.
         :rtype: bool
         """
-        if link_group.__class__ not in (
-                LinkGroup, ):
+        if not isinstance(link_group, (
+                LinkGroup, )):
             raise RelationIsSourceError()
 
         return link_group.identifier in \
@@ -2013,12 +2619,30 @@ class PortGroup(Group):
         :param link_group: Object to add to the `isSource` relation.
         :type link_group: LinkGroup
         """
-        if link_group.__class__ not in (
-                LinkGroup, ):
+        if not isinstance(link_group, (
+                LinkGroup, )):
             raise RelationIsSourceError()
 
-        self._is_source_link_groups[link_group.identifier] = \
-            link_group
+        collection = self._is_source_link_groups
+        previous = collection.get(link_group.identifier, None)
+        collection[link_group.identifier] = link_group
+        self._notify_relation(
+            'isSource', (link_group, ), (previous, )
+        )
+
+    def remove_is_source(self, link_group):
+        """
+        Remove given `link_group` from this object `isSource` relations.
+
+        Does nothing if `link_group` is not related to `self`.
+
+        :param link_group: Object to remove from the `isSource` relation.
+        :type link_group: LinkGroup
+        """
+        previous = self._is_source_link_groups.pop(
+            link_group.identifier, None
+        )
+        self._notify_relation('isSource', (), (previous, ))
 
     def get_is_source(self):
         """
@@ -2047,13 +2671,13 @@ class LinkGroup(Group):
         self._exists_during_lifetimes = OrderedDict()
         self.relations['hasLabelGroup'] = \
             self.get_has_label_group
-        self._has_label_group_lifetimes = (None, )
+        self._has_label_group_label_groups = (None, )
         self.relations['hasLink'] = \
             self.get_has_link
         self._has_link_ports = OrderedDict()
         self.relations['isSerialCompoundLink'] = \
             self.get_is_serial_compound_link
-        self._is_serial_compound_link_ports = OrderedDict()
+        self._is_serial_compound_link_ordered_lists = OrderedDict()
 
     def exists_during(self, lifetime):
         """
@@ -2066,8 +2690,8 @@ class LinkGroup(Group):
         :return: True if `lifetime` is related to `self` with `existsDuring`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
         return lifetime.identifier in \
@@ -2080,12 +2704,30 @@ class LinkGroup(Group):
         :param lifetime: Object to add to the `existsDuring` relation.
         :type lifetime: Lifetime
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
-        self._exists_during_lifetimes[lifetime.identifier] = \
-            lifetime
+        collection = self._exists_during_lifetimes
+        previous = collection.get(lifetime.identifier, None)
+        collection[lifetime.identifier] = lifetime
+        self._notify_relation(
+            'existsDuring', (lifetime, ), (previous, )
+        )
+
+    def remove_exists_during(self, lifetime):
+        """
+        Remove given `lifetime` from this object `existsDuring` relations.
+
+        Does nothing if `lifetime` is not related to `self`.
+
+        :param lifetime: Object to remove from the `existsDuring` relation.
+        :type lifetime: Lifetime
+        """
+        previous = self._exists_during_lifetimes.pop(
+            lifetime.identifier, None
+        )
+        self._notify_relation('existsDuring', (), (previous, ))
 
     def get_exists_during(self):
         """
@@ -2096,38 +2738,41 @@ class LinkGroup(Group):
         """
         return copy(self._exists_during_lifetimes)
 
-    def has_label_group(self, lifetime):
+    def has_label_group(self, label_group):
         """
-        Check `hasLabelGroup` relation with given `lifetime` object.
+        Check `hasLabelGroup` relation with given `label_group` object.
 
         FIXME: Document hasLabelGroup relation.
 
-        :param lifetime: Object to validate relation `hasLabelGroup` with.
-        :type lifetime: Lifetime
-        :return: True if `lifetime` is related to `self` with `hasLabelGroup`.
+        :param label_group: Object to validate relation `hasLabelGroup` with.
+        :type label_group: LabelGroup
+        :return: True if `label_group` is related to `self` with
+         `hasLabelGroup`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(label_group, (
+                LabelGroup, )):
             raise RelationHasLabelGroupError()
 
-        return lifetime in \
-            self._has_label_group_lifetimes
+        return label_group in \
+            self._has_label_group_label_groups
 
-    def set_has_label_group(self, lifetime):
+    def set_has_label_group(self, label_group):
         """
         Set the `hasLabelGroup` relation to given objects.
 
-        :param lifetime: Object to set to the `hasLabelGroup` relation.
-        :type lifetime: Lifetime
+        :param label_group: Object to set to the `hasLabelGroup` relation.
+        :type label_group: LabelGroup
         """
-        arg_tuple = (lifetime, )
+        arg_tuple = (label_group, )
 
         for arg in arg_tuple:
-            if arg.__class__ not in (Lifetime, ):
+            if not isinstance(arg, (LabelGroup, )):
                 raise RelationHasLabelGroupError()
 
-        self._has_label_group_lifetimes = arg_tuple
+        previous = self._has_label_group_label_groups
+        self._has_label_group_label_groups = arg_tuple
+        self._notify_relation('hasLabelGroup', arg_tuple, previous)
 
     def get_has_label_group(self):
         """
@@ -2136,7 +2781,7 @@ class LinkGroup(Group):
         :rtype: set
         :return: A copy of the collection of objects related with this object.
         """
-        return copy(self._has_label_group_lifetimes)
+        return copy(self._has_label_group_label_groups)
 
     def has_link(self, port):
         """
@@ -2149,9 +2794,9 @@ class LinkGroup(Group):
         :return: True if `port` is related to `self` with `hasLink`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasLinkError()
 
         return port.identifier in \
@@ -2164,13 +2809,31 @@ class LinkGroup(Group):
         :param port: Object to add to the `hasLink` relation.
         :type port: Port or PortGroup
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasLinkError()
 
-        self._has_link_ports[port.identifier] = \
-            port
+        collection = self._has_link_ports
+        previous = collection.get(port.identifier, None)
+        collection[port.identifier] = port
+        self._notify_relation(
+            'hasLink', (port, ), (previous, )
+        )
+
+    def remove_has_link(self, port):
+        """
+        Remove given `port` from this object `hasLink` relations.
+
+        Does nothing if `port` is not related to `self`.
+
+        :param port: Object to remove from the `hasLink` relation.
+        :type port: Port or PortGroup
+        """
+        previous = self._has_link_ports.pop(
+            port.identifier, None
+        )
+        self._notify_relation('hasLink', (), (previous, ))
 
     def get_has_link(self):
         """
@@ -2181,40 +2844,61 @@ class LinkGroup(Group):
         """
         return copy(self._has_link_ports)
 
-    def is_serial_compound_link(self, port):
+    def is_serial_compound_link(self, ordered_list):
         """
-        Check `isSerialCompoundLink` relation with given `port` object.
+        Check `isSerialCompoundLink` relation with given `ordered_list` object.
 
         FIXME: Document isSerialCompoundLink relation.
 
-        :param port: Object to validate relation `isSerialCompoundLink` with.
-        :type port: Port or PortGroup
-        :return: True if `port` is related to `self` with
+        :param ordered_list: Object to validate relation `isSerialCompoundLink`
+         with.
+        :type ordered_list: OrderedList
+        :return: True if `ordered_list` is related to `self` with
          `isSerialCompoundLink`.
         :rtype: bool
         """
-        if port.__class__ not in (
-                Port,
-                PortGroup, ):
+        if not isinstance(ordered_list, (
+                OrderedList, )):
             raise RelationIsSerialCompoundLinkError()
 
-        return port.identifier in \
-            self._is_serial_compound_link_ports
+        return ordered_list.identifier in \
+            self._is_serial_compound_link_ordered_lists
 
-    def add_is_serial_compound_link(self, port):
+    def add_is_serial_compound_link(self, ordered_list):
         """
-        Add given `port` to this object `isSerialCompoundLink` relations.
+        Add given `ordered_list` to this object `isSerialCompoundLink`
+        relations.
 
-        :param port: Object to add to the `isSerialCompoundLink` relation.
-        :type port: Port or PortGroup
+        :param ordered_list: Object to add to the `isSerialCompoundLink`
+         relation.
+        :type ordered_list: OrderedList
         """
-        if port.__class__ not in (
-                Port,
-                PortGroup, ):
+        if not isinstance(ordered_list, (
+                OrderedList, )):
             raise RelationIsSerialCompoundLinkError()
 
-        self._is_serial_compound_link_ports[port.identifier] = \
-            port
+        collection = self._is_serial_compound_link_ordered_lists
+        previous = collection.get(ordered_list.identifier, None)
+        collection[ordered_list.identifier] = ordered_list
+        self._notify_relation(
+            'isSerialCompoundLink', (ordered_list, ), (previous, )
+        )
+
+    def remove_is_serial_compound_link(self, ordered_list):
+        """
+        Remove given `ordered_list` from this object `isSerialCompoundLink`
+        relations.
+
+        Does nothing if `ordered_list` is not related to `self`.
+
+        :param ordered_list: Object to remove from the `isSerialCompoundLink`
+         relation.
+        :type ordered_list: OrderedList
+        """
+        previous = self._is_serial_compound_link_ordered_lists.pop(
+            ordered_list.identifier, None
+        )
+        self._notify_relation('isSerialCompoundLink', (), (previous, ))
 
     def get_is_serial_compound_link(self):
         """
@@ -2224,7 +2908,7 @@ class LinkGroup(Group):
         :rtype: :py:class:`OrderedDict`
         :return: A copy of the collection of objects related with this object.
         """
-        return copy(self._is_serial_compound_link_ports)
+        return copy(self._is_serial_compound_link_ordered_lists)
 
 
 class BidirectionalPort(Group):
@@ -2259,8 +2943,8 @@ class BidirectionalPort(Group):
         :return: True if `lifetime` is related to `self` with `existsDuring`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
         return lifetime.identifier in \
@@ -2273,12 +2957,30 @@ class BidirectionalPort(Group):
         :param lifetime: Object to add to the `existsDuring` relation.
         :type lifetime: Lifetime
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
-        self._exists_during_lifetimes[lifetime.identifier] = \
-            lifetime
+        collection = self._exists_during_lifetimes
+        previous = collection.get(lifetime.identifier, None)
+        collection[lifetime.identifier] = lifetime
+        self._notify_relation(
+            'existsDuring', (lifetime, ), (previous, )
+        )
+
+    def remove_exists_during(self, lifetime):
+        """
+        Remove given `lifetime` from this object `existsDuring` relations.
+
+        Does nothing if `lifetime` is not related to `self`.
+
+        :param lifetime: Object to remove from the `existsDuring` relation.
+        :type lifetime: Lifetime
+        """
+        previous = self._exists_during_lifetimes.pop(
+            lifetime.identifier, None
+        )
+        self._notify_relation('existsDuring', (), (previous, ))
 
     def get_exists_during(self):
         """
@@ -2300,9 +3002,9 @@ class BidirectionalPort(Group):
         :return: True if `port` is related to `self` with `hasPort`.
         :rtype: bool
         """
-        if port.__class__ not in (
+        if not isinstance(port, (
                 Port,
-                PortGroup, ):
+                PortGroup, )):
             raise RelationHasPortError()
 
         return port in \
@@ -2320,12 +3022,14 @@ class BidirectionalPort(Group):
         arg_tuple = (port1, port2, )
 
         for arg in arg_tuple:
-            if arg.__class__ not in (Port, PortGroup, ):
+            if not isinstance(arg, (Port, PortGroup, )):
                 raise RelationHasPortError()
         if len(set(arg_tuple)) != len(arg_tuple):
             raise Exception('Non unique objects')  # FIXME
 
+        previous = self._has_port_ports
         self._has_port_ports = arg_tuple
+        self._notify_relation('hasPort', arg_tuple, previous)
 
     def get_has_port(self):
         """
@@ -2369,8 +3073,8 @@ class BidirectionalLink(Group):
         :return: True if `lifetime` is related to `self` with `existsDuring`.
         :rtype: bool
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
         return lifetime.identifier in \
@@ -2383,12 +3087,30 @@ class BidirectionalLink(Group):
         :param lifetime: Object to add to the `existsDuring` relation.
         :type lifetime: Lifetime
         """
-        if lifetime.__class__ not in (
-                Lifetime, ):
+        if not isinstance(lifetime, (
+                Lifetime, )):
             raise RelationExistsDuringError()
 
-        self._exists_during_lifetimes[lifetime.identifier] = \
-            lifetime
+        collection = self._exists_during_lifetimes
+        previous = collection.get(lifetime.identifier, None)
+        collection[lifetime.identifier] = lifetime
+        self._notify_relation(
+            'existsDuring', (lifetime, ), (previous, )
+        )
+
+    def remove_exists_during(self, lifetime):
+        """
+        Remove given `lifetime` from this object `existsDuring` relations.
+
+        Does nothing if `lifetime` is not related to `self`.
+
+        :param lifetime: Object to remove from the `existsDuring` relation.
+        :type lifetime: Lifetime
+        """
+        previous = self._exists_during_lifetimes.pop(
+            lifetime.identifier, None
+        )
+        self._notify_relation('existsDuring', (), (previous, ))
 
     def get_exists_during(self):
         """
@@ -2410,9 +3132,9 @@ class BidirectionalLink(Group):
         :return: True if `link` is related to `self` with `hasLink`.
         :rtype: bool
         """
-        if link.__class__ not in (
+        if not isinstance(link, (
                 Link,
-                LinkGroup, ):
+                LinkGroup, )):
             raise RelationHasLinkError()
 
         return link in \
@@ -2430,12 +3152,14 @@ class BidirectionalLink(Group):
         arg_tuple = (link1, link2, )
 
         for arg in arg_tuple:
-            if arg.__class__ not in (Link, LinkGroup, ):
+            if not isinstance(arg, (Link, LinkGroup, )):
                 raise RelationHasLinkError()
         if len(set(arg_tuple)) != len(arg_tuple):
             raise Exception('Non unique objects')  # FIXME
 
+        previous = self._has_link_links
         self._has_link_links = arg_tuple
+        self._notify_relation('hasLink', arg_tuple, previous)
 
     def get_has_link(self):
         """
@@ -2539,6 +3263,7 @@ class Location(NMLObject):
         if name is not unset and not name:
             raise AttributeNameError()
         self._name = name
+        self._notify_attribute('name', name)
 
     @property
     def identifier(self):
@@ -2560,6 +3285,7 @@ class Location(NMLObject):
         if identifier is not unset and not is_valid_uri(identifier):
             raise AttributeIdError()
         self._identifier = identifier
+        self._notify_attribute('identifier', identifier)
 
     @property
     def longitude(self):
@@ -2579,6 +3305,7 @@ class Location(NMLObject):
         :param str longitude: Longitude in WGS84 and in decimal degrees.
         """
         self._longitude = longitude
+        self._notify_attribute('longitude', longitude)
 
     @property
     def latitude(self):
@@ -2598,6 +3325,7 @@ class Location(NMLObject):
         :param str latitude: Latitude in WGS84 and in decimal degrees.
         """
         self._latitude = latitude
+        self._notify_attribute('latitude', latitude)
 
     @property
     def altitude(self):
@@ -2617,6 +3345,7 @@ class Location(NMLObject):
         :param str altitude: Altitude in WGS84 and in decimal meters.
         """
         self._altitude = altitude
+        self._notify_attribute('altitude', altitude)
 
     @property
     def unlocode(self):
@@ -2636,6 +3365,7 @@ class Location(NMLObject):
         :param str unlocode: UN/LOCODE location identifier.
         """
         self._unlocode = unlocode
+        self._notify_attribute('unlocode', unlocode)
 
     @property
     def address(self):
@@ -2655,6 +3385,7 @@ class Location(NMLObject):
         :param str address: A vCard ADR property.
         """
         self._address = address
+        self._notify_attribute('address', address)
 
 
 class Lifetime(NMLObject):
@@ -2664,6 +3395,7 @@ class Lifetime(NMLObject):
     An object can have multiple Lifetimes, if so, it will be active in a time
     interval equivalent to the union of all its Lifetimes time intervals.
 
+    :param str identifier: Persistent globally unique URI.
     :param str start: Date and time formatted as ISO 8601 calendar date compact
      representation with UTC timezone (YYYYMMDDThhmmssZ).
     :param str end: Date and time formatted as ISO 8601 calendar date compact
@@ -2671,11 +3403,16 @@ class Lifetime(NMLObject):
     """
 
     def __init__(
-            self, start=None, end=None, **kwargs):
+            self, identifier=None, start=None, end=None, **kwargs):
         super(Lifetime, self).__init__(**kwargs)
 
         # Attributes
 
+        self.attributes.append('identifier')
+        if identifier is None:
+            identifier = str(id(self))
+        self.identifier = identifier
+
         self.attributes.append('start')
         if start is None:
             start = datetime.now().replace(microsecond=0).isoformat()
@@ -2686,6 +3423,28 @@ class Lifetime(NMLObject):
             end = datetime.now().replace(microsecond=0).isoformat()
         self.end = end
 
+    @property
+    def identifier(self):
+        """
+        Get attribute identifier.
+
+        :return: Persistent globally unique URI.
+        :rtype: str
+        """
+        return self._identifier
+
+    @identifier.setter
+    def identifier(self, identifier):
+        """
+        Set attribute identifier.
+
+        :param str identifier: Persistent globally unique URI.
+        """
+        if identifier is not unset and not is_valid_uri(identifier):
+            raise AttributeIdError()
+        self._identifier = identifier
+        self._notify_attribute('identifier', identifier)
+
     @property
     def start(self):
         """
@@ -2706,6 +3465,7 @@ class Lifetime(NMLObject):
          compact representation with UTC timezone (YYYYMMDDThhmmssZ).
         """
         self._start = start
+        self._notify_attribute('start', start)
 
     @property
     def end(self):
@@ -2727,6 +3487,7 @@ class Lifetime(NMLObject):
          compact representation with UTC timezone (YYYYMMDDThhmmssZ).
         """
         self._end = end
+        self._notify_attribute('end', end)
 
 
 class Label(NMLObject):
@@ -2736,22 +3497,94 @@ class Label(NMLObject):
     A Label is technology-specific, so a Label used to identify a VLAN would be
     different from a Label used to identify a wavelength.
 
-    :param None labeltype: A technology-specific labelset.
-    :param None value: A specific value taken from a labelset.
+    :param str identifier: Persistent globally unique URI.
+    :param str labeltype: A technology-specific labelset.
+    :param str value: A specific value taken from a labelset.
     """
 
     def __init__(
-            self, labeltype=None, value=None, **kwargs):
+            self, identifier=None, labeltype=None, value=None, **kwargs):
         super(Label, self).__init__(**kwargs)
 
         # Attributes
 
+        self.attributes.append('identifier')
+        if identifier is None:
+            identifier = str(id(self))
+        self.identifier = identifier
+
         self.attributes.append('labeltype')
+        if labeltype is None:
+            labeltype = unset
         self.labeltype = labeltype
 
         self.attributes.append('value')
+        if value is None:
+            value = unset
         self.value = value
 
+    @property
+    def identifier(self):
+        """
+        Get attribute identifier.
+
+        :return: Persistent globally unique URI.
+        :rtype: str
+        """
+        return self._identifier
+
+    @identifier.setter
+    def identifier(self, identifier):
+        """
+        Set attribute identifier.
+
+        :param str identifier: Persistent globally unique URI.
+        """
+        if identifier is not unset and not is_valid_uri(identifier):
+            raise AttributeIdError()
+        self._identifier = identifier
+        self._notify_attribute('identifier', identifier)
+
+    @property
+    def labeltype(self):
+        """
+        Get attribute labeltype.
+
+        :return: A technology-specific labelset.
+        :rtype: str
+        """
+        return self._labeltype
+
+    @labeltype.setter
+    def labeltype(self, labeltype):
+        """
+        Set attribute labeltype.
+
+        :param str labeltype: A technology-specific labelset.
+        """
+        self._labeltype = labeltype
+        self._notify_attribute('labeltype', labeltype)
+
+    @property
+    def value(self):
+        """
+        Get attribute value.
+
+        :return: A specific value taken from a labelset.
+        :rtype: str
+        """
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        """
+        Set attribute value.
+
+        :param str value: A specific value taken from a labelset.
+        """
+        self._value = value
+        self._notify_attribute('value', value)
+
 
 class LabelGroup(NMLObject):
     """
@@ -2759,35 +3592,141 @@ class LabelGroup(NMLObject):
 
     FIXME: Document LabelGroup.
 
-    :param None labeltype: A technology-specific labelset.
-    :param None value: A specific value taken from a labelset.
+    :param str identifier: Persistent globally unique URI.
+    :param str labeltype: A technology-specific labelset.
+    :param str value: The values taken from a labelset, as a LabelSet or in its
+     range syntax.
     """
 
     def __init__(
-            self, labeltype=None, value=None, **kwargs):
+            self, identifier=None, labeltype=None, value=None, **kwargs):
         super(LabelGroup, self).__init__(**kwargs)
 
         # Attributes
 
+        self.attributes.append('identifier')
+        if identifier is None:
+            identifier = str(id(self))
+        self.identifier = identifier
+
         self.attributes.append('labeltype')
+        if labeltype is None:
+            labeltype = unset
         self.labeltype = labeltype
 
         self.attributes.append('value')
+        if value is None:
+            value = unset
         self.value = value
 
+    @property
+    def identifier(self):
+        """
+        Get attribute identifier.
+
+        :return: Persistent globally unique URI.
+        :rtype: str
+        """
+        return self._identifier
 
-class OrderedList(NMLObject):
+    @identifier.setter
+    def identifier(self, identifier):
+        """
+        Set attribute identifier.
+
+        :param str identifier: Persistent globally unique URI.
+        """
+        if identifier is not unset and not is_valid_uri(identifier):
+            raise AttributeIdError()
+        self._identifier = identifier
+        self._notify_attribute('identifier', identifier)
+
+    @property
+    def labeltype(self):
+        """
+        Get attribute labeltype.
+
+        :return: A technology-specific labelset.
+        :rtype: str
+        """
+        return self._labeltype
+
+    @labeltype.setter
+    def labeltype(self, labeltype):
+        """
+        Set attribute labeltype.
+
+        :param str labeltype: A technology-specific labelset.
+        """
+        self._labeltype = labeltype
+        self._notify_attribute('labeltype', labeltype)
+
+    @property
+    def value(self):
+        """
+        Get attribute value.
+
+        :return: The values taken from a labelset, as a LabelSet or in its
+         range syntax.
+        :rtype: str
+        """
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        """
+        Set attribute value.
+
+        :param str value: The values taken from a labelset, as a LabelSet or in
+         its range syntax.
+        """
+        self._value = value
+        self._notify_attribute('value', value)
+
+
+class OrderedList(OrderedListMixin, NMLObject):
     """
     An ordered list of Network Objects.
 
     Instances of this class are used to describe a path in the network along
     with the isSerialCompoundLink relation.
+
+    :param str identifier: Persistent globally unique URI.
     """
 
     def __init__(
-            self, **kwargs):
+            self, identifier=None, **kwargs):
         super(OrderedList, self).__init__(**kwargs)
 
+        # Attributes
+
+        self.attributes.append('identifier')
+        if identifier is None:
+            identifier = str(id(self))
+        self.identifier = identifier
+
+    @property
+    def identifier(self):
+        """
+        Get attribute identifier.
+
+        :return: Persistent globally unique URI.
+        :rtype: str
+        """
+        return self._identifier
+
+    @identifier.setter
+    def identifier(self, identifier):
+        """
+        Set attribute identifier.
+
+        :param str identifier: Persistent globally unique URI.
+        """
+        if identifier is not unset and not is_valid_uri(identifier):
+            raise AttributeIdError()
+        self._identifier = identifier
+        self._notify_attribute('identifier', identifier)
+
 
 class ListItem(NMLObject):
     """
@@ -2801,6 +3740,98 @@ class ListItem(NMLObject):
         super(ListItem, self).__init__(**kwargs)
 
 
+RELATIONS = OrderedDict([
+    (NetworkObject, OrderedDict([
+        ('existsDuring', ('+', (Lifetime, ))),
+        ('isAlias', ('+', (NetworkObject, ))),
+        ('locatedAt', ('1', (Location, ))),
+    ])),
+    (Node, OrderedDict([
+        ('hasInboundPort', ('+', (Port, PortGroup, ))),
+        ('hasOutboundPort', ('+', (Port, PortGroup, ))),
+        ('hasService', ('+', (SwitchingService, ))),
+        ('implementedBy', ('+', (Node, ))),
+    ])),
+    (Port, OrderedDict([
+        ('hasLabel', ('1', (Label, ))),
+        ('hasService', ('+', (AdaptationService, DeAdaptationService, ))),
+        ('isSink', ('+', (Link, ))),
+        ('isSource', ('+', (Link, ))),
+    ])),
+    (Link, OrderedDict([
+        ('hasLabel', ('1', (Label, ))),
+    ])),
+    (Service, OrderedDict([
+    ])),
+    (SwitchingService, OrderedDict([
+        ('hasInboundPort', ('+', (Port, PortGroup, ))),
+        ('hasOutboundPort', ('+', (Port, PortGroup, ))),
+        ('providesLink', ('+', (Link, LinkGroup, ))),
+    ])),
+    (AdaptationService, OrderedDict([
+        ('canProvidePort', ('+', (Port, PortGroup, ))),
+        ('existsDuring', ('+', (Lifetime, ))),
+        ('providesPort', ('+', (Port, PortGroup, ))),
+    ])),
+    (DeAdaptationService, OrderedDict([
+        ('canProvidePort', ('+', (Port, PortGroup, ))),
+        ('existsDuring', ('+', (Lifetime, ))),
+        ('providesPort', ('+', (Port, PortGroup, ))),
+    ])),
+    (Group, OrderedDict([
+    ])),
+    (Topology, OrderedDict([
+        ('existsDuring', ('+', (Lifetime, ))),
+        ('hasNode', ('+', (Node, ))),
+        ('hasInboundPort', ('+', (Port, PortGroup, ))),
+        ('hasOutboundPort', ('+', (Port, PortGroup, ))),
+        ('hasService', ('+', (SwitchingService, ))),
+        ('hasEnvironment', ('+', (Environment, ))),
+        ('hasTopology', ('+', (Topology, ))),
+    ])),
+    (PortGroup, OrderedDict([
+        ('existsDuring', ('+', (Lifetime, ))),
+        ('hasLabelGroup', ('1', (LabelGroup, ))),
+        ('hasPort', ('+', (Port, PortGroup, ))),
+        ('isSink', ('+', (LinkGroup, ))),
+        ('isSource', ('+', (LinkGroup, ))),
+    ])),
+    (LinkGroup, OrderedDict([
+        ('existsDuring', ('+', (Lifetime, ))),
+        ('hasLabelGroup', ('1', (LabelGroup, ))),
+        ('hasLink', ('+', (Port, PortGroup, ))),
+        ('isSerialCompoundLink', ('+', (OrderedList, ))),
+    ])),
+    (BidirectionalPort, OrderedDict([
+        ('existsDuring', ('+', (Lifetime, ))),
+        ('hasPort', ('2', (Port, PortGroup, ))),
+    ])),
+    (BidirectionalLink, OrderedDict([
+        ('existsDuring', ('+', (Lifetime, ))),
+        ('hasLink', ('2', (Link, LinkGroup, ))),
+    ])),
+    (Environment, OrderedDict([
+    ])),
+    (Location, OrderedDict([
+    ])),
+    (Lifetime, OrderedDict([
+    ])),
+    (Label, OrderedDict([
+    ])),
+    (LabelGroup, OrderedDict([
+    ])),
+    (OrderedList, OrderedDict([
+    ])),
+    (ListItem, OrderedDict([
+    ])),
+])
+"""
+Relations declared by each class, as a mapping of the relation name to a tuple
+(cardinality, related types), where the cardinality is ``'+'`` for any number
+of objects, or the exact number of objects.
+"""
+
+
 __all__ = [
     'NetworkObject',
     'Node',
@@ -2822,5 +3853,6 @@ __all__ = [
     'Label',
     'LabelGroup',
     'OrderedList',
-    'ListItem'
+    'ListItem',
+    'RELATIONS'
 ]
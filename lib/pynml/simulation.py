@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Failure scenario simulation over frozen topologies.
+
+Scenarios are evaluated over a :class:`FrozenTopology`, a compact read only
+copy of the adjacency of a :class:`pynml.graph.Graph`, so they never modify
+the manager. When a process pool is used the adjacency is placed in shared
+memory and attached by every worker, instead of being copied per scenario.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+from math import sqrt, erf
+from array import array
+from collections import namedtuple
+from multiprocessing import Pool
+
+from .graph import numpy, require_numpy
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+PARALLEL_THRESHOLD = 1024
+"""
+Number of scenarios from which :func:`simulate` uses a pool of processes by
+default. Below it, starting the pool costs more than evaluating them.
+"""
+
+
+ScenarioResult = namedtuple(
+    'ScenarioResult',
+    ['failed', 'components', 'largest', 'reachable_pairs']
+)
+"""
+Summary of the topology after a failure scenario.
+
+``failed`` is the tuple of identifiers of the failed elements, ``components``
+the number of connected components of the surviving nodes, ``largest`` the
+number of nodes of the largest component and ``reachable_pairs`` the number of
+unordered pairs of surviving nodes that can still reach each other.
+"""
+
+
+Availability = namedtuple(
+    'Availability', ['estimate', 'lower', 'upper', 'samples']
+)
+"""
+Monte Carlo estimate of the availability of a connection.
+
+``estimate`` is the fraction of samples in which the connection was up and
+``lower`` and ``upper`` the bounds of its Wilson score confidence interval.
+"""
+
+
+class FrozenTopology(object):
+    """
+    Read only adjacency of a graph in Compressed Sparse Row format.
+
+    The neighbors of vertex ``v`` are ``neighbors[indptr[v]:indptr[v + 1]]``
+    and the edges used to reach them
+    ``edges[indptr[v]:indptr[v + 1]]``. All columns are ``array('i')`` or
+    ``memoryview`` of C integers.
+
+    :param indptr: Offsets of each vertex in the other columns.
+    :param neighbors: Neighbor vertex ordinals.
+    :param edges: Edge ordinals.
+    :param int num_edges: Number of edges.
+    """
+
+    def __init__(self, indptr, neighbors, edges, num_edges):
+        self.indptr = indptr
+        self.neighbors = neighbors
+        self.edges = edges
+        self.num_edges = num_edges
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Freeze the adjacency of a graph.
+
+        :param graph: Graph to freeze.
+        :type graph: :class:`pynml.graph.Graph`
+        :rtype: :class:`FrozenTopology`
+        """
+        indptr = array(str('i'), [0])
+        neighbors = array(str('i'))
+        edges = array(str('i'))
+        for adjacency in graph.adjacency:
+            for neighbor, edge in adjacency:
+                neighbors.append(neighbor)
+                edges.append(edge)
+            indptr.append(len(neighbors))
+        return cls(indptr, neighbors, edges, len(graph.edges))
+
+    def _header(self):
+        return array(
+            str('i'), [len(self), len(self.neighbors), self.num_edges]
+        )
+
+    def share(self):
+        """
+        Copy this topology into a new shared memory block.
+
+        The caller owns the block and must close and unlink it.
+
+        :return: The :py:class:`multiprocessing.shared_memory.SharedMemory`.
+        """
+        columns = [self._header(), self.indptr, self.neighbors, self.edges]
+        blob = b''.join(bytes(memoryview(column)) for column in columns)
+        block = shared_memory.SharedMemory(create=True, size=len(blob))
+        block.buf[:len(blob)] = blob
+        return block
+
+    @classmethod
+    def attach(cls, buf):
+        """
+        Build a topology over the buffer of a block created by :meth:`share`.
+
+        :param buf: Buffer of the shared memory block.
+        :rtype: :class:`FrozenTopology`
+        """
+        view = memoryview(buf).cast(str('i'))
+        size, num_neighbors, num_edges = view[0], view[1], view[2]
+        start = 3
+        indptr = view[start:start + size + 1]
+        start += size + 1
+        neighbors = view[start:start + num_neighbors]
+        start += num_neighbors
+        edges = view[start:start + num_neighbors]
+        return cls(indptr, neighbors, edges, num_edges)
+
+    def evaluate(self, failed_vertices=(), failed_edges=()):
+        """
+        Compute the connectivity of the topology without some elements.
+
+        :param failed_vertices: Collection of ordinals of failed vertices.
+        :param failed_edges: Collection of ordinals of failed edges.
+        :return: A tuple (components, largest, reachable pairs). See
+         :class:`ScenarioResult`.
+        """
+        indptr = self.indptr
+        neighbors = self.neighbors
+        edges = self.edges
+
+        visited = bytearray(len(self))
+        for vertex in failed_vertices:
+            visited[vertex] = 1
+
+        components = 0
+        largest = 0
+        pairs = 0
+        for root in range(len(self)):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            components += 1
+
+            size = 0
+            stack = [root]
+            while stack:
+                vertex = stack.pop()
+                size += 1
+                for idx in range(indptr[vertex], indptr[vertex + 1]):
+                    neighbor = neighbors[idx]
+                    if visited[neighbor] or edges[idx] in failed_edges:
+                        continue
+                    visited[neighbor] = 1
+                    stack.append(neighbor)
+
+            largest = max(largest, size)
+            pairs += size * (size - 1) // 2
+
+        return components, largest, pairs
+
+
+# Topology of the worker processes
+_worker = {}
+
+
+def _initialize_worker(name, topology):
+    """
+    Attach the worker process to the shared topology.
+    """
+    if name is not None:
+        block = shared_memory.SharedMemory(name=name)
+        _worker['block'] = block
+        topology = FrozenTopology.attach(block.buf)
+    _worker['topology'] = topology
+
+
+def _evaluate_chunk(chunk):
+    """
+    Evaluate a chunk of scenarios in a worker process.
+    """
+    topology = _worker['topology']
+    return [
+        topology.evaluate(vertices, edges) for vertices, edges in chunk
+    ]
+
+
+def simulate(topology, scenarios, workers=None, chunksize=64):
+    """
+    Evaluate failure scenarios, optionally in a pool of processes.
+
+    :param topology: Topology to evaluate the scenarios on.
+    :type topology: :class:`FrozenTopology`
+    :param list scenarios: List of tuples (failed vertices, failed edges)
+     with the collections of failed ordinals of each scenario.
+    :param int workers: Number of worker processes. If ``0`` the scenarios
+     are evaluated in this process. If ``None`` they are evaluated in this
+     process when there are less than :data:`PARALLEL_THRESHOLD`, and in a
+     pool with a process per CPU otherwise.
+    :param int chunksize: Number of scenarios sent to a worker at once.
+    :rtype: list
+    :return: A list of tuples (components, largest, reachable pairs), one
+     per scenario. See :meth:`FrozenTopology.evaluate`.
+    """
+    if workers is None and len(scenarios) < PARALLEL_THRESHOLD:
+        workers = 0
+
+    if workers == 0 or not scenarios:
+        return [
+            topology.evaluate(vertices, edges)
+            for vertices, edges in scenarios
+        ]
+
+    block = None
+    if shared_memory is not None:
+        block = topology.share()
+        initargs = (block.name, None)
+    else:
+        initargs = (None, topology)
+
+    chunks = [
+        scenarios[idx:idx + chunksize]
+        for idx in range(0, len(scenarios), chunksize)
+    ]
+
+    pool = Pool(
+        processes=workers, initializer=_initialize_worker, initargs=initargs
+    )
+    try:
+        results = []
+        for chunk_results in pool.map(_evaluate_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+    finally:
+        pool.terminate()
+        pool.join()
+        if block is not None:
+            block.close()
+            block.unlink()
+
+
+def _label_components(size, edge_u, edge_v, alive):
+    """
+    Label the connected components of a batch of sampled graphs.
+
+    Each vertex is labeled with the minimum ordinal of its component using
+    label propagation over the alive edges followed by pointer jumping.
+
+    :param int size: Number of vertices.
+    :param edge_u: Array with the first endpoint of each edge.
+    :param edge_v: Array with the second endpoint of each edge.
+    :param alive: Boolean array of shape (edges, samples).
+    :return: Integer array of labels of shape (vertices, samples).
+    """
+    samples = alive.shape[1]
+    columns = numpy.arange(samples)
+    labels = numpy.repeat(
+        numpy.arange(size)[:, numpy.newaxis], samples, axis=1
+    )
+
+    # Flat positions of both endpoints of each edge on each sample
+    flat_u = (edge_u[:, numpy.newaxis] * samples + columns).ravel()
+    flat_v = (edge_v[:, numpy.newaxis] * samples + columns).ravel()
+
+    while True:
+        candidates = numpy.where(
+            alive, numpy.minimum(labels[edge_u], labels[edge_v]), size
+        ).ravel()
+        updated = labels.copy()
+        flat = updated.reshape(-1)
+        numpy.minimum.at(flat, flat_u, candidates)
+        numpy.minimum.at(flat, flat_v, candidates)
+
+        # Pointer jumping, labels are vertices of the same component
+        updated = updated[updated, columns]
+
+        if numpy.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _normal_quantile(probability):
+    """
+    Compute the quantile of the standard normal distribution.
+
+    The inverse of its cumulative distribution function is found by bisection
+    over :py:func:`math.erf`, precise to about 1e-12.
+
+    :param float probability: Probability, between 0 and 1 exclusive.
+    :rtype: float
+    """
+    low, high = -40.0, 40.0
+    while high - low > 1e-12:
+        middle = (low + high) / 2
+        if 0.5 * (1 + erf(middle / sqrt(2))) < probability:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def sample_availability(
+        size, edge_u, edge_v, link_failure, node_failure, pairs,
+        samples=10000, seed=None, confidence=0.95, batch=1000):
+    """
+    Estimate the availability of connections by Monte Carlo sampling.
+
+    Each sample draws the failed vertices and edges from their failure
+    probabilities, and a connection is up if both endpoints survived and are
+    in the same connected component. Samples are drawn and evaluated in
+    batches of NumPy arrays.
+
+    This function requires the optional NumPy package.
+
+    :param int size: Number of vertices.
+    :param edge_u: Sequence with the first endpoint of each edge.
+    :param edge_v: Sequence with the second endpoint of each edge.
+    :param link_failure: Sequence with the failure probability of each edge.
+    :param node_failure: Sequence with the failure probability of each
+     vertex.
+    :param list pairs: List of tuples (vertex, vertex) of the connections to
+     evaluate.
+    :param int samples: Number of samples.
+    :param seed: Seed of the random number generator, or a
+     :py:class:`numpy.random.RandomState`.
+    :param float confidence: Confidence level of the intervals.
+    :param int batch: Number of samples evaluated at once.
+    :rtype: list
+    :return: A list of :class:`Availability`, one per pair.
+    :raises ValueError: If ``samples`` or ``batch`` are not positive or
+     ``confidence`` is not between 0 and 1 exclusive.
+    """
+    if samples < 1:
+        raise ValueError(
+            'Number of samples must be positive, got {}'.format(samples)
+        )
+    if batch < 1:
+        raise ValueError(
+            'Batch size must be positive, got {}'.format(batch)
+        )
+    if not 0 < confidence < 1:
+        raise ValueError(
+            'Confidence must be between 0 and 1, got {}'.format(confidence)
+        )
+
+    require_numpy()
+
+    if isinstance(seed, numpy.random.RandomState):
+        rng = seed
+    else:
+        rng = numpy.random.RandomState(seed)
+    edge_u = numpy.asarray(edge_u, dtype=numpy.intp)
+    edge_v = numpy.asarray(edge_v, dtype=numpy.intp)
+    link_failure = numpy.asarray(link_failure, dtype=numpy.float64)
+    node_failure = numpy.asarray(node_failure, dtype=numpy.float64)
+    pair_a = numpy.asarray([a for a, _ in pairs], dtype=numpy.intp)
+    pair_b = numpy.asarray([b for _, b in pairs], dtype=numpy.intp)
+
+    successes = numpy.zeros(len(pairs), dtype=numpy.int64)
+    for start in range(0, samples, batch):
+        count = min(batch, samples - start)
+
+        nodes_alive = \
+            rng.random_sample((size, count)) >= node_failure[:, None]
+        links_alive = \
+            rng.random_sample((len(edge_u), count)) >= link_failure[:, None]
+        alive = links_alive & nodes_alive[edge_u] & nodes_alive[edge_v]
+
+        labels = _label_components(size, edge_u, edge_v, alive)
+        up = (
+            nodes_alive[pair_a] & nodes_alive[pair_b] &
+            (labels[pair_a] == labels[pair_b])
+        )
+        successes += up.sum(axis=1)
+
+    # Wilson score interval
+    z = _normal_quantile(0.5 + confidence / 2)
+    results = []
+    for success in successes.tolist():
+        estimate = success / samples
+        denominator = 1 + z * z / samples
+        center = (estimate + z * z / (2 * samples)) / denominator
+        margin = z * sqrt(
+            estimate * (1 - estimate) / samples +
+            z * z / (4 * samples * samples)
+        ) / denominator
+        results.append(Availability(
+            estimate, max(0.0, center - margin), min(1.0, center + margin),
+            samples
+        ))
+    return results
+
+
+__all__ = [
+    'PARALLEL_THRESHOLD',
+    'ScenarioResult',
+    'Availability',
+    'FrozenTopology',
+    'simulate',
+    'sample_availability'
+]
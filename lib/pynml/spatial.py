@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Geographic distances and spatial search over WGS84 coordinates.
+
+Coordinates are indexed as points on the unit sphere, where the straight line
+(chord) distance between two points grows with their great-circle distance.
+This allows a regular k-d tree over three dimensional points to answer
+great-circle radius and nearest neighbor queries without special cases at the
+poles or the antimeridian.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+from heapq import heappush, heappushpop
+from math import radians, sin, cos, asin, sqrt, pi
+
+from .graph import numpy, require_numpy
+
+
+EARTH_RADIUS = 6371.0088
+"""
+Mean Earth radius in kilometers.
+"""
+
+
+def to_cartesian(latitude, longitude):
+    """
+    Convert WGS84 coordinates to a point on the unit sphere.
+
+    :param float latitude: Latitude in decimal degrees.
+    :param float longitude: Longitude in decimal degrees.
+    :rtype: tuple
+    :return: The tuple (x, y, z) of the point.
+    """
+    lat = radians(latitude)
+    lon = radians(longitude)
+    return (cos(lat) * cos(lon), cos(lat) * sin(lon), sin(lat))
+
+
+def chord_to_km(chord):
+    """
+    Convert the chord distance between two points of the unit sphere to their
+    great-circle distance over the Earth surface.
+    """
+    return 2 * EARTH_RADIUS * asin(min(1.0, chord / 2))
+
+
+def km_to_chord(km):
+    """
+    Convert a great-circle distance over the Earth surface to the chord
+    distance between two points of the unit sphere.
+    """
+    return 2 * sin(min(km / EARTH_RADIUS, pi) / 2)
+
+
+def haversine(lat_a, lon_a, lat_b, lon_b):
+    """
+    Compute the great-circle distance between two WGS84 coordinates.
+
+    :rtype: float
+    :return: The distance in kilometers.
+    """
+    dlat = radians(lat_b - lat_a)
+    dlon = radians(lon_b - lon_a)
+    h = (
+        sin(dlat / 2) ** 2 +
+        cos(radians(lat_a)) * cos(radians(lat_b)) * sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(h)))
+
+
+def haversine_matrix(latitudes, longitudes, others=None):
+    """
+    Compute the great-circle distances between sets of WGS84 coordinates.
+
+    This function requires the optional NumPy package.
+
+    :param latitudes: Sequence of latitudes in decimal degrees.
+    :param longitudes: Sequence of longitudes in decimal degrees.
+    :param tuple others: Optional tuple (latitudes, longitudes) of a second
+     set of coordinates. If ``None``, the distances between the coordinates of
+     the first set are computed.
+    :return: A :py:class:`numpy.ndarray` of shape (first set, second set) with
+     the distances in kilometers.
+    """
+    require_numpy()
+
+    lat_a = numpy.radians(numpy.asarray(latitudes, dtype=numpy.float64))
+    lon_a = numpy.radians(numpy.asarray(longitudes, dtype=numpy.float64))
+    if others is None:
+        lat_b, lon_b = lat_a, lon_a
+    else:
+        lat_b = numpy.radians(numpy.asarray(others[0], dtype=numpy.float64))
+        lon_b = numpy.radians(numpy.asarray(others[1], dtype=numpy.float64))
+
+    dlat = lat_b[numpy.newaxis, :] - lat_a[:, numpy.newaxis]
+    dlon = lon_b[numpy.newaxis, :] - lon_a[:, numpy.newaxis]
+    h = (
+        numpy.sin(dlat / 2) ** 2 +
+        numpy.cos(lat_a)[:, numpy.newaxis] * numpy.cos(lat_b)[numpy.newaxis] *
+        numpy.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * numpy.arcsin(numpy.sqrt(numpy.minimum(h, 1.0)))
+
+
+class KDTree(object):
+    """
+    Static k-d tree over three dimensional points.
+
+    :param list points: List of tuples (point, payload), where each point is
+     a tuple (x, y, z).
+    """
+
+    def __init__(self, points):
+        points = list(points)
+        self._size = len(points)
+        self._root = self._build(points, 0)
+
+    def __len__(self):
+        return self._size
+
+    def _build(self, points, axis):
+        if not points:
+            return None
+
+        points.sort(key=lambda entry: entry[0][axis])
+        median = len(points) // 2
+        point, payload = points[median]
+        following = (axis + 1) % 3
+        return (
+            axis, point, payload,
+            self._build(points[:median], following),
+            self._build(points[median + 1:], following)
+        )
+
+    def within(self, point, radius):
+        """
+        Find the points at a euclidean distance of at most ``radius``.
+
+        :return: A list of tuples (distance, payload).
+        """
+        found = []
+        limit = radius * radius
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            axis, other, payload, left, right = node
+
+            distance = sum((a - b) ** 2 for a, b in zip(point, other))
+            if distance <= limit:
+                found.append((sqrt(distance), payload))
+
+            delta = point[axis] - other[axis]
+            if delta <= radius:
+                stack.append(left)
+            if delta >= -radius:
+                stack.append(right)
+        return found
+
+    def nearest(self, point, k):
+        """
+        Find the ``k`` points closest to the given one.
+
+        :return: A list of tuples (distance, payload) sorted by distance.
+        """
+        if k <= 0:
+            return []
+
+        # Max-heap of the best candidates by negative distance, the visit
+        # order breaks ties without comparing payloads
+        best = []
+        visited = 0
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if node is None or (len(best) == k and bound >= -best[0][0]):
+                continue
+            axis, other, payload, left, right = node
+
+            distance = sum((a - b) ** 2 for a, b in zip(point, other))
+            visited += 1
+            entry = (-distance, -visited, payload)
+            if len(best) < k:
+                heappush(best, entry)
+            elif distance < -best[0][0]:
+                heappushpop(best, entry)
+
+            delta = point[axis] - other[axis]
+            near, far = (left, right) if delta < 0 else (right, left)
+            stack.append((far, max(bound, delta * delta)))
+            stack.append((near, bound))
+
+        return [
+            (sqrt(-distance), payload)
+            for distance, _, payload in sorted(best, reverse=True)
+        ]
+
+
+__all__ = [
+    'EARTH_RADIUS',
+    'KDTree',
+    'chord_to_km',
+    'km_to_chord',
+    'haversine',
+    'haversine_matrix',
+    'to_cartesian'
+]
@@ -483,7 +483,7 @@ NML_SPEC = {
                 },
                 {
                     'name': 'hasLabelGroup',
-                    'with': ['Lifetime'],
+                    'with': ['Label Group'],
                     'cardinality': '1',
                     'doc': 'FIXME: Document hasLabelGroup relation'
                 },
@@ -524,7 +524,7 @@ NML_SPEC = {
                 },
                 {
                     'name': 'hasLabelGroup',
-                    'with': ['Lifetime'],
+                    'with': ['Label Group'],
                     'cardinality': '1',
                     'doc': 'FIXME: Document hasLabelGroup relation'
                 },
@@ -536,7 +536,7 @@ NML_SPEC = {
                 },
                 {
                     'name': 'isSerialCompoundLink',
-                    'with': ['Port', 'Port Group'],
+                    'with': ['Ordered List'],
                     'cardinality': '+',
                     'doc': 'FIXME: Document isSerialCompoundLink relation'
                 }
@@ -598,7 +598,7 @@ NML_SPEC = {
         },
         {
             'name': 'Environment',
-            'parent': None,
+            'parent': 'Network Object',
             'brief': 'Describes attributes inherent to the environment',
             'doc': (
                 'Attributes to be attached to the environment the topology is '
@@ -719,6 +719,17 @@ NML_SPEC = {
             ),
             'abstract': False,
             'attributes': [
+                {
+                    'name': 'identifier',
+                    'property': True,
+                    'nml_attribute': 'id',
+                    'semantic_type': 'URI',
+                    'type': 'str',
+                    'default': 'str(id(self))',
+                    'default_arg': 'None',
+                    'validation': 'is_valid_uri(%s)',
+                    'doc': 'Persistent globally unique URI'
+                },
                 {
                     'name': 'start',
                     'property': True,
@@ -768,25 +779,36 @@ NML_SPEC = {
             ),
             'abstract': False,
             'attributes': [
+                {
+                    'name': 'identifier',
+                    'property': True,
+                    'nml_attribute': 'id',
+                    'semantic_type': 'URI',
+                    'type': 'str',
+                    'default': 'str(id(self))',
+                    'default_arg': 'None',
+                    'validation': 'is_valid_uri(%s)',
+                    'doc': 'Persistent globally unique URI'
+                },
                 {
                     'name': 'labeltype',
-                    'property': False,
+                    'property': True,
                     'nml_attribute': 'labeltype',
-                    'semantic_type': None,
-                    'type': None,
-                    'default': None,
-                    'default_arg': None,
+                    'semantic_type': 'URI',
+                    'type': 'str',
+                    'default': 'unset',
+                    'default_arg': 'None',
                     'validation': None,
                     'doc': 'A technology-specific labelset'
                 },
                 {
                     'name': 'value',
-                    'property': False,
+                    'property': True,
                     'nml_attribute': 'value',
                     'semantic_type': None,
-                    'type': None,
-                    'default': None,
-                    'default_arg': None,
+                    'type': 'str',
+                    'default': 'unset',
+                    'default_arg': 'None',
                     'validation': None,
                     'doc': 'A specific value taken from a labelset'
                 }
@@ -801,27 +823,41 @@ NML_SPEC = {
             'doc': 'FIXME: Document LabelGroup',
             'abstract': False,
             'attributes': [
+                {
+                    'name': 'identifier',
+                    'property': True,
+                    'nml_attribute': 'id',
+                    'semantic_type': 'URI',
+                    'type': 'str',
+                    'default': 'str(id(self))',
+                    'default_arg': 'None',
+                    'validation': 'is_valid_uri(%s)',
+                    'doc': 'Persistent globally unique URI'
+                },
                 {
                     'name': 'labeltype',
-                    'property': False,
+                    'property': True,
                     'nml_attribute': 'labeltype',
-                    'semantic_type': None,
-                    'type': None,
-                    'default': None,
-                    'default_arg': None,
+                    'semantic_type': 'URI',
+                    'type': 'str',
+                    'default': 'unset',
+                    'default_arg': 'None',
                     'validation': None,
                     'doc': 'A technology-specific labelset'
                 },
                 {
                     'name': 'value',
-                    'property': False,
+                    'property': True,
                     'nml_attribute': 'value',
                     'semantic_type': None,
-                    'type': None,
-                    'default': None,
-                    'default_arg': None,
+                    'type': 'str',
+                    'default': 'unset',
+                    'default_arg': 'None',
                     'validation': None,
-                    'doc': 'A specific value taken from a labelset'
+                    'doc': (
+                        'The values taken from a labelset, as a LabelSet or '
+                        'in its range syntax'
+                    )
                 }
             ],
             'relations': [
@@ -836,7 +872,19 @@ NML_SPEC = {
                 'network along with the isSerialCompoundLink relation'
             ),
             'abstract': False,
+            'mixins': ['OrderedListMixin'],
             'attributes': [
+                {
+                    'name': 'identifier',
+                    'property': True,
+                    'nml_attribute': 'id',
+                    'semantic_type': 'URI',
+                    'type': 'str',
+                    'default': 'str(id(self))',
+                    'default_arg': 'None',
+                    'validation': 'is_valid_uri(%s)',
+                    'doc': 'Persistent globally unique URI'
+                }
             ],
             'relations': [
             ]
@@ -899,9 +947,14 @@ from collections import OrderedDict
 from abc import ABCMeta, abstractmethod
 from xml.etree import ElementTree as etree  # noqa
 
-from six import add_metaclass
+from six import add_metaclass, text_type
 from rfc3986 import is_valid_uri
 
+from .mixins import (
+    {%- for mixin in mixins %}
+    {{ mixin }}{% if not loop.last %},{% endif %}
+    {%- endfor %}
+)
 from .exceptions import (
     {%- for exc in exceptions %}
     {{ exc }}{% if not loop.last %},{% endif %}
@@ -932,6 +985,70 @@ class NMLObject(object):
         self.attributes = []
         self.relations = OrderedDict()
         self.metadata = kwargs
+        self.observers = []
+
+    def iter_relations(self):
+        \"""
+        Iterate over all the objects related with this object.
+
+        Unset members of fixed cardinality relations are skipped.
+
+        :return: An iterator of tuples (relation name, related object).
+        \"""
+        for relname, relgetter in self.relations.items():
+
+            # Composition elements are tuples
+            # Aggregation elements are OrderedDict
+            associated = relgetter()
+            if isinstance(associated, OrderedDict):
+                associated = associated.values()
+
+            for related in associated:
+                if related is not None:
+                    yield relname, related
+
+    def _notify_relation(self, relation, added, removed):
+        \"""
+        Notify the observers of this object that a relation changed.
+
+        Each observer must implement a
+        ``relation_changed(obj, relation, added, removed)`` method.
+
+        :param str relation: Name of the relation that changed.
+        :param added: Objects related by this change.
+        :param removed: Objects no longer related after this change.
+        \"""
+        if not self.observers:
+            return
+
+        added_ids = set(id(obj) for obj in added)
+        removed_ids = set(id(obj) for obj in removed)
+        added = tuple(
+            obj for obj in added
+            if obj is not None and id(obj) not in removed_ids
+        )
+        removed = tuple(
+            obj for obj in removed
+            if obj is not None and id(obj) not in added_ids
+        )
+        if not added and not removed:
+            return
+
+        for observer in self.observers:
+            observer.relation_changed(self, relation, added, removed)
+
+    def _notify_attribute(self, attribute, value):
+        \"""
+        Notify the observers of this object that an attribute changed.
+
+        Each observer must implement a
+        ``attribute_changed(obj, attribute, value)`` method.
+
+        :param str attribute: Name of the attribute that changed.
+        :param value: New value of the attribute.
+        \"""
+        for observer in self.observers:
+            observer.attribute_changed(self, attribute, value)
 
     def _describe_object(self):
         \"""
@@ -970,7 +1087,7 @@ class NMLObject(object):
                 this = etree.SubElement(parent, name)
         return this
 
-    def as_nml(self, this=None, parent=None):
+    def as_nml(self, this=None, parent=None, resolve=None):
         \"""
         Build NML representation of this node.
 
@@ -979,6 +1096,9 @@ class NMLObject(object):
         :param parent: Parent node to hook to. If `None`, a root node is
          created.
         :type parent: :py:class:`xml.etree.ElementTree`
+        :param resolve: Optional callable that receives each related object
+         and returns the object to reference instead, or `None` to skip it.
+         Objects resolved more than once per relation are referenced once.
         :rtype: :py:class:`xml.etree.ElementTree`
         :return: The NML representation of this node.
         \"""
@@ -987,8 +1107,8 @@ class NMLObject(object):
         # Attributes
         for attr_name in self.attributes:
             attr = getattr(self, attr_name)
-            if attr is not unset:
-                this.attrib[attr_name] = attr
+            if attr is not unset and attr is not None:
+                this.attrib[attr_name] = text_type(attr)
 
         # Relations
         for relname, relgetter in self.relations.items():
@@ -1000,9 +1120,19 @@ class NMLObject(object):
                 associated = associated.values()
 
             # Ignore empty relations
-            if not associated or not all(associated):
+            if not associated or \\
+                    any(related is None for related in associated):
                 continue
 
+            if resolve is not None:
+                associated = list(OrderedDict(
+                    (resolved.identifier, resolved)
+                    for resolved in map(resolve, associated)
+                    if resolved is not None
+                ).values())
+                if not associated:
+                    continue
+
             # Create subelement
             relation = etree.SubElement(
                 this, 'Relation',
@@ -1022,7 +1152,7 @@ class NMLObject(object):
 {%- if cls.abstract -%}
 @add_metaclass(ABCMeta)
 {% endif -%}
-class {{ cls.name|objectize }}({{ cls.parent|objectize|default('NMLObject', True) }}):
+class {{ cls.name|objectize }}({% for mixin in cls.mixins|default([]) %}{{ mixin }}, {% endfor %}{{ cls.parent|objectize|default('NMLObject', True) }}):
     \"""
     {{ cls.brief|wordwrap(75)|indent(4) }}.
 
@@ -1098,6 +1228,7 @@ class {{ cls.name|objectize }}({{ cls.parent|objectize|default('NMLObject', True
         {%- else %}
         self._{{ attr.name }} = {{ attr.name }}
         {%- endif %}
+        self._notify_attribute('{{ attr.name }}', {{ attr.name }})
     {%- endif -%}
     {%- endfor -%}
     {%- for rel in cls.relations %}
@@ -1115,10 +1246,10 @@ class {{ cls.name|objectize }}({{ cls.parent|objectize|default('NMLObject', True
         {{ ':return: True if `%s` is related to `self` with `%s`.'|format(argument, rel.name)|wordwrap(71)|indent(9) }}
         :rtype: bool
         \"""
-        if {{ argument }}.__class__ not in (
+        if not isinstance({{ argument }}, (
             {%- for with in rel.with %}
                 {{ with|objectize }}{% if not loop.last %},{% endif %}
-            {%- endfor %}, ):
+            {%- endfor %}, )):
             raise Relation{{ rel.name|objectize }}Error()
 
         return {{ argument }}
@@ -1128,19 +1259,37 @@ class {{ cls.name|objectize }}({{ cls.parent|objectize|default('NMLObject', True
 
     def add_{{ rel.name|variablize }}(self, {{ argument }}):
         \"""
-        Add given `{{ argument }}` to this object `{{ rel.name }}` relations.
+        {{ 'Add given `%s` to this object `%s` relations.'|format(argument, rel.name)|wordwrap(71)|indent(8) }}
 
         {{ ':param %s: Object to add to the `%s` relation.'|format(argument, rel.name)|wordwrap(71)|indent(9) }}
         :type {{ argument }}: {{ rel.with|map('objectize')|join(' or ') }}
         \"""
-        if {{ argument }}.__class__ not in (
+        if not isinstance({{ argument }}, (
             {%- for with in rel.with %}
                 {{ with|objectize }}{% if not loop.last %},{% endif %}
-            {%- endfor %}, ):
+            {%- endfor %}, )):
             raise Relation{{ rel.name|objectize }}Error()
 
-        self._{{ relation_collection }}[{{ argument }}.identifier] = \\
-            {{ argument }}
+        collection = self._{{ relation_collection }}
+        previous = collection.get({{ argument }}.identifier, None)
+        collection[{{ argument }}.identifier] = {{ argument }}
+        self._notify_relation(
+            '{{ rel.name }}', ({{ argument }}, ), (previous, )
+        )
+
+    def remove_{{ rel.name|variablize }}(self, {{ argument }}):
+        \"""
+        {{ 'Remove given `%s` from this object `%s` relations.'|format(argument, rel.name)|wordwrap(71)|indent(8) }}
+
+        Does nothing if `{{ argument }}` is not related to `self`.
+
+        {{ ':param %s: Object to remove from the `%s` relation.'|format(argument, rel.name)|wordwrap(71)|indent(9) }}
+        :type {{ argument }}: {{ rel.with|map('objectize')|join(' or ') }}
+        \"""
+        previous = self._{{ relation_collection }}.pop(
+            {{ argument }}.identifier, None
+        )
+        self._notify_relation('{{ rel.name }}', (), (previous, ))
     {%- else %}
     {%- if rel.cardinality|int > 1 %}
     {%- set arguments = argument + range(1, rel.cardinality|int + 1)|join(', ' + argument) %}
@@ -1165,7 +1314,7 @@ class {{ cls.name|objectize }}({{ cls.parent|objectize|default('NMLObject', True
         arg_tuple = ({{ arguments }}, )
 
         for arg in arg_tuple:
-            if arg.__class__ not in ({{ rel.with|map('objectize')|join(', ') }}, ):
+            if not isinstance(arg, ({{ rel.with|map('objectize')|join(', ') }}, )):
                 raise Relation{{ rel.name|objectize }}Error()
 
         {%- if rel.cardinality|int > 1 %}
@@ -1173,7 +1322,9 @@ class {{ cls.name|objectize }}({{ cls.parent|objectize|default('NMLObject', True
             raise Exception('Non unique objects')  # FIXME
         {%- endif %}
 
+        previous = self._{{ relation_collection }}
         self._{{ relation_collection }} = arg_tuple
+        self._notify_relation('{{ rel.name }}', arg_tuple, previous)
     {%- endif %}
 {##}
     def get_{{ rel.name|methodize }}(self):
@@ -1188,10 +1339,27 @@ class {{ cls.name|objectize }}({{ cls.parent|objectize|default('NMLObject', True
 
 
 {% endfor -%}
+RELATIONS = OrderedDict([
+{%- for cls in spec.classes %}
+    ({{ cls.name|objectize }}, OrderedDict([
+    {%- for rel in cls.relations %}
+        ('{{ rel.name }}', ('{{ rel.cardinality }}', ({{ rel.with|map('objectize')|join(', ') }}, ))),
+    {%- endfor %}
+    ])),
+{%- endfor %}
+])
+\"""
+Relations declared by each class, as a mapping of the relation name to a tuple
+(cardinality, related types), where the cardinality is ``'+'`` for any number
+of objects, or the exact number of objects.
+\"""
+
+
 __all__ = [
 {%- for cls in spec.classes %}
-    '{{ cls.name|objectize }}'{% if not loop.last %},{% endif %}
+    '{{ cls.name|objectize }}',
 {%- endfor %}
+    'RELATIONS'
 ]
 
 """  # noqa
@@ -1310,6 +1478,12 @@ def build():
                     lower_first(attr['doc'])
                 )
 
+    mixins = []
+    for cls in NML_SPEC['classes']:
+        for mixin in cls.get('mixins', []):
+            if mixin not in mixins:
+                mixins.append(mixin)
+
     # Build template environment
     def load_template(name):
         templates = {
@@ -1331,7 +1505,8 @@ def build():
         template = env.get_template(tpl)
         rendered = template.render(
             spec=NML_SPEC,
-            exceptions=exceptions
+            exceptions=exceptions,
+            mixins=mixins
         )
 
         # Write output
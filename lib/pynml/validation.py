@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Consistency checks of the relations of a NML namespace against the
+specification.
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+from collections import OrderedDict, namedtuple
+
+from .nml import RELATIONS
+
+
+Violation = namedtuple(
+    'Violation', ['kind', 'subject', 'relation', 'related', 'message']
+)
+"""
+Relation of a namespace object that doesn't follow the specification.
+
+``kind`` is one of:
+
+``dangling``
+  ``related`` is not registered in the namespace, or another object is
+  registered with its identifier.
+
+``cardinality``
+  The relation has a fixed number of objects greater than one and some of them
+  are unset. ``related`` is ``None``.
+
+``type``
+  ``related`` is not of any of the types allowed by the relation.
+
+``subject`` is the object that holds the relation and ``message`` a human
+readable description of the violation.
+"""
+
+
+def relation_specs(cls):
+    """
+    Get the specification of all the relations of a NML class.
+
+    Relations redeclared by a class override the ones of its parents.
+
+    :param type cls: A class of :mod:`pynml.nml`.
+    :rtype: :py:class:`OrderedDict`
+    :return: A mapping of the relation name to a tuple (cardinality, related
+     types), as in :data:`pynml.nml.RELATIONS`.
+    """
+    specs = OrderedDict()
+    for base in reversed(cls.__mro__):
+        specs.update(RELATIONS.get(base, ()))
+    return specs
+
+
+def validate(namespace):
+    """
+    Check the relations of all the objects of a namespace.
+
+    Each relation of each object is visited once, so the cost is linear in
+    the number of objects and relations.
+
+    :param namespace: Mapping of identifiers to the registered objects.
+    :rtype: list
+    :return: A list of :data:`Violation`, empty if the namespace is valid.
+    """
+    violations = []
+    specs_by_class = {}
+    registered = namespace.get
+
+    for subject in namespace.values():
+        cls = subject.__class__
+        specs = specs_by_class.get(cls, None)
+        if specs is None:
+            specs = specs_by_class[cls] = relation_specs(cls)
+
+        for relname, relgetter in subject.relations.items():
+            cardinality, types = specs.get(relname, ('+', ()))
+
+            # Composition elements are tuples
+            # Aggregation elements are OrderedDict
+            associated = relgetter()
+            if isinstance(associated, OrderedDict):
+                associated = associated.values()
+
+            missing = 0
+            for related in associated:
+                if related is None:
+                    missing += 1
+                    continue
+
+                if registered(related.identifier, None) is not related:
+                    violations.append(Violation(
+                        'dangling', subject, relname, related,
+                        '{} {} {} is not registered'.format(
+                            subject.identifier, relname, related.identifier
+                        )
+                    ))
+
+                if types and not isinstance(related, types):
+                    violations.append(Violation(
+                        'type', subject, relname, related,
+                        '{} {} {} is a {}, expected {}'.format(
+                            subject.identifier, relname, related.identifier,
+                            related.__class__.__name__,
+                            ' or '.join(t.__name__ for t in types)
+                        )
+                    ))
+
+            if missing and cardinality != '+' and int(cardinality) > 1:
+                violations.append(Violation(
+                    'cardinality', subject, relname, None,
+                    '{} {} has {} of {} objects unset'.format(
+                        subject.identifier, relname, missing, cardinality
+                    )
+                ))
+
+    return violations
+
+
+__all__ = ['Violation', 'relation_specs', 'validate']
@@ -65,6 +65,9 @@ setup(
 
     # Dependencies
     install_requires=find_requirements('requirements.txt'),
+    extras_require={
+        'numpy': ['numpy'],
+    },
 
     # Metadata
     author='Hewlett Packard Enterprise Development LP',
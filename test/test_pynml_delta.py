@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module pynml.delta.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+import pytest  # noqa
+
+from pynml.nml import Lifetime, OrderedList
+from pynml.manager import NMLManager, ExtendedNMLManager
+
+
+def test_delta():
+    """
+    Check a replica is kept in sync by applying patches.
+    """
+    master = ExtendedNMLManager(name='Master Namespace')
+    sw1 = master.create_node(identifier='sw1', name='sw1')
+    sw2 = master.create_node(identifier='sw2', name='sw2')
+    bilink = master.create_bilink(
+        master.create_biport(sw1, identifier='sw1-1', name='sw1-1'),
+        master.create_biport(sw2, identifier='sw2-1', name='sw2-1'),
+        identifier='sw1-sw2', name='sw1-sw2'
+    )
+
+    # Changes are logged from the first patch on
+    replica = NMLManager(name='Replica Namespace')
+    epoch = replica.apply_delta(master.export_delta())
+    assert epoch == master.epoch == len(master.namespace)
+    assert set(replica.namespace) == set(master.namespace)
+    assert replica.root_hash() == master.root_hash()
+
+    # Only the changed objects are shipped
+    assert master.export_delta(epoch, pretty=False).count('identifier=') == 0
+    window = Lifetime(identifier='window', start='20160101T000000Z')
+    master.register_object(window)
+    sw1.add_exists_during(window)
+    sw2.name = 'core'
+    patch = master.export_delta(epoch)
+    assert patch.count('identifier=') == 3
+
+    epoch = replica.apply_delta(patch)
+    assert replica.get_object('sw2').name == 'core'
+    assert replica.root_hash() == master.root_hash()
+
+    # Patches are idempotent
+    replica.apply_delta(patch)
+    assert replica.root_hash() == master.root_hash()
+
+    # Removed objects and ordered lists
+    master.remove_bilink(bilink)
+    path = OrderedList(identifier='path')
+    master.register_object(path)
+    path.extend([sw1, sw2])
+    patch = master.export_delta(epoch)
+    assert '<Removed>' in patch
+
+    epoch = replica.apply_delta(patch)
+    assert replica.get_object('sw1-sw2') is None
+    assert list(replica.get_object('path')) == [
+        replica.get_object('sw1'), replica.get_object('sw2')
+    ]
+    assert replica.root_hash() == master.root_hash()
+    assert epoch == master.epoch
+
+    # Unregistered objects are forgotten once acknowledged
+    removed = len(master.export_delta(1).split('<Object ')) - 1
+    assert removed == 3
+    assert '<Removed>' not in master.export_delta()
+    assert master.compact_changelog(epoch) == removed
+    with pytest.raises(Exception):
+        master.export_delta(1)
+
+    master.unregister_object(path)
+    epoch = replica.apply_delta(master.export_delta(epoch))
+    assert replica.get_object('path') is None
+    assert replica.root_hash() == master.root_hash()
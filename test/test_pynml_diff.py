@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module pynml.diff.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+import pytest  # noqa
+
+from pynml.nml import Node, Port, Link
+from pynml.manager import NMLManager
+from pynml.diff import content_hash, diff
+
+
+def build(links):
+    """
+    Create a namespace of two nodes connected by the given links.
+    """
+    mgr = NMLManager(name='Diff Namespace')
+    node_a = Node(identifier='node_a', name='A')
+    node_b = Node(identifier='node_b', name='B')
+    port_a = Port(identifier='port_a', name='A1')
+    port_b = Port(identifier='port_b', name='B1')
+    for obj in (node_a, node_b, port_a, port_b):
+        mgr.register_object(obj)
+    node_a.add_has_outbound_port(port_a)
+    node_b.add_has_inbound_port(port_b)
+
+    for identifier in links:
+        link = Link(identifier=identifier, name=identifier)
+        mgr.register_object(link)
+        port_a.add_is_source(link)
+        port_b.add_is_sink(link)
+    return mgr
+
+
+def test_content_hash():
+    """
+    Check the content hash ignores versions and the order of relations.
+    """
+    first = build(['link1', 'link2']).namespace['port_a']
+    second = build(['link2', 'link1']).namespace['port_a']
+    second.version = '20160101T000000Z'
+    assert content_hash(first) == content_hash(second)
+
+    second.name = 'Renamed'
+    assert content_hash(first) != content_hash(second)
+
+
+def test_diff():
+    """
+    Check added, removed and modified objects and relations are found.
+    """
+    old = build(['link1', 'link2'])
+    new = build(['link2', 'link3'])
+    new.namespace['node_a'].name = 'Renamed'
+
+    changes = diff(old, new)
+    assert [obj.identifier for obj in changes.added] == ['link3']
+    assert [obj.identifier for obj in changes.removed] == ['link1']
+    assert sorted(obj.identifier for obj, _ in changes.modified) == [
+        'node_a', 'port_a', 'port_b'
+    ]
+    assert sorted(changes.added_relations) == [
+        ('port_a', 'isSource', 'link3'), ('port_b', 'isSink', 'link3')
+    ]
+    assert sorted(changes.removed_relations) == [
+        ('port_a', 'isSource', 'link1'), ('port_b', 'isSink', 'link1')
+    ]
+
+    assert diff(old, build(['link2', 'link1'])) == ([], [], [], [], [])
+
+
+def test_merkle_hash():
+    """
+    Check Merkle hashes are updated incrementally along the containers.
+    """
+    old = build(['link1'])
+    new = build(['link1'])
+    assert old.root_hash() == new.root_hash()
+    assert sorted(obj.identifier for obj in new.top_level()) == [
+        'link1', 'node_a', 'node_b'
+    ]
+
+    node_a = new.get_object('node_a')
+    node_b = new.get_object('node_b')
+    merkle_a = new.merkle_hash(node_a)
+    merkle_b = new.merkle_hash(node_b)
+    content_a = new.content_hash(node_a)
+
+    new.get_object('port_a').name = 'Renamed'
+    assert new.root_hash() != old.root_hash()
+    assert new.merkle_hash(node_a) != merkle_a
+    assert new.content_hash(node_a) == content_a
+    assert new.merkle_hash(node_b) == merkle_b
+    assert [obj.identifier for _, obj in diff(old, new).modified] == [
+        'port_a'
+    ]
+
+    new.get_object('port_a').name = 'A1'
+    assert new.root_hash() == old.root_hash()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module pynml.index.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+import pytest  # noqa
+
+from datetime import datetime
+
+from pynml.nml import Port, Link, Lifetime, Location
+from pynml.index import parse_timestamp, RelatedValueIndex
+from pynml.manager import ExtendedNMLManager
+
+
+def test_triple_store():
+    """
+    Check that the triple store follows relation changes.
+    """
+    mgr = ExtendedNMLManager(name='Triples Namespace')
+    sw1 = mgr.create_node(identifier='sw1')
+    sw2 = mgr.create_node(identifier='sw2')
+    sw1p1 = mgr.create_biport(sw1, identifier='sw1p1')
+    sw2p1 = mgr.create_biport(sw2, identifier='sw2p1')
+
+    # Bootstrap from the relations already in the namespace
+    triples = mgr.triples()
+    assert len(triples) == 2 * (2 + 2)
+
+    # Follow new relations
+    mgr.create_bilink(sw1p1, sw2p1, identifier='sw1p1-sw2p1')
+    assert len(list(triples.triples('isSink'))) == 2
+    assert len(list(triples.triples('isSource'))) == 2
+    assert list(triples.triples('hasLink', subject='sw1p1-sw2p1')) == [
+        ('sw1p1-sw2p1', 'hasLink', link.identifier)
+        for link in mgr.get_object('sw1p1-sw2p1').get_has_link()
+    ]
+
+    # Follow replaced relations
+    port_a = Port(identifier='port_a')
+    port_b = Port(identifier='port_b')
+    mgr.register_object(port_a)
+    mgr.register_object(port_b)
+    sw1p1.set_has_port(port_a, port_b)
+    assert [
+        target for _, _, target in triples.triples('hasPort', subject=sw1p1)
+    ] == ['port_a', 'port_b']
+
+    # Objects related from unregistered objects are not indexed
+    link = Link(identifier='link')
+    link_port = Port(identifier='link_port')
+    link_port.add_is_sink(link)
+    assert not list(triples.triples(target=link))
+
+    # Compaction keeps the triples
+    triples.compact()
+    assert len(list(triples.triples('hasPort'))) == 4
+
+
+def test_lifetime_index():
+    """
+    Check time-slice queries over the lifetimes of the namespace.
+    """
+    assert parse_timestamp('19700101T000100Z') == 60
+    assert parse_timestamp('1970-01-01T01:00:00+01:00') == 0
+    assert parse_timestamp(datetime(1970, 1, 1, 0, 0, 30)) == 30
+
+    mgr = ExtendedNMLManager(name='Lifetimes Namespace')
+    sw1 = mgr.create_node(identifier='sw1')
+    sw2 = mgr.create_node(identifier='sw2')
+    sw3 = mgr.create_node(identifier='sw3')
+    sw1p1 = mgr.create_biport(sw1, identifier='sw1p1')
+    sw2p1 = mgr.create_biport(sw2, identifier='sw2p1')
+
+    morning = Lifetime(
+        identifier='morning',
+        start='2016-01-01T06:00:00Z', end='2016-01-01T12:00:00Z'
+    )
+    evening = Lifetime(
+        identifier='evening',
+        start='20160101T180000Z', end='20160101T230000Z'
+    )
+    mgr.register_object(morning)
+    sw1.add_exists_during(morning)
+    sw2.add_exists_during(morning)
+    sw2.add_exists_during(evening)
+
+    assert mgr.active_at('2016-01-01T08:00:00Z') == [sw1, sw2]
+    assert mgr.active_at('2016-01-01T20:00:00Z') == [sw2]
+    assert mgr.active_at('2016-01-01T15:00:00Z') == []
+    assert set(mgr.active_between(
+        '2016-01-01T11:00:00Z', '2016-01-01T19:00:00Z'
+    )) == {sw1, sw2}
+
+    # Follow relation and attribute changes
+    sw3.add_exists_during(evening)
+    evening.start = '2016-01-01T14:00:00Z'
+    assert mgr.active_at('2016-01-01T15:00:00Z') == [sw2, sw3]
+    sw2.remove_exists_during(evening)
+    assert mgr.active_at('2016-01-01T15:00:00Z') == [sw3]
+
+    # Export a time slice
+    mgr.create_bilink(sw1p1, sw2p1, identifier='sw1p1-sw2p1')
+    xml = mgr.export_nml(at='2016-01-01T15:00:00Z')
+    assert 'sw3' in xml
+    assert 'sw1p1-sw2p1' in xml
+    assert '"sw1"' not in xml
+    assert '"sw2"' not in xml
+
+    # Value indexes must implement _parse
+    class IncompleteIndex(RelatedValueIndex):
+        relation = 'existsDuring'
+
+    with pytest.raises(TypeError):
+        IncompleteIndex()
+
+
+def test_spatial_index():
+    """
+    Check radius and nearest neighbor queries over the located objects.
+    """
+    mgr = ExtendedNMLManager(name='Locations Namespace')
+    sites = {
+        'madrid': ('40.4168', '-3.7038'),
+        'toledo': ('39.8628', '-4.0273'),
+        'paris': ('48.8566', '2.3522'),
+        'suva': ('-18.1416', '178.4419'),
+    }
+    nodes = {}
+    for name, (latitude, longitude) in sites.items():
+        location = Location(
+            identifier=name, latitude=latitude, longitude=longitude
+        )
+        nodes[name] = mgr.create_node(identifier='sw-{}'.format(name))
+        nodes[name].set_located_at(location)
+    unknown = mgr.create_node(identifier='sw-unknown')
+    unknown.set_located_at(Location(identifier='unknown'))
+
+    found = mgr.within_radius(40.4168, -3.7038, 100)
+    assert [node for _, node in found] == [nodes['madrid'], nodes['toledo']]
+    assert 60 < found[1][0] < 80
+
+    # Across the antimeridian
+    assert mgr.nearest(-17.0, -179.0, 1)[0][1] is nodes['suva']
+    assert [node for _, node in mgr.nearest(41.0, -3.0, 3)] == [
+        nodes['madrid'], nodes['toledo'], nodes['paris']
+    ]
+
+    # Follow coordinate changes
+    location, = nodes['toledo'].get_located_at()
+    location.latitude = '48.8'
+    location.longitude = '2.3'
+    assert [node for _, node in mgr.within_radius(48.8, 2.3, 20)] == [
+        nodes['toledo'], nodes['paris']
+    ]
+
+
+def test_distance_matrix():
+    """
+    Check the distance matrix of the located objects.
+    """
+    numpy = pytest.importorskip('numpy')
+
+    mgr = ExtendedNMLManager(name='Distances Namespace')
+    for name, latitude in (('north', '90'), ('equator', '0')):
+        node = mgr.create_node(identifier=name)
+        node.set_located_at(
+            Location(identifier=name, latitude=latitude, longitude='0')
+        )
+
+    objects, distances = mgr.distance_matrix()
+    assert [obj.identifier for obj in objects] == ['north', 'equator']
+    assert numpy.allclose(numpy.diag(distances), 0)
+    assert numpy.allclose(distances[0, 1], 10007.5, atol=1)
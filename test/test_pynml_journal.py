@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module pynml.journal.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+from os.path import getsize
+from datetime import datetime
+
+import pytest  # noqa
+
+from pynml.nml import (
+    Node, Port, BidirectionalPort, Location, OrderedList, Lifetime
+)
+from pynml.manager import NMLManager
+from pynml.journal import Journal
+from pynml.delta import FixedOffset
+
+
+def test_journal(tmpdir):
+    """
+    Check a namespace is recovered from its snapshot and journal.
+    """
+    snapshot = str(tmpdir.join('topology.snapshot'))
+    path = str(tmpdir.join('topology.journal'))
+
+    def recover():
+        return NMLManager.recover(snapshot, Journal(path))
+
+    journal = Journal(path, batch_size=4)
+    mgr = NMLManager.recover(snapshot, journal)
+    assert not mgr.namespace
+
+    node = Node(identifier='sw1', name='sw1')
+    ports = [Port(identifier='sw1-{}'.format(idx)) for idx in range(3)]
+    biport = BidirectionalPort(identifier='sw1-bi')
+    for obj in [node, biport] + ports:
+        mgr.register_object(obj)
+    for port in ports:
+        node.add_has_inbound_port(port)
+    biport.set_has_port(ports[0], ports[1])
+    biport.set_has_port(ports[0], ports[2])
+    node.remove_has_inbound_port(ports[1])
+    node.name = 'core'
+    lifetime = Lifetime(
+        identifier='lifetime', start=datetime(2016, 1, 1, 6, 30),
+        end='20161231T000000Z'
+    )
+    mgr.register_object(lifetime)
+    journal.flush()
+
+    recovered = recover()
+    assert recovered.root_hash() == mgr.root_hash()
+    assert recovered.get_object('sw1').name == 'core'
+    assert recovered.get_object('sw1-bi').get_has_port()[1].identifier == \
+        'sw1-2'
+
+    # Attribute values keep their type
+    assert recovered.get_object('lifetime').start == lifetime.start
+    assert recovered.get_object('lifetime').end == '20161231T000000Z'
+
+    # Checkpoints restart the journal
+    journal.checkpoint(mgr, snapshot)
+    size = getsize(path)
+    with open(path, 'rb') as fd:
+        stale = fd.read()
+
+    location = Location(identifier='dc1', latitude=9.93, longitude=-84.08)
+    path_list = OrderedList(identifier='path')
+    for obj in (location, path_list):
+        mgr.register_object(obj)
+    node.set_located_at(location)
+    path_list.extend([ports[2], ports[0]])
+    mgr.unregister_object(ports[1])
+    journal.close()
+    assert getsize(path) > size
+
+    lifetime.end = datetime(2016, 12, 31, 1, 0, 0, 5, FixedOffset(60))
+    journal.close()
+
+    recovered = recover()
+    assert recovered.root_hash() == mgr.root_hash()
+    assert recovered.get_object('sw1-1') is None
+    assert recovered.get_object('lifetime').start == lifetime.start
+    assert recovered.get_object('lifetime').end == lifetime.end
+    assert recovered.get_object('lifetime').end.utcoffset() == \
+        lifetime.end.utcoffset()
+    assert recovered.get_object('dc1').latitude == 9.93
+    assert [port.identifier for port in recovered.get_object('path')] == [
+        'sw1-2', 'sw1-0'
+    ]
+
+    # Torn records at the end are discarded
+    with open(path, 'ab') as fd:
+        fd.write(b'\x06\x00\x00\x00\x40torn')
+    assert recover().root_hash() == mgr.root_hash()
+
+    # Journals older than the snapshot are ignored
+    journal.checkpoint(mgr, snapshot)
+    with open(path, 'wb') as fd:
+        fd.write(stale)
+    assert recover().root_hash() == mgr.root_hash()
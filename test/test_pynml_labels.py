@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module pynml.labels.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+import pytest  # noqa
+
+from pynml.nml import Port, PortGroup, Label, LabelGroup
+from pynml.labels import LabelSet
+
+
+def test_label_set():
+    """
+    Check label set parsing, operations and compact representation.
+    """
+    trunk = LabelSet.parse('1-100, 200-4094')
+    assert len(trunk) == 100 + 3895
+    assert 1 in trunk and 4094 in trunk
+    assert 150 not in trunk and 0 not in trunk and 4095 not in trunk
+
+    other = LabelSet.parse('50-300,500')
+    assert str(trunk | other) == '1-4094'
+    assert str(trunk & other) == '50-100,200-300,500'
+    assert str(trunk - other) == '1-49,301-499,501-4094'
+    assert str(LabelSet.parse('7')) == '7'
+    assert str(LabelSet()) == ''
+    assert not LabelSet.parse('')
+
+    assert LabelSet.parse('60-70') <= trunk
+    assert not LabelSet.parse('60-170') <= trunk
+    assert LabelSet.parse('101-199').isdisjoint(trunk)
+    assert list(LabelSet.parse('3,5-6')) == [3, 5, 6]
+    assert LabelSet.from_labels([3, 5, 6]) == LabelSet.parse('3,5-6')
+    assert LabelSet.coerce(10) == LabelSet.parse('10')
+
+    with pytest.raises(Exception):
+        LabelSet.parse('10-1')
+    with pytest.raises(Exception):
+        LabelSet.parse('vlan')
+
+
+def test_label_set_as_nml():
+    """
+    Check that label groups serialize label sets in compact form.
+    """
+    group = LabelGroup(
+        identifier='vlans', labeltype='http://schemas.ogf.org/nml/2012/10/'
+        'ethernet#vlan', value=LabelSet.parse('1-100,200-4094')
+    )
+    port_group = PortGroup(identifier='trunk')
+    port_group.set_has_label_group(group)
+    assert port_group.has_label_group(group)
+
+    xml = group.as_nml()
+    assert xml.attrib['value'] == '1-100,200-4094'
+    assert xml.attrib['identifier'] == 'vlans'
+
+    port = Port(identifier='port')
+    port.set_has_label(Label(identifier='vlan10', value=10))
+    relation = port.as_nml().find('Relation')
+    assert relation.find('Label').attrib['id'] == 'vlan10'
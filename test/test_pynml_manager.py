@@ -28,6 +28,10 @@ from distutils.spawn import find_executable
 
 import pytest  # noqa
 
+from pynml.nml import (
+    Node, Port, Link, PortGroup, Label, LabelGroup, Lifetime, Topology,
+    SwitchingService, AdaptationService, DeAdaptationService
+)
 from pynml.manager import NMLManager, ExtendedNMLManager
 
 
@@ -122,3 +126,568 @@ def test_graphviz_extended(tmpdir):
     # Check files were created
     assert plotfile.check(file=1)
     assert srcfile.check(file=1)
+
+
+def ring_mgr(size=4):
+    """
+    Create a ring topology of `size` nodes with one biport per neighbor.
+    """
+    mgr = ExtendedNMLManager(name='Ring Namespace')
+    nodes = [
+        mgr.create_node(identifier='sw{}'.format(idx))
+        for idx in range(1, size + 1)
+    ]
+    for idx, node in enumerate(nodes):
+        neighbor = nodes[(idx + 1) % size]
+        mgr.create_bilink(
+            mgr.create_biport(node),
+            mgr.create_biport(neighbor),
+            identifier='{}-{}'.format(node.identifier, neighbor.identifier)
+        )
+    return mgr, nodes
+
+
+def test_shortest_path():
+    """
+    Check hop count and weighted shortest paths and k-shortest paths.
+    """
+    mgr, (sw1, sw2, sw3, sw4) = ring_mgr()
+
+    path = mgr.shortest_path(sw1, sw2)
+    assert [node for node, _, _ in path] == [sw1, sw2]
+    assert path[0][2] is mgr.get_object('sw1-sw2')
+    assert path[-1] == (sw2, None, None)
+
+    # Make the direct link expensive
+    mgr.get_object('sw1-sw2').metadata['cost'] = 10
+    path = mgr.shortest_path(sw1, sw2, weight='cost')
+    assert [node for node, _, _ in path] == [sw1, sw4, sw3, sw2]
+
+    paths = mgr.shortest_paths(sw1, sw3, 5)
+    assert len(paths) == 2
+    assert all(len(path) == 3 for path in paths)
+
+    # Cache is invalidated when the topology changes
+    sw5 = mgr.create_node(identifier='sw5')
+    assert mgr.shortest_path(sw1, sw5) is None
+    mgr.create_bilink(mgr.create_biport(sw3), mgr.create_biport(sw5))
+    assert len(mgr.shortest_path(sw1, sw5)) == 4
+
+
+def test_adjacency():
+    """
+    Check the undirected node and directed port adjacency matrices.
+    """
+    numpy = pytest.importorskip('numpy')
+
+    mgr = common_mgr()
+
+    csr = mgr.adjacency()
+    assert csr.identifiers == ['sw1', 'sw2']
+    assert csr.ordinals == {'sw1': 0, 'sw2': 1}
+    assert csr.indptr.tolist() == [0, 1, 2]
+    assert csr.indices.tolist() == [1, 0]
+    assert csr.data.tolist() == [2.0, 2.0]  # Two parallel bilinks
+
+    degrees = numpy.diff(csr.indptr)
+    assert degrees.tolist() == [1, 1]
+
+    # Directed, from outbound ports to inbound ports
+    directed = NMLManager.adjacency(mgr, format='coo')
+    assert len(directed.identifiers) == 12
+    assert len(directed.row) == 4
+    for row, col in zip(directed.row, directed.col):
+        source = mgr.get_object(directed.identifiers[row])
+        sink = mgr.get_object(directed.identifiers[col])
+        assert source.name.endswith('_out')
+        assert sink.name.endswith('_in')
+
+
+def test_components():
+    """
+    Check the incremental connected components and the directed strongly
+    connected components.
+    """
+    mgr = common_mgr()
+    sw3 = mgr.create_node(identifier='sw3')
+    assert mgr.count_components() == 2
+    assert mgr.components() == [
+        [mgr.get_object('sw1'), mgr.get_object('sw2')], [sw3]
+    ]
+    assert not mgr.connected(mgr.get_object('sw1'), sw3)
+
+    mgr.create_bilink(
+        mgr.create_biport(mgr.get_object('sw2')), mgr.create_biport(sw3)
+    )
+    assert mgr.count_components() == 1
+    assert mgr.connected(mgr.get_object('sw1'), sw3)
+
+    # Linked ports and their nodes are strongly connected, the ports of the
+    # unlinked biports are alone
+    sccs = mgr.strongly_connected_components()
+    assert sorted(len(scc) for scc in sccs) == [1] * 4 + [3 + 12]
+
+
+def test_bridges_and_articulation_points():
+    """
+    Check the detection of single points of failure.
+    """
+    # A ring has no single point of failure
+    mgr, (sw1, sw2, sw3, sw4) = ring_mgr()
+    assert mgr.bridges() == []
+    assert mgr.articulation_points() == []
+
+    # A node hanging from sw3 with a single link
+    sw5 = mgr.create_node(identifier='sw5')
+    bilink = mgr.create_bilink(mgr.create_biport(sw3), mgr.create_biport(sw5))
+    assert mgr.bridges() == [bilink]
+    assert mgr.articulation_points() == [sw3]
+
+    # A parallel link removes the bridge but not the articulation point
+    mgr.create_bilink(mgr.create_biport(sw3), mgr.create_biport(sw5))
+    assert mgr.bridges() == []
+    assert mgr.articulation_points() == [sw3]
+
+    # Two parallel bilinks between two nodes
+    assert common_mgr().bridges() == []
+
+
+def test_simulate_failures():
+    """
+    Check the N-1 and N-2 failure simulation, in and out of process.
+    """
+    mgr, (sw1, sw2, sw3, sw4) = ring_mgr()
+
+    # A ring survives any single link failure
+    results = mgr.simulate_failures(workers=0)
+    assert len(results) == 4
+    assert all(result.components == 1 for result in results)
+    assert results[0].failed == ('sw1-sw2', )
+
+    # But any two link failures split it in two
+    results = mgr.simulate_failures(order=2, workers=2, chunksize=2)
+    assert len(results) == 6
+    assert all(result.components == 2 for result in results)
+    assert sum(result.largest == 3 for result in results) == 4
+    assert sum(result.reachable_pairs == 2 for result in results) == 2
+
+    # Few scenarios are evaluated in process by default
+    assert mgr.simulate_failures(order=2) == results
+
+    # Failing a node leaves the rest of the ring connected
+    results = mgr.simulate_failures(kind='node', elements=[sw1], workers=0)
+    assert results == [
+        mgr.simulate_failures(kind='node', workers=1)[0]
+    ]
+    assert results[0].failed == ('sw1', )
+    assert results[0].components == 1
+    assert results[0].reachable_pairs == 3
+
+
+def test_availability():
+    """
+    Check the Monte Carlo availability estimation.
+    """
+    mgr, (sw1, sw2, sw3, sw4) = ring_mgr()
+
+    # Invalid parameters are rejected before sampling
+    for kwargs in (
+            {'samples': 0}, {'batch': 0},
+            {'confidence': 0.0}, {'confidence': 1.0}):
+        with pytest.raises(ValueError):
+            mgr.availability([(sw1, sw3)], **kwargs)
+
+    pytest.importorskip('numpy')
+
+    sw5 = mgr.create_node(identifier='sw5')
+
+    # Nothing fails
+    result, = mgr.availability([(sw1, sw3)], samples=100, seed=1)
+    assert result.estimate == 1.0
+    assert result.samples == 100
+
+    # Both paths of the ring fail half of the time
+    for bilink in ('sw1-sw2', 'sw3-sw4'):
+        mgr.get_object(bilink).metadata['failure_probability'] = 0.5
+    sw1.metadata['failure_probability'] = 0.0
+
+    near, far, isolated = mgr.availability(
+        [(sw1, sw4), (sw1, sw3), (sw1, sw5)],
+        samples=4000, seed=7, batch=512
+    )
+    assert near.estimate == 1.0
+    assert far.lower < 0.75 < far.upper
+    assert isolated.estimate == 0.0
+
+    # Same seed, same result
+    assert mgr.availability([(sw1, sw3)], samples=500, seed=3) == \
+        mgr.availability([(sw1, sw3)], samples=500, seed=3)
+
+    # Wilson score interval of 95% confidence
+    result, = mgr.availability([(sw1, sw3)], samples=100, seed=1)
+    center = (result.lower + result.upper) / 2
+    half = (result.upper - result.lower) / 2
+    z = 1.959964
+    estimate = result.estimate
+    assert abs(
+        center - (estimate + z * z / 200) / (1 + z * z / 100)
+    ) < 1e-5
+    assert abs(half - z * (
+        estimate * (1 - estimate) / 100 + z * z / 40000
+    ) ** 0.5 / (1 + z * z / 100)) < 1e-5
+
+
+def test_path_cache():
+    """
+    Check the path cache counters and its selective invalidation.
+    """
+    mgr, (sw1, sw2, sw3, sw4) = ring_mgr()
+    cache = mgr.path_cache
+
+    path = mgr.shortest_path(sw1, sw2)
+    assert mgr.shortest_path(sw1, sw2) == path
+    mgr.shortest_path(sw3, sw4)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # Changing the metadata weights requires an explicit invalidation
+    mgr.get_object('sw1-sw2').metadata['cost'] = 10
+    mgr.shortest_path(sw1, sw2, weight='cost')
+    assert mgr.invalidate_paths(mgr.get_object('sw1-sw2')) == 1
+    assert len(cache) == 2
+
+    # Removing a bilink only evicts the paths traversing it
+    mgr.shortest_path(sw2, sw1)
+    mgr.remove_bilink(mgr.get_object('sw1-sw2'))
+    assert cache.invalidations == 2
+    assert len(cache) == 2
+    assert mgr.get_object('sw1-sw2') is None
+    assert [node for node, _, _ in mgr.shortest_path(sw1, sw2)] == \
+        [sw1, sw4, sw3, sw2]
+    assert mgr.bridges() == [
+        mgr.get_object(identifier)
+        for identifier in ('sw2-sw3', 'sw3-sw4', 'sw4-sw1')
+    ]
+
+    # Creating a bilink evicts everything
+    mgr.create_bilink(mgr.create_biport(sw1), mgr.create_biport(sw3))
+    assert len(cache) == 0
+
+    # Removing a node removes its biports and bilinks
+    mgr.shortest_path(sw1, sw3)
+    mgr.remove_node(sw3)
+    assert len(cache) == 0
+    assert mgr.count_components() == 2
+    assert len(list(mgr.bilinks())) == 1
+    assert len(list(mgr.biports())) == 8 + 2 - 3
+    assert mgr.get_object('sw3') is None
+
+    # Evict the least recently used paths when full
+    mgr = ring_mgr()[0]
+    mgr.path_cache.size = 1
+    mgr.shortest_path(mgr.get_object('sw1'), mgr.get_object('sw2'))
+    mgr.shortest_path(mgr.get_object('sw1'), mgr.get_object('sw3'))
+    assert mgr.path_cache.evictions == 1
+
+
+def test_label_path():
+    """
+    Check paths with label continuity.
+    """
+    mgr, (sw1, sw2, sw3, sw4) = ring_mgr()
+    vlan = 'http://schemas.ogf.org/nml/2012/10/ethernet#vlan'
+    for bilink_id, value in (
+            ('sw1-sw2', '1-100'), ('sw2-sw3', '50-60'),
+            ('sw4-sw1', '200-300'), ('sw3-sw4', '250-4094')):
+        label = Label(
+            identifier=bilink_id + '-vlans', labeltype=vlan, value=value
+        )
+        mgr.register_object(label)
+        for link in mgr.get_object(bilink_id).get_has_link():
+            link.set_has_label(label)
+
+    path, labels = mgr.label_path(sw1, sw3)
+    assert [node for node, _, _ in path] == [sw1, sw2, sw3]
+    assert str(labels) == '50-60'
+
+    path, labels = mgr.label_path(sw1, sw3, labels='70-4094')
+    assert [node for node, _, _ in path] == [sw1, sw4, sw3]
+    assert str(labels) == '250-300'
+
+    assert mgr.label_path(sw1, sw3, labels='1-10') is None
+    assert mgr.label_path(sw1, sw3, labeltype='other')[1] is None
+
+    # Label groups of the port groups apply to their ports
+    biport = mgr.shortest_path(sw2, sw3)[0][1]
+    group = PortGroup(identifier='sw2-trunk')
+    mgr.register_object(group)
+    group.add_has_port(biport.get_has_port()[0])
+    group.set_has_label_group(
+        LabelGroup(identifier='sw2-trunk-vlans', labeltype=vlan, value='55')
+    )
+    assert str(mgr.available_labels(biport)) == '55'
+    assert str(mgr.label_path(sw1, sw3)[1]) == '55'
+
+    # Changes of the label values are followed
+    mgr.get_object('sw2-sw3-vlans').value = '1-10'
+    path, labels = mgr.label_path(sw1, sw3)
+    assert [node for node, _, _ in path] == [sw1, sw4, sw3]
+
+
+def test_layered_path():
+    """
+    Check paths across layers through adaptation services.
+    """
+    mgr = NMLManager(name='Layers Namespace')
+    ethernet = 'http://schemas.ogf.org/nml/2012/10/ethernet'
+    otn = 'http://example.com/otn'
+
+    eth_a = Port(identifier='eth_a', encoding=ethernet)
+    otn_a = Port(identifier='otn_a', encoding=otn)
+    otn_b = Port(identifier='otn_b', encoding=otn)
+    eth_b = Port(identifier='eth_b', encoding=ethernet)
+    adaptation = AdaptationService(identifier='eth-over-otn-a')
+    deadaptation = DeAdaptationService(identifier='eth-over-otn-b')
+    fiber = Link(identifier='fiber')
+    for obj in (
+            eth_a, otn_a, otn_b, eth_b, adaptation, deadaptation, fiber):
+        mgr.register_object(obj)
+
+    adaptation.add_provides_port(eth_a)
+    otn_a.add_has_service(adaptation)
+    deadaptation.add_can_provide_port(eth_b)
+    otn_b.add_has_service(deadaptation)
+    otn_a.add_is_source(fiber)
+    assert mgr.layered_path(eth_a, eth_b) is None
+
+    otn_b.add_is_sink(fiber)
+    path = mgr.layered_path(eth_a, eth_b)
+    assert [(port, kind) for port, kind, _ in path] == [
+        (eth_a, 'adaptation'), (otn_a, 'link'), (otn_b, 'deadaptation'),
+        (eth_b, None)
+    ]
+    assert path[1][2] is fiber
+
+    # Hops are directed
+    assert mgr.layered_path(eth_b, eth_a) is None
+
+    # Prefer a direct ethernet link unless it is expensive
+    ethernet_link = Link(identifier='ethernet_link', cost=10)
+    mgr.register_object(ethernet_link)
+    eth_a.add_is_source(ethernet_link)
+    eth_b.add_is_sink(ethernet_link)
+    assert len(mgr.layered_path(eth_a, eth_b)) == 2
+    assert len(mgr.layered_path(eth_a, eth_b, weight='cost')) == 4
+
+
+def test_forwarding_domains():
+    """
+    Check the forwarding domains of switching services and links.
+    """
+    mgr = NMLManager(name='Domains Namespace')
+    ports = {}
+    services = {}
+    for name in ('sw1', 'sw2', 'sw3'):
+        service = SwitchingService(identifier='{}-bridge'.format(name))
+        mgr.register_object(service)
+        services[name] = service
+        for idx in (1, 2):
+            for direction in ('in', 'out'):
+                port_id = '{}p{}-{}'.format(name, idx, direction)
+                ports[port_id] = Port(identifier=port_id)
+                mgr.register_object(ports[port_id])
+            service.add_has_inbound_port(ports['{}p{}-in'.format(name, idx)])
+
+    # Bootstrap with the inbound ports of each service
+    assert mgr.forwarding_domain(ports['sw1p1-in']) == [
+        ports['sw1p1-in'], ports['sw1p2-in']
+    ]
+    assert mgr.forwarding_domain(ports['sw1p1-out']) == [ports['sw1p1-out']]
+
+    # Incremental updates
+    services['sw1'].add_has_outbound_port(ports['sw1p1-out'])
+    link = Link(identifier='sw1p1-sw2p1')
+    mgr.register_object(link)
+    ports['sw1p1-out'].add_is_source(link)
+    ports['sw2p1-in'].add_is_sink(link)
+    assert {
+        port.identifier for port in mgr.forwarding_domain(ports['sw2p2-in'])
+    } == {'sw1p1-in', 'sw1p2-in', 'sw1p1-out', 'sw2p1-in', 'sw2p2-in'}
+    assert len(mgr.forwarding_domains()) == 2
+
+    # Removals rebuild the domains
+    ports['sw2p1-in'].remove_is_sink(link)
+    assert len(mgr.forwarding_domain(ports['sw2p2-in'])) == 2
+    assert len(mgr.forwarding_domains()) == 3
+
+
+def test_membership():
+    """
+    Check recursive membership of nested topologies.
+    """
+    mgr, (sw1, sw2, sw3, sw4) = ring_mgr()
+    region = Topology(identifier='region')
+    pod1 = Topology(identifier='pod1')
+    pod2 = Topology(identifier='pod2')
+    for topology in (region, pod1, pod2):
+        mgr.register_object(topology)
+
+    region.add_has_topology(pod1)
+    pod1.add_has_node(sw1)
+    pod1.add_has_node(sw2)
+    pod2.add_has_node(sw3)
+
+    members = mgr.members(region)
+    assert members[:3] == [
+        pod1, sw1, list(sw1.get_has_inbound_port().values())[0]
+    ]
+    assert sw2 in members and sw3 not in members
+    assert mgr.members(region, recursive=False) == [pod1]
+    assert mgr.containers(sw1) == [pod1, region]
+    assert mgr.containers(sw1, recursive=False) == [pod1]
+
+    # Changes invalidate the containers
+    region.add_has_topology(pod2)
+    assert sw3 in mgr.members(region)
+    pod1.remove_has_node(sw1)
+    assert sw1 not in mgr.members(region)
+    assert mgr.containers(sw1) == []
+
+    # Cycles are detected
+    pod2.add_has_topology(region)
+    with pytest.raises(Exception):
+        mgr.members(region)
+
+
+def test_implementation():
+    """
+    Check the mapping between virtual and physical nodes.
+    """
+    mgr = ExtendedNMLManager(name='Implementation Namespace')
+    vnf = mgr.create_node(identifier='vnf')
+    vm1 = mgr.create_node(identifier='vm1')
+    vm2 = mgr.create_node(identifier='vm2')
+    host = mgr.create_node(identifier='host')
+
+    vnf.add_implemented_by(vm1)
+    vm1.add_implemented_by(host)
+
+    assert mgr.hosts(vnf) == [vm1, host]
+    assert mgr.hosts(vnf, recursive=False) == [vm1]
+    assert mgr.hosted(host) == [vm1, vnf]
+    assert mgr.hosted(vm2) == []
+
+    # Changes invalidate the cached closures in both directions
+    vm2.add_implemented_by(host)
+    assert mgr.hosted(host) == [vm1, vnf, vm2]
+    vnf.remove_implemented_by(vm1)
+    vnf.add_implemented_by(vm2)
+    assert mgr.hosts(vnf) == [vm2, host]
+    assert mgr.hosted(host) == [vm1, vm2, vnf]
+    assert mgr.hosted(vm1) == []
+
+
+def test_collect_orphans():
+    """
+    Check objects unreachable from the roots are unregistered.
+    """
+    mgr, (sw1, sw2, sw3, sw4) = ring_mgr()
+    size = len(mgr.namespace)
+    window = Lifetime(identifier='window', start='20160101T000000Z')
+    mgr.register_object(window)
+    sw1.add_exists_during(window)
+    assert mgr.collect_orphans() == []
+    assert len(mgr.namespace) == size + 1
+
+    # Ports and lifetimes left behind
+    stale = Port(identifier='stale')
+    expired = Lifetime(identifier='expired', start='20150101T000000Z')
+    for obj in (stale, expired):
+        mgr.register_object(obj)
+    stale.add_exists_during(expired)
+    stale.add_exists_during(window)
+    sw1.remove_exists_during(window)
+    assert set(obj.identifier for obj in mgr.collect_orphans()) == {
+        'stale', 'expired', 'window'
+    }
+    assert len(mgr.namespace) == size
+
+    # Explicit roots, helpers forget the collected objects
+    (_, biport_a), (_, biport_b), bilink = next(mgr.bilinks())
+    freed = mgr.collect_orphans(roots=[sw1, sw2, biport_a, biport_b, bilink])
+    assert sw3 in freed and sw4 in freed
+    assert list(mgr.nodes()) == [sw1, sw2]
+    assert [link for _, _, link in mgr.bilinks()] == [bilink]
+    assert len(mgr.shortest_path(sw1, sw2)) == 2
+
+    # Standard managers keep only topologies and nodes by default
+    plain = NMLManager(name='Plain Namespace')
+    node = Node(identifier='node')
+    port = Port(identifier='port')
+    for obj in (node, port, Link(identifier='link')):
+        plain.register_object(obj)
+    node.add_has_inbound_port(port)
+    assert [obj.identifier for obj in plain.collect_orphans()] == ['link']
+    assert list(plain.namespace) == ['node', 'port']
+
+
+def test_intern():
+    """
+    Check value objects are shared and exported once.
+    """
+    mgr = ExtendedNMLManager(name='Intern Namespace')
+    nodes = [
+        mgr.create_node(identifier='sw{}'.format(idx)) for idx in range(3)
+    ]
+    for node in nodes:
+        node.add_exists_during(mgr.intern(Lifetime(
+            start='20160101T000000Z', end='20160102T000000Z'
+        )))
+    lifetimes = [list(node.get_exists_during().values()) for node in nodes]
+    assert lifetimes[0] == lifetimes[1] == lifetimes[2]
+    assert mgr.export_nml().count('<nml:Lifetime ') == 1
+
+    # Different classes or values are not shared
+    label = mgr.intern(Label(labeltype='vlan', value='10'))
+    assert mgr.intern(Label(labeltype='vlan', value='10')) is label
+    assert mgr.intern(Label(labeltype='vlan', value='20')) is not label
+    assert mgr.intern(LabelGroup(labeltype='vlan', value='10')) is not label
+
+    # Changed values are reindexed
+    label.value = '30'
+    assert mgr.intern(Label(labeltype='vlan', value='10')) is not label
+    assert mgr.intern(Label(labeltype='vlan', value='30')) is label
+
+    with pytest.raises(Exception):
+        mgr.intern(Port())
+
+
+def test_aliases():
+    """
+    Check alias equivalence classes and their collapse on export.
+    """
+    mgr = ExtendedNMLManager(name='Aliases Namespace')
+    inventory = mgr.create_node(identifier='inventory-sw1')
+    lldp = mgr.create_node(identifier='lldp-sw1')
+    snmp = mgr.create_node(identifier='snmp-sw1')
+    other = mgr.create_node(identifier='sw2')
+    topology = Topology(identifier='topology')
+    mgr.register_object(topology)
+    for node in (inventory, lldp, snmp, other):
+        topology.add_has_node(node)
+
+    lldp.add_is_alias(snmp)
+    assert mgr.canonical(snmp) is lldp
+    inventory.add_is_alias(lldp)
+    assert mgr.canonical(snmp) is inventory
+    assert set(mgr.aliases(lldp)) == {inventory, lldp, snmp}
+    assert mgr.aliases(other) == [other]
+    assert mgr.canonical(other) is other
+
+    xml = mgr.export_nml(collapse_aliases=True)
+    assert xml.count('id="inventory-sw1"') == 1
+    assert 'lldp-sw1' not in xml and 'snmp-sw1' not in xml
+    assert 'id="sw2"' in xml
+
+    # Removals split the classes
+    inventory.remove_is_alias(lldp)
+    assert mgr.canonical(snmp) is lldp
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module pynml.mixins.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+import pytest  # noqa
+
+from pynml.nml import Link, LinkGroup, OrderedList, NAMESPACES
+from pynml.mixins import HandleTable
+from pynml.manager import NMLManager
+
+
+def test_ordered_list():
+    """
+    Check the array backed ordered lists and their NML representation.
+    """
+    links = [Link(identifier='link{}'.format(idx)) for idx in range(5)]
+    table = HandleTable()
+    path = OrderedList(identifier='path', items=links[:3], table=table)
+    path.append(links[3])
+    path.extend(links[4:])
+
+    assert len(path) == 5
+    assert path[0] is links[0] and path[-1] is links[4]
+    assert list(path[1:3]) == links[1:3]
+    assert path.handles.tolist() == [0, 1, 2, 3, 4]
+    assert len(table) == 5
+
+    # Lists get a table of their own by default
+    other = OrderedList(identifier='other', items=links[3:])
+    assert other.handles.tolist() == [0, 1]
+    assert len(table) == 5
+
+    # Slices can be assigned any iterable of objects
+    path[0:2] = [links[4]]
+    assert list(path) == [links[4], links[2], links[3], links[4]]
+    path[0:1] = links[:2]
+    assert list(path) == links
+
+    # Serial compound links relate with ordered lists
+    group = LinkGroup(identifier='circuit')
+    group.add_is_serial_compound_link(path)
+    relation = group.as_nml().find('Relation')
+    assert relation.attrib['type'].endswith('#isSerialCompoundLink')
+    assert relation.find('OrderedList').attrib['id'] == 'path'
+
+    # Items are written in order, related with the next one
+    xml = path[:3].as_nml()
+    items = xml.findall('Link')
+    assert [item.attrib['id'] for item in items] == [
+        'link0', 'link1', 'link2'
+    ]
+    following = items[0].find('Relation')
+    assert following.attrib['type'] == '{}#next'.format(NAMESPACES['nml'])
+    assert following.find('Link').attrib['id'] == 'link1'
+    assert items[2].find('Relation') is None
+
+    # Empty lists are still related
+    group.add_is_serial_compound_link(OrderedList(identifier='empty'))
+    relation = group.as_nml().find('Relation')
+    assert len(relation.findall('OrderedList')) == 2
+
+
+def test_ordered_list_memory():
+    """
+    Check registered ordered lists share the handles of their manager.
+    """
+    tracemalloc = pytest.importorskip('tracemalloc')
+
+    mgr = NMLManager(name='Paths Namespace')
+    links = [Link(identifier='link{}'.format(idx)) for idx in range(20)]
+    paths = [
+        OrderedList(identifier='path{}'.format(idx)) for idx in range(500)
+    ]
+    for path in paths:
+        mgr.register_object(path)
+    assert paths[0]._table is paths[-1]._table
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for path in paths:
+            path.extend(links)
+            path.extend(links)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(
+        stat.size_diff for stat in after.compare_to(before, 'filename')
+    )
+    items = len(paths) * len(links) * 2
+    assert allocated / items < 16
+    assert len(mgr._handles) == len(links)
+
+    # Lists registered with items move them to the table of the manager
+    path = OrderedList(identifier='late', items=links[:3])
+    mgr.register_object(path)
+    assert path._table is paths[0]._table
+    assert list(path) == links[:3]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module pynml.validation.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from __future__ import unicode_literals, absolute_import
+from __future__ import print_function, division
+
+import pytest  # noqa
+
+from pynml.nml import Node, Port, Link, BidirectionalPort, Location
+from pynml.manager import NMLManager
+from pynml.validation import relation_specs
+
+
+def test_relation_specs():
+    """
+    Check the relations declared by a class and its parents are merged.
+    """
+    specs = relation_specs(BidirectionalPort)
+    assert specs['hasPort'][0] == '2'
+    assert specs['isAlias'][0] == '+'
+    assert list(relation_specs(Node)) == list(Node().relations)
+
+
+def test_validate():
+    """
+    Check dangling, cardinality and type violations are reported.
+    """
+    mgr = NMLManager(name='Validation Namespace')
+    node = Node(identifier='node')
+    port = Port(identifier='port')
+    for obj in (node, port):
+        mgr.register_object(obj)
+
+    node.add_has_outbound_port(port)
+    assert mgr.validate() == []
+
+    # Objects related but never registered
+    location = Location(identifier='location')
+    node.set_located_at(location)
+
+    # Bidirectional ports without ports
+    biport = BidirectionalPort(identifier='biport')
+    mgr.register_object(biport)
+
+    # Objects of the wrong type injected behind the typed methods
+    node._has_inbound_port_ports['link'] = Link(identifier='link')
+
+    violations = {
+        (violation.kind, violation.subject.identifier, violation.relation)
+        for violation in mgr.validate()
+    }
+    assert violations == {
+        ('dangling', 'node', 'locatedAt'),
+        ('dangling', 'node', 'hasInboundPort'),
+        ('type', 'node', 'hasInboundPort'),
+        ('cardinality', 'biport', 'hasPort'),
+    }
+
+    mgr.register_object(location)
+    node.remove_has_inbound_port(Link(identifier='link'))
+    biport.set_has_port(port, Port(identifier='port2'))
+    assert [
+        (violation.kind, violation.related.identifier)
+        for violation in mgr.validate()
+    ] == [('dangling', 'port2')]